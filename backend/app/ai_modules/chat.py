@@ -4,29 +4,27 @@ Provides conversational AI for article-based Q&A
 """
 
 import logging
-from typing import List, Dict, Optional
-import google.generativeai as genai
+from typing import List, Dict, Optional, Tuple
 
 from app.core.config import settings
+from app.ai_modules.llm import LLMService
+from app.ai_modules.tokens import estimate_tokens, truncate_to_tokens
 
 logger = logging.getLogger(__name__)
 
-# Configure Gemini
-genai.configure(api_key=settings.GEMINI_API_KEY)
 
-
-class ChatService:
+class ChatService(LLMService):
     """Service for AI-powered conversational Q&A"""
     
     def __init__(self):
-        self.model = genai.GenerativeModel('gemini-3-flash-preview')
         self.max_history = 10  # Keep last 10 messages for context
     
     async def generate_response(
         self,
         message: str,
         conversation_history: List[Dict[str, str]] = None,
-        article_context: Optional[str] = None
+        article_context: Optional[str] = None,
+        summary: Optional[str] = None
     ) -> str:
         """
         Generate AI response with conversation context
@@ -35,13 +33,15 @@ class ChatService:
             message: User's message
             conversation_history: Previous messages in conversation
             article_context: Optional article content for context-aware responses
+            summary: Optional rolling summary of turns no longer in the history
         """
         
         try:
             prompt = self._build_conversation_prompt(
                 message,
                 conversation_history or [],
-                article_context
+                article_context,
+                summary
             )
             
             response = await self._generate_content(prompt)
@@ -52,13 +52,49 @@ class ChatService:
             logger.error(f"Chat generation error: {str(e)}")
             raise
     
+    @staticmethod
+    def _format_history_line(message: Dict[str, str]) -> str:
+        return f"{message.get('role', 'user').capitalize()}: {message.get('content', '')}"
+    
+    def split_history(
+        self,
+        history: List[Dict[str, str]],
+        token_budget: int,
+        max_messages: Optional[int] = None
+    ) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+        """
+        Split history into (older, recent): `recent` is the longest suffix of
+        at most `max_messages` (default `max_history`) messages that fits in
+        `token_budget`
+        """
+        max_messages = max_messages or self.max_history
+        recent_start = len(history)
+        used = 0
+        for index in range(len(history) - 1, max(-1, len(history) - max_messages - 1), -1):
+            cost = estimate_tokens(self._format_history_line(history[index]))
+            if used + cost > token_budget:
+                break
+            used += cost
+            recent_start = index
+        
+        return history[:recent_start], history[recent_start:]
+    
     def _build_conversation_prompt(
         self,
         current_message: str,
         history: List[Dict[str, str]],
-        article_context: Optional[str] = None
+        article_context: Optional[str] = None,
+        summary: Optional[str] = None
     ) -> str:
-        """Build conversation prompt with context"""
+        """
+        Build conversation prompt with context, within CHAT_PROMPT_TOKEN_BUDGET
+        
+        Fixed parts (instructions, current message) are placed first, then
+        the article context, the rolling summary and as much recent history
+        as the remaining budget allows. Older turns are expected to be folded
+        into `summary` (see summarize_history).
+        """
+        budget = settings.CHAT_PROMPT_TOKEN_BUDGET
         
         # System instruction
         system_instruction = (
@@ -71,56 +107,89 @@ class ChatService:
             "- Encourage curiosity and further learning\n\n"
         )
         
+        # Current user message (a huge paste cannot crowd out everything else)
+        current_message = truncate_to_tokens(current_message, budget // 2)
+        current_section = f"User: {current_message}\n\nAssistant:"
+        remaining = budget - estimate_tokens(system_instruction) - estimate_tokens(current_section)
+        
         # Add article context if provided
         context_section = ""
-        if article_context:
-            context_section = f"Article Context:\n{article_context[:1000]}...\n\n"
-        
-        # Build conversation history
+        if article_context and remaining > 0:
+            article_context = truncate_to_tokens(article_context, min(remaining, settings.ARTICLE_CONTEXT_TOKEN_BUDGET))
+            context_section = f"Article Context:\n{article_context}\n\n"
+            remaining -= estimate_tokens(context_section)
+        
+        # Add rolling summary of earlier turns
+        summary_section = ""
+        if summary and remaining > 0:
+            summary = truncate_to_tokens(summary, min(remaining, settings.CHAT_SUMMARY_TOKENS))
+            summary_section = f"Summary of Earlier Conversation:\n{summary}\n\n"
+            remaining -= estimate_tokens(summary_section)
+        
+        # Build conversation history from the most recent messages that fit
         history_section = ""
-        if history:
-            # Get last N messages for context
-            recent_history = history[-self.max_history:]
-            history_lines = []
-            for msg in recent_history:
-                role = msg.get('role', 'user')
-                content = msg.get('content', '')
-                history_lines.append(f"{role.capitalize()}: {content}")
-            
+        _, recent_history = self.split_history(
+            history,
+            min(max(0, remaining), settings.CHAT_HISTORY_TOKEN_BUDGET)
+        )
+        if recent_history:
+            history_lines = [self._format_history_line(msg) for msg in recent_history]
             history_section = "Conversation History:\n" + "\n".join(history_lines) + "\n\n"
         
-        # Current user message
-        current_section = f"User: {current_message}\n\nAssistant:"
-        
         # Combine all parts
-        full_prompt = system_instruction + context_section + history_section + current_section
+        full_prompt = system_instruction + context_section + summary_section + history_section + current_section
         
         return full_prompt
     
-    async def _generate_content(self, prompt: str) -> str:
-        """Generate content using Gemini"""
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            logger.error(f"Gemini API error: {str(e)}")
-            raise
+    async def summarize_history(
+        self,
+        summary: Optional[str],
+        messages: List[Dict[str, str]]
+    ) -> str:
+        """Fold older conversation turns into the rolling summary"""
+        
+        transcript = "\n".join(self._format_history_line(msg) for msg in messages)
+        previous = summary or "(none yet)"
+        max_words = int(settings.CHAT_SUMMARY_TOKENS / 1.3)
+        
+        prompt = f"""
+        You maintain a running summary of a conversation between a user and an AI tutor.
+        
+        Current summary:
+        {previous}
+        
+        New turns to fold in:
+        {transcript}
+        
+        Rewrite the summary so it also covers the new turns. Keep the topics discussed,
+        facts the user shared about themselves, and open questions. Use at most {max_words} words.
+        Return only the summary.
+        """
+        
+        response = await self._generate_content(prompt)
+        
+        return truncate_to_tokens(response.strip(), settings.CHAT_SUMMARY_TOKENS)
     
     async def answer_article_question(
         self,
         question: str,
         article_title: str,
-        article_content: str
+        article_context: str
     ) -> str:
-        """Answer a specific question about an article"""
+        """
+        Answer a specific question about an article
+        
+        `article_context` should be the article passages relevant to the
+        question (see retrieval_service.get_article_context).
+        """
         
         prompt = f"""
         Based on the article "{article_title}", answer the following question:
         
         Question: {question}
         
-        Article Content:
-        {article_content[:2000]}...
+        Relevant Article Excerpts:
+        {article_context}
         
         Provide a clear, accurate answer based only on the information in the article.
         If the article doesn't contain enough information to answer, say so politely.
@@ -146,7 +215,7 @@ class ChatService:
         Format: Return only the questions, one per line, without numbering.
         """
         
-        response = await self._generate_content(prompt)
+        response = await self._generate_cached(prompt, "ai:follow-up")
         
         # Parse questions
         questions = [
@@ -172,7 +241,7 @@ class ChatService:
         Keep it concise but comprehensive.{context_text}
         """
         
-        return await self._generate_content(prompt)
+        return await self._generate_cached(prompt, "ai:explain")
 
 
 # Singleton instance
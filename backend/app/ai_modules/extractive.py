@@ -0,0 +1,210 @@
+"""
+Extractive Summarization Module
+Local, model-free summaries built from the article's own sentences
+
+Sentences are turned into TF-IDF vectors with NumPy and scored with
+TextRank (PageRank over the cosine-similarity graph) for normal-sized
+texts, or by similarity to the document centroid for very long ones where
+the sentence-by-sentence graph would dominate the cost. The best-scoring,
+non-redundant sentences are returned in document order. A typical article
+takes about a millisecond and a 100 KB extract around 15 ms, so this provides the instant summary at insert time,
+the fallback when Gemini misses its latency budget, and the "fast"
+summarization style.
+"""
+
+import re
+import string
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.ai_modules.retrieval import STOPWORDS
+
+_HEADING_RE = re.compile(r"^\s*(?:={2,}.*={2,}|#{1,6}\s+.*)\s*$", re.MULTILINE)
+# Sentence-final punctuation (kept by the capture group) before a capitalised word
+_SENTENCE_RE = re.compile(r"([.!?][\"')\]]*) (?=[\"'(\[]?[A-Z0-9])")
+
+# Above this many sentences, centroid scoring replaces TextRank
+TEXTRANK_MAX_SENTENCES = 200
+# Ignore fragments shorter than this (captions, list debris)
+MIN_SENTENCE_WORDS = 4
+# Sentences more similar than this to an already chosen one are skipped
+REDUNDANCY_THRESHOLD = 0.6
+DAMPING = 0.85
+# Width of the (hashed) term space
+HASH_DIMENSIONS = 1024
+# Best-ranked sentences considered for the summary
+RANKED_VECTORS = 64
+
+_PUNCTUATION_TO_SPACE = bytes.maketrans(string.punctuation.encode(), b" " * len(string.punctuation))
+_SENTENCE_SEPARATOR = " \x00 "
+_STOPWORDS = frozenset(word.encode() for word in STOPWORDS) | {b"\x00"}
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split prose into sentences, dropping section headings"""
+    text = _HEADING_RE.sub("\n", text)
+    sentences = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        parts = _SENTENCE_RE.split(" ".join(paragraph.split()))
+        # re.split alternates text and captured punctuation: re-attach the latter
+        parts.append("")
+        sentences.extend(text + end for text, end in zip(parts[::2], parts[1::2]) if text)
+    return sentences
+
+
+class ExtractiveSummarizer:
+    """TextRank / centroid extractive summarizer"""
+
+    def _sentence_terms(self, sentences: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sparse L2-normalised TF-IDF sentence vectors as (rows, columns, weights)
+
+        Words are folded into HASH_DIMENSIONS columns (by first-seen order,
+        so results are deterministic) to bound the size of dense views.
+        """
+        # One pass over the whole text: lowercase, punctuation to spaces, and
+        # a separator token between sentences that marks row boundaries
+        joined = _SENTENCE_SEPARATOR.join(sentences).lower().encode("utf-8")
+        tokens = joined.translate(_PUNCTUATION_TO_SPACE).split()
+
+        vocabulary = {token: index for index, token in enumerate(dict.fromkeys(tokens))}
+        ids = np.fromiter(map(vocabulary.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        # The separator is dropped together with the stopwords
+        is_stopword = np.fromiter(map(_STOPWORDS.__contains__, vocabulary), dtype=bool, count=len(vocabulary))
+
+        separator = vocabulary.get(b"\x00", -1)
+        rows = np.cumsum(ids == separator)
+        keep = ~is_stopword[ids]
+        cells, counts = np.unique(rows[keep] * HASH_DIMENSIONS + ids[keep] % HASH_DIMENSIONS, return_counts=True)
+        rows, columns = np.divmod(cells, HASH_DIMENSIONS)
+
+        # Sublinear term frequency, smoothed inverse document frequency
+        document_frequency = np.bincount(columns, minlength=HASH_DIMENSIONS)
+        idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1
+        weights = np.log1p(counts) * idf[columns]
+
+        norms = np.sqrt(np.bincount(rows, weights * weights, minlength=len(sentences)))
+        norms[norms == 0] = 1
+        weights /= norms[rows]
+
+        return rows, columns, weights
+
+    @staticmethod
+    def _dense(rows: np.ndarray, columns: np.ndarray, weights: np.ndarray, selected: np.ndarray) -> np.ndarray:
+        """Dense vectors for the `selected` sentence indices (in that order)"""
+        position = np.full(int(rows.max(initial=0)) + 1, -1, dtype=np.int64)
+        position[selected] = np.arange(len(selected))
+        mask = position[rows] >= 0
+
+        dense = np.zeros((len(selected), HASH_DIMENSIONS), dtype=np.float32)
+        dense[position[rows[mask]], columns[mask]] = weights[mask]
+        return dense
+
+    @staticmethod
+    def _textrank(vectors: np.ndarray, iterations: int = 30) -> np.ndarray:
+        similarity = vectors @ vectors.T
+        np.fill_diagonal(similarity, 0)
+
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        out_weight[out_weight == 0] = 1
+        transition = (similarity / out_weight).T
+
+        count = len(vectors)
+        scores = np.full(count, 1.0 / count, dtype=np.float32)
+        for _ in range(iterations):
+            updated = (1 - DAMPING) / count + DAMPING * (transition @ scores)
+            if np.abs(updated - scores).sum() < 1e-6:
+                scores = updated
+                break
+            scores = updated
+
+        return scores
+
+    @staticmethod
+    def _centroid(rows: np.ndarray, columns: np.ndarray, weights: np.ndarray, count: int) -> np.ndarray:
+        centroid = np.bincount(columns, weights, minlength=HASH_DIMENSIONS)
+        norm = np.linalg.norm(centroid)
+        if not norm:
+            return np.zeros(count)
+        return np.bincount(rows, weights * (centroid[columns] / norm), minlength=count)
+
+    def rank(self, sentences: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank sentences, most representative first
+
+        Returns (indices, vectors) where vectors[i] is the dense vector of
+        sentence indices[i]; only the top RANKED_VECTORS are materialised for
+        long texts.
+        """
+        rows, columns, weights = self._sentence_terms(sentences)
+        count = len(sentences)
+
+        if count <= TEXTRANK_MAX_SENTENCES:
+            vectors = self._dense(rows, columns, weights, np.arange(count))
+            scores = self._textrank(vectors)
+        else:
+            vectors = None
+            scores = self._centroid(rows, columns, weights, count)
+
+        # Mild lead bias: encyclopedic text front-loads its definition
+        positions = np.arange(count, dtype=np.float32)
+        scores = scores * (1 + 0.5 / (1 + positions / 3))
+
+        order = np.argsort(-scores, kind="stable")[:RANKED_VECTORS]
+        if vectors is None:
+            return order, self._dense(rows, columns, weights, order)
+        return order, vectors[order]
+
+    def summarize_sentences(
+        self,
+        text: str,
+        max_length: int = 300,
+        max_sentences: Optional[int] = None
+    ) -> List[str]:
+        """
+        Pick the most representative sentences of `text`, up to `max_length`
+        characters in total (counting a joining space between sentences)
+
+        Sentences are returned in their original order; empty text gives [].
+        """
+        sentences = split_sentences(text)
+        # Sentences are whitespace-normalised, so spaces count words
+        candidates = [s for s in sentences if s.count(" ") + 1 >= MIN_SENTENCE_WORDS] or sentences
+        if not candidates:
+            return []
+
+        order, vectors = self.rank(candidates)
+
+        chosen: List[int] = []
+        chosen_ranks: List[int] = []
+        length = 0
+        for rank, index in enumerate(order):
+            sentence_length = len(candidates[index]) + (1 if chosen else 0)
+            if length + sentence_length > max_length:
+                continue
+            if chosen and float(np.max(vectors[chosen_ranks] @ vectors[rank])) > REDUNDANCY_THRESHOLD:
+                continue
+            chosen.append(int(index))
+            chosen_ranks.append(rank)
+            length += sentence_length
+            if max_sentences and len(chosen) >= max_sentences:
+                break
+            if max_length - length < 40:
+                break
+
+        if not chosen:
+            # Even the best sentence is too long: cut it at a word boundary
+            best = candidates[int(order[0])]
+            cut = best[:max(0, max_length - 3)].rsplit(" ", 1)[0]
+            return [cut.rstrip(",;:") + "..."]
+
+        return [candidates[index] for index in sorted(chosen)]
+
+    def summarize(self, text: str, max_length: int = 300, max_sentences: Optional[int] = None) -> str:
+        """Extractive summary of `text` in at most `max_length` characters ("" for empty text)"""
+        return " ".join(self.summarize_sentences(text, max_length, max_sentences))
+
+
+# Singleton instance
+extractive_summarizer = ExtractiveSummarizer()
@@ -0,0 +1,337 @@
+"""
+LLM Provider Module
+Text generation behind one interface, selected with LLM_PROVIDER
+
+- gemini: Google Gemini (LLM_MODEL), imported and configured on first use
+- fake: offline, deterministic provider for load tests and benchmarks, with
+  configurable latency distribution, token rate and error injection
+  (FAKE_LLM)
+
+Services call `generate_text(prompt)`, which applies the "llm" resilience
+policy (deadline, retries, circuit breaker) whichever provider is active and
+records latency and token metrics and a trace span.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.cache import Cache, get_cache
+from app.core import resilience
+from app.core.metrics import LLM_REQUEST_DURATION, LLM_TIME_TO_FIRST_CHUNK, LLM_TOKENS
+from app.core.tracing import span, start_span
+from app.ai_modules.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class LLMProvider:
+    """Text generation interface"""
+
+    name = "base"
+
+    def generate(self, prompt: str) -> str:
+        """Generate a complete response (blocking)"""
+        raise NotImplementedError
+
+    async def agenerate(self, prompt: str) -> str:
+        """Generate a complete response"""
+        raise NotImplementedError
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Generate a response as text chunks"""
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+    async def ping(self) -> None:
+        """Cheap round trip that opens the provider connection (startup warm-up)"""
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini via google-generativeai"""
+
+    name = "gemini"
+
+    def __init__(self, model_name: str, api_key: str):
+        # Imported here so the SDK is only loaded when Gemini is actually used
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt: str) -> str:
+        return self.model.generate_content(prompt).text
+
+    async def agenerate(self, prompt: str) -> str:
+        response = await self.model.generate_content_async(prompt)
+        return response.text
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        response = await self.model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+    async def ping(self) -> None:
+        # Token counting is free and does not generate anything
+        await self.model.count_tokens_async("ping")
+
+
+class FakeLLMError(Exception):
+    """Injected provider failure (looks like an HTTP 503 to the retry logic)"""
+
+    code = 503
+
+
+@dataclass
+class FakeLLMProfile:
+    """Behaviour of the fake provider (see FAKE_LLM)"""
+    seed: int = 0
+    latency: str = "lognormal"         # time to first token: constant, uniform, lognormal or exponential
+    latency_ms: float = 600.0          # constant value / median (lognormal) / mean (exponential)
+    latency_spread: float = 0.5        # sigma (lognormal) or +/- fraction of latency_ms (uniform)
+    tokens_per_second: float = 80.0    # output rate after the first token (0 = instant)
+    output_tokens: int = 150           # mean response length (+/- 50%, fixed per prompt)
+    error_rate: float = 0.0            # fraction of calls failing with FakeLLMError
+    timeout_rate: float = 0.0          # fraction of calls hanging for hang_seconds
+    hang_seconds: float = 120.0
+
+
+# Vocabulary for fake responses
+_FAKE_WORDS = (
+    "article history science system energy network theory language culture research "
+    "model process structure community design method data period century region "
+    "development analysis evidence concept early modern public major important several "
+    "known used based often including between during within across through".split()
+)
+
+
+class FakeLLMProvider(LLMProvider):
+    """
+    Offline provider with realistic timing and no network
+
+    Responses depend only on the prompt (the same prompt always gets the same
+    text). Latencies and injected failures come from one generator seeded
+    with `seed`, so a sequential run is reproducible.
+    """
+
+    name = "fake"
+
+    def __init__(self, profile: FakeLLMProfile):
+        self.profile = profile
+        self.random = random.Random(profile.seed)
+        self.calls = 0
+
+    def _sample_latency(self) -> float:
+        """Time to first token (seconds)"""
+        profile = self.profile
+        base = max(0.0, profile.latency_ms) / 1000
+
+        if profile.latency == "constant":
+            return base
+        if profile.latency == "uniform":
+            spread = base * profile.latency_spread
+            return max(0.0, self.random.uniform(base - spread, base + spread))
+        if profile.latency == "exponential":
+            return self.random.expovariate(1 / base) if base else 0.0
+        return base * math.exp(self.random.gauss(0, profile.latency_spread))
+
+    def _plan(self) -> Tuple[Optional[str], float]:
+        """Decide one call's outcome: (failure or None, latency)"""
+        self.calls += 1
+        roll = self.random.random()
+        latency = self._sample_latency()
+
+        if roll < self.profile.error_rate:
+            return "error", latency
+        if roll < self.profile.error_rate + self.profile.timeout_rate:
+            return "timeout", self.profile.hang_seconds
+        return None, latency
+
+    def _text(self, prompt: str) -> str:
+        """Deterministic response for `prompt`: numbered lines of filler sentences"""
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+        tokens = max(1, int(self.profile.output_tokens * rng.uniform(0.5, 1.5)))
+        words = max(3, int(tokens / 1.3))
+
+        # Questions when asked for questions, so parsers see what they expect
+        end = "?" if "question" in prompt.lower() else "."
+
+        lines = []
+        while words > 0:
+            length = min(words, rng.randint(8, 16))
+            sentence = " ".join(rng.choice(_FAKE_WORDS) for _ in range(length))
+            lines.append(f"{len(lines) + 1}. {sentence.capitalize()}{end}")
+            words -= length
+
+        return "\n".join(lines)
+
+    def _chunks(self, text: str) -> List[str]:
+        """Split a response into stream chunks of a few words"""
+        words = text.split(" ")
+        return [" ".join(words[i:i + 4]) + (" " if i + 4 < len(words) else "") for i in range(0, len(words), 4)]
+
+    def _generation_seconds(self, text: str) -> float:
+        if self.profile.tokens_per_second <= 0:
+            return 0.0
+        return len(text) / 4 / self.profile.tokens_per_second
+
+    def generate(self, prompt: str) -> str:
+        failure, latency = self._plan()
+        time.sleep(latency)
+        if failure == "error":
+            raise FakeLLMError("Injected fake LLM failure")
+
+        text = self._text(prompt)
+        time.sleep(self._generation_seconds(text))
+        return text
+
+    async def agenerate(self, prompt: str) -> str:
+        failure, latency = self._plan()
+        await asyncio.sleep(latency)
+        if failure == "error":
+            raise FakeLLMError("Injected fake LLM failure")
+
+        text = self._text(prompt)
+        await asyncio.sleep(self._generation_seconds(text))
+        return text
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        failure, latency = self._plan()
+        await asyncio.sleep(latency)
+        if failure == "error":
+            raise FakeLLMError("Injected fake LLM failure")
+
+        chunks = self._chunks(self._text(prompt))
+        for index, chunk in enumerate(chunks):
+            if index:
+                await asyncio.sleep(self._generation_seconds(chunk))
+            yield chunk
+
+
+def _create_gemini() -> LLMProvider:
+    return GeminiProvider(settings.LLM_MODEL, settings.GEMINI_API_KEY)
+
+
+def _create_fake() -> LLMProvider:
+    return FakeLLMProvider(FakeLLMProfile(**settings.FAKE_LLM))
+
+
+PROVIDERS: Dict[str, Callable[[], LLMProvider]] = {
+    "gemini": _create_gemini,
+    "fake": _create_fake,
+}
+
+_provider: Optional[LLMProvider] = None
+
+
+def register_provider(name: str, factory: Callable[[], LLMProvider]) -> None:
+    """Make another provider selectable through LLM_PROVIDER"""
+    PROVIDERS[name] = factory
+
+
+def get_llm_provider() -> LLMProvider:
+    """The configured provider, created on first use"""
+    global _provider
+
+    if _provider is None:
+        factory = PROVIDERS.get(settings.LLM_PROVIDER)
+        if factory is None:
+            raise ValueError(f"Unknown LLM_PROVIDER '{settings.LLM_PROVIDER}' (expected one of {sorted(PROVIDERS)})")
+        _provider = factory()
+        logger.info(f"LLM provider initialized: {_provider.name}")
+
+    return _provider
+
+
+def set_llm_provider(provider: Optional[LLMProvider]) -> None:
+    """Replace the active provider (None: recreate from settings on next use)"""
+    global _provider
+    _provider = provider
+
+
+def _record_tokens(provider: LLMProvider, prompt: str, response: str) -> None:
+    LLM_TOKENS.labels(provider.name, "prompt").inc(estimate_tokens(prompt))
+    LLM_TOKENS.labels(provider.name, "completion").inc(estimate_tokens(response))
+
+
+async def generate_text(prompt: str) -> str:
+    """Generate a response with the active provider under the "llm" resilience policy"""
+    provider = get_llm_provider()
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with span("llm.generate", "client", "llm", **{"llm.provider": provider.name, "llm.model": settings.LLM_MODEL}):
+            text = await resilience.call("llm", lambda: provider.agenerate(prompt))
+        outcome = "success"
+    finally:
+        LLM_REQUEST_DURATION.labels(provider.name, "generate", outcome).observe(time.perf_counter() - start)
+
+    _record_tokens(provider, prompt, text)
+    return text
+
+
+async def stream_text(prompt: str) -> AsyncIterator[str]:
+    """
+    Stream a response with the active provider
+
+    Only the wait for the first chunk is covered by the "llm" deadline and
+    retries; a stream that fails midway is not restarted.
+    """
+    provider = get_llm_provider()
+    start = time.perf_counter()
+    outcome = "error"
+    chunks = []
+    # Not made current: a generator may be resumed from another context
+    llm_span = start_span("llm.stream", "client", "llm", **{"llm.provider": provider.name, "llm.model": settings.LLM_MODEL})
+
+    async def first_chunk():
+        stream = provider.stream(prompt)
+        try:
+            return stream, await stream.__anext__()
+        except StopAsyncIteration:
+            return stream, None
+
+    try:
+        stream, chunk = await resilience.call("llm", first_chunk)
+        LLM_TIME_TO_FIRST_CHUNK.labels(provider.name).observe(time.perf_counter() - start)
+
+        if chunk is not None:
+            chunks.append(chunk)
+            yield chunk
+            async for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        outcome = "success"
+    finally:
+        LLM_REQUEST_DURATION.labels(provider.name, "stream", outcome).observe(time.perf_counter() - start)
+        _record_tokens(provider, prompt, "".join(chunks))
+        llm_span.set("llm.outcome", outcome)
+        llm_span.end()
+
+
+class LLMService:
+    """Base for services that prompt the LLM"""
+
+    async def _generate_content(self, prompt: str) -> str:
+        """Generate content with the configured LLM provider"""
+        try:
+            return await generate_text(prompt)
+        except Exception as e:
+            logger.error(f"LLM error ({settings.LLM_PROVIDER}): {e!r}")
+            raise
+
+    async def _generate_cached(self, prompt: str, namespace: str) -> str:
+        """Generate content, reusing a cached answer for an identical prompt and model"""
+        return await get_cache().get_or_set(
+            namespace,
+            Cache.hash_key(f"{settings.LLM_PROVIDER}:{settings.LLM_MODEL}\n{prompt}"),
+            lambda: self._generate_content(prompt),
+            settings.CACHE_AI_TTL
+        )
@@ -6,23 +6,17 @@ Provides personalized content recommendations
 import logging
 from typing import List, Dict
 from collections import Counter
-import google.generativeai as genai
 
-from app.core.config import settings
 from app.core.database import get_database
+from app.ai_modules.llm import LLMService
+from app.services.article_serializer import find_article_views
 
 logger = logging.getLogger(__name__)
 
-# Configure Gemini
-genai.configure(api_key=settings.GEMINI_API_KEY)
 
-
-class RecommendationService:
+class RecommendationService(LLMService):
     """Service for personalized content recommendations"""
     
-    def __init__(self):
-        self.model = genai.GenerativeModel('gemini-3-flash-preview')
-    
     async def get_personalized_recommendations(
         self,
         user_id: str,
@@ -104,7 +98,7 @@ class RecommendationService:
             ]
         }
         
-        articles = await db.articles.find(query).limit(limit * 2).to_list(limit * 2)
+        articles = await find_article_views(db.articles, query, limit=limit * 2)
         
         # Score and sort by relevance
         scored_articles = []
@@ -154,7 +148,7 @@ class RecommendationService:
             "difficulty": difficulty
         }
         
-        articles = await db.articles.find(query).limit(limit).to_list(limit)
+        articles = await find_article_views(db.articles, query, limit=limit)
         
         return articles
     
@@ -170,10 +164,12 @@ class RecommendationService:
         # Get articles with high engagement (views + likes)
         query = {"_id": {"$nin": exclude_ids}}
         
-        articles = await db.articles.find(query).sort([
-            ("views", -1),
-            ("likes", -1)
-        ]).limit(limit).to_list(limit)
+        articles = await find_article_views(
+            db.articles,
+            query,
+            sort=[("views", -1), ("likes", -1)],
+            limit=limit
+        )
         
         return articles
     
@@ -202,7 +198,7 @@ class RecommendationService:
                 ]
             }
             
-            related_articles = await db.articles.find(related_query).limit(limit * 2).to_list(limit * 2)
+            related_articles = await find_article_views(db.articles, related_query, limit=limit * 2)
             
             # Score by similarity
             scored = []
@@ -245,10 +241,10 @@ class RecommendationService:
         """
         
         try:
-            response = self.model.generate_content(prompt)
+            text = await self._generate_cached(prompt, "ai:topics")
             topics = [
                 line.strip().lstrip('0123456789.-•) ')
-                for line in response.text.split('\n')
+                for line in text.split('\n')
                 if line.strip()
             ]
             return topics[:limit]
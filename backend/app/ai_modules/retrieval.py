@@ -0,0 +1,291 @@
+"""
+Article Retrieval Module
+Selects the parts of an article relevant to a question so prompts carry
+only useful context instead of the article's first couple of thousand chars
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.core.database import get_database
+from app.ai_modules.tokens import estimate_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+# Section headings in Wikipedia plaintext extracts ("== History ==") and Markdown
+_HEADING_RE = re.compile(r"^\s*(?:={2,}\s*(.+?)\s*={2,}|#{1,6}\s+(.+?))\s*$")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_TERM_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by can did do does for from had has have how i if in into is it "
+    "its me my of on or so than that the their them then there these they this to was we were "
+    "what when where which who why will with you your about tell explain please".split()
+)
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased content terms (stopwords dropped)"""
+    return [term for term in _TERM_RE.findall(text.lower()) if term not in STOPWORDS]
+
+
+def article_revision(article: dict) -> str:
+    """Identifier of an article's current content revision"""
+    if article.get("contentHash"):
+        return article["contentHash"]
+
+    # Articles stored before content hashes were recorded
+    revised_at = article.get("updatedAt") or article.get("createdAt")
+    return revised_at.isoformat() if revised_at else "0"
+
+
+def chunk_article(content: str, target_tokens: int) -> List[Dict]:
+    """
+    Split article content into section-aware chunks of about `target_tokens`
+
+    Paragraphs are packed together up to the target; a paragraph larger than
+    the target is split on sentence boundaries. Every chunk remembers the
+    heading of the section it came from.
+    """
+    # Group paragraphs under their section heading
+    sections = []
+    heading = None
+    paragraphs: List[str] = []
+    for block in re.split(r"\n\s*\n", content):
+        lines = []
+        for line in block.strip().splitlines():
+            match = _HEADING_RE.match(line)
+            if match:
+                if lines:
+                    paragraphs.append(" ".join(lines))
+                    lines = []
+                if paragraphs:
+                    sections.append((heading, paragraphs))
+                    paragraphs = []
+                heading = match.group(1) or match.group(2)
+            elif line.strip():
+                lines.append(line.strip())
+        if lines:
+            paragraphs.append(" ".join(lines))
+    if paragraphs:
+        sections.append((heading, paragraphs))
+
+    chunks = []
+    for heading, section_paragraphs in sections:
+        pieces = []
+        for paragraph in section_paragraphs:
+            if estimate_tokens(paragraph) <= target_tokens:
+                pieces.append(paragraph)
+            else:
+                pieces.extend(s for s in _SENTENCE_RE.split(paragraph) if s)
+
+        current: List[str] = []
+        current_tokens = 0
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece)
+            if current and current_tokens + piece_tokens > target_tokens:
+                chunks.append((heading, " ".join(current)))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+        if current:
+            chunks.append((heading, " ".join(current)))
+
+    indexed = []
+    for position, (heading, text) in enumerate(chunks):
+        # A single run-on sentence can still exceed the target
+        text = truncate_to_tokens(text, target_tokens * 2)
+        indexed.append({
+            "position": position,
+            "heading": heading,
+            "text": text,
+            "tokens": estimate_tokens(text),
+            "terms": dict(Counter(tokenize(f"{heading or ''} {text}")))
+        })
+
+    return indexed
+
+
+class ArticleChunkIndex:
+    """BM25 index over one article revision's chunks"""
+
+    def __init__(self, article_id: str, title: str, revision: str, chunks: List[Dict]):
+        self.article_id = article_id
+        self.title = title
+        self.revision = revision
+        self.chunks = chunks
+
+        self.average_length = (
+            sum(sum(chunk["terms"].values()) for chunk in chunks) / len(chunks) if chunks else 0
+        )
+        document_frequency = Counter(term for chunk in chunks for term in chunk["terms"])
+        total = len(chunks)
+        self.idf = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+    def score(self, query_terms: List[str], chunk: Dict) -> float:
+        terms = chunk["terms"]
+        length = sum(terms.values())
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (self.average_length or 1))
+
+        score = 0.0
+        for term in set(query_terms):
+            frequency = terms.get(term)
+            if frequency:
+                score += self.idf[term] * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+        return score
+
+    def search(self, query: str, top_k: int) -> List[Dict]:
+        """Top-k chunks by BM25 score (empty if nothing matches)"""
+        query_terms = tokenize(query)
+        scored = [(self.score(query_terms, chunk), chunk) for chunk in self.chunks]
+        scored = [item for item in scored if item[0] > 0]
+        scored.sort(key=lambda item: (-item[0], item[1]["position"]))
+
+        return [chunk for _, chunk in scored[:top_k]]
+
+    def build_context(
+        self,
+        query: str,
+        token_budget: Optional[int] = None,
+        top_k: Optional[int] = None
+    ) -> str:
+        """
+        Assemble the most relevant chunks into a context block within `token_budget`
+
+        Chunks are chosen by relevance, then emitted in article order. The
+        lead chunk is used when the question matches nothing.
+        """
+        token_budget = token_budget or settings.ARTICLE_CONTEXT_TOKEN_BUDGET
+        top_k = top_k or settings.ARTICLE_CONTEXT_TOP_K
+
+        selected = []
+        used = estimate_tokens(self.title)
+        candidates = self.search(query, top_k) or self.chunks[:1]
+        for chunk in candidates:
+            if used + chunk["tokens"] > token_budget:
+                continue
+            selected.append(chunk)
+            used += chunk["tokens"]
+
+        if not selected and candidates:
+            # Budget smaller than any chunk: trim the best one
+            best = dict(candidates[0])
+            best["text"] = truncate_to_tokens(best["text"], max(0, token_budget - used))
+            selected = [best]
+
+        parts = [self.title]
+        for chunk in sorted(selected, key=lambda chunk: chunk["position"]):
+            if chunk["heading"]:
+                parts.append(f"[{chunk['heading']}]\n{chunk['text']}")
+            else:
+                parts.append(chunk["text"])
+
+        return "\n\n".join(parts)
+
+
+class ArticleRetrievalService:
+    """Service maintaining per-revision chunk indexes and retrieving article context"""
+
+    async def get_index(self, article_id: str) -> Optional[ArticleChunkIndex]:
+        """Load (or build once) the chunk index for an article's current revision"""
+        db = get_database()
+
+        if not ObjectId.is_valid(article_id):
+            return None
+
+        article = await db.articles.find_one(
+            {"_id": ObjectId(article_id)},
+            {"title": 1, "contentHash": 1, "updatedAt": 1, "createdAt": 1}
+        )
+        if not article:
+            return None
+
+        revision = article_revision(article)
+
+        async def load() -> Dict:
+            return await self._load_or_build(article["_id"], revision)
+
+        stored = await get_cache().get_or_set(
+            "article-chunks", f"{article_id}:{revision}", load, settings.CACHE_AI_TTL
+        )
+
+        return ArticleChunkIndex(article_id, article["title"], revision, stored["chunks"])
+
+    async def _load_or_build(self, article_id: ObjectId, revision: str) -> Dict:
+        db = get_database()
+
+        stored = await db.article_chunks.find_one(
+            {"articleId": article_id, "revision": revision},
+            {"_id": 0, "chunks": 1}
+        )
+        if stored:
+            return stored
+
+        return await self.index_article(article_id)
+
+    async def index_article(self, article_id: ObjectId) -> Dict:
+        """Chunk an article's current content and store it, replacing older revisions"""
+        db = get_database()
+
+        article = await db.articles.find_one(
+            {"_id": article_id},
+            {"content": 1, "contentHash": 1, "updatedAt": 1, "createdAt": 1}
+        )
+        if not article:
+            return {"chunks": []}
+
+        revision = article_revision(article)
+        chunks = chunk_article(article.get("content", ""), settings.ARTICLE_CHUNK_TOKENS)
+
+        await db.article_chunks.replace_one(
+            {"articleId": article_id, "revision": revision},
+            {"articleId": article_id, "revision": revision, "chunks": chunks},
+            upsert=True
+        )
+        await db.article_chunks.delete_many({"articleId": article_id, "revision": {"$ne": revision}})
+
+        logger.info(f"Indexed article {article_id} revision {revision} into {len(chunks)} chunks")
+
+        return {"chunks": chunks}
+
+    async def delete_index(self, article_id: str) -> None:
+        """Drop every stored revision of an article's chunk index"""
+        db = get_database()
+
+        await db.article_chunks.delete_many({"articleId": ObjectId(article_id)})
+
+    async def get_article_context(
+        self,
+        article_id: str,
+        query: str,
+        token_budget: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Article text relevant to `query`, fitted into `token_budget` tokens
+
+        Returns None if the article does not exist.
+        """
+        index = await self.get_index(article_id)
+        if index is None:
+            return None
+
+        return index.build_context(query, token_budget)
+
+
+# Singleton instance
+retrieval_service = ArticleRetrievalService()
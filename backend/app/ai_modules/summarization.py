@@ -1,37 +1,30 @@
 """
 AI Summarization Module
-Generates summaries in multiple styles using Gemini AI
+Generates summaries in multiple styles with the LLM provider, with a local
+extractive summarizer for the "fast" style and as a latency fallback
 """
 
+import asyncio
 import logging
 from typing import Optional
-import google.generativeai as genai
 
 from app.core.config import settings
+from app.ai_modules.extractive import extractive_summarizer
+from app.ai_modules.llm import LLMService
+from app.core.tasks import spawn
 
 logger = logging.getLogger(__name__)
 
-# Configure Gemini
-genai.configure(api_key=settings.GEMINI_API_KEY)
 
-
-class SummarizationService:
+class SummarizationService(LLMService):
     """Service for AI-powered content summarization"""
     
-    def __init__(self):
-        try:
-            # Use correct Gemini model name
-            self.model = genai.GenerativeModel('gemini-3-flash-preview')
-            logger.info("Gemini model initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Gemini model: {e}")
-            self.model = None
-    
     async def summarize(
         self,
         content: str,
         max_length: int = 300,
-        style: str = "concise"
+        style: str = "concise",
+        fallback: bool = True
     ) -> str:
         """
         Generate summary based on style
@@ -41,25 +34,59 @@ class SummarizationService:
         - eli5: Explain Like I'm 5 (Gen Z friendly)
         - bullet_points: Key points in bullet format
         - emoji: Fun summary with emojis
+        - fast: Extractive summary built locally, without the LLM
+        
+        With `fallback`, an extractive summary is returned when the LLM is
+        unavailable or misses SUMMARY_LATENCY_BUDGET_SECONDS; the LLM call
+        keeps running in the background so its answer is cached for next time.
         """
         
         try:
-            if not self.model:
-                raise Exception("Gemini model not initialized - check API key")
-            
             if not content or len(content) < 50:
                 raise ValueError("Content too short to summarize")
             
+            if style == "fast":
+                return self.extractive_summary(content, max_length)
+            
             prompt = self._build_prompt(content, max_length, style)
             
-            response = await self._generate_content(prompt)
+            if not fallback:
+                return await self._generate_cached(prompt, "ai:summary")
             
-            return response
+            # A tracked task outlives a missed budget (and is cancelled on shutdown)
+            generation = spawn(self._generate_or_none(prompt), name="summary-llm")
+            try:
+                summary = await asyncio.wait_for(
+                    asyncio.shield(generation),
+                    settings.SUMMARY_LATENCY_BUDGET_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Let it finish and fill the cache
+                logger.warning("LLM summary missed the latency budget, using extractive summary")
+                summary = None
+            
+            return summary if summary is not None else self.extractive_summary(content, max_length, style)
             
         except Exception as e:
             logger.error(f"Summarization error: {str(e)}")
             raise
     
+    async def _generate_or_none(self, prompt: str) -> Optional[str]:
+        """LLM summary, or None when the call fails (handled by the caller's fallback)"""
+        try:
+            return await self._generate_cached(prompt, "ai:summary")
+        except Exception as e:
+            logger.warning(f"LLM summary failed, using extractive summary: {e!r}")
+            return None
+    
+    def extractive_summary(self, content: str, max_length: int = 300, style: str = "concise") -> str:
+        """Local extractive summary (bullet_points style gets one bullet per sentence)"""
+        if style == "bullet_points":
+            sentences = extractive_summarizer.summarize_sentences(content, max_length, max_sentences=5)
+            return "\n".join(f"• {sentence}" for sentence in sentences)
+        
+        return extractive_summarizer.summarize(content, max_length)
+    
     def _build_prompt(self, content: str, max_length: int, style: str) -> str:
         """Build prompt based on summarization style"""
         
@@ -83,15 +110,6 @@ class SummarizationService:
         
         return f"{instruction}{content}"
     
-    async def _generate_content(self, prompt: str) -> str:
-        """Generate content using Gemini"""
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            logger.error(f"Gemini API error: {str(e)}")
-            raise
-    
     async def generate_title_summary(self, title: str, content: str) -> str:
         """Generate a catchy title-based summary"""
         prompt = f"""
@@ -113,7 +131,7 @@ class SummarizationService:
         {content}
         """
         
-        response = await self._generate_content(prompt)
+        response = await self._generate_cached(prompt, "ai:key-facts")
         
         # Parse numbered list
         facts = []
@@ -144,7 +162,7 @@ class SummarizationService:
         
         prompt = f"{instruction}\n\nContent:\n{content}"
         
-        return await self._generate_content(prompt)
+        return await self._generate_cached(prompt, "ai:simplify")
 
 
 # Singleton instance
@@ -0,0 +1,43 @@
+"""
+Token Estimation
+Cheap, dependency-free token counts for sizing prompts
+"""
+
+import math
+import re
+
+# Gemini and GPT-style tokenizers average about four characters per token on
+# English prose; counting words as well keeps short, word-dense text honest.
+CHARS_PER_TOKEN = 4.0
+TOKENS_PER_WORD = 1.3
+
+_WORD_RE = re.compile(r"\S+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in `text`"""
+    if not text:
+        return 0
+
+    by_chars = len(text) / CHARS_PER_TOKEN
+    by_words = len(_WORD_RE.findall(text)) * TOKENS_PER_WORD
+
+    return math.ceil(max(by_chars, by_words))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` at a word boundary so it fits in roughly `max_tokens`"""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    cut = text[:int(max_tokens * CHARS_PER_TOKEN)]
+    while cut and estimate_tokens(cut) > max_tokens:
+        cut = cut[:int(len(cut) * 0.9)]
+
+    boundary = cut.rfind(" ")
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary]
+
+    return cut.rstrip() + "..."
@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, articles, ai, users, saved_topics
+from app.api.v1.endpoints import auth, articles, ai, users, saved_topics, admin
 
 api_router = APIRouter()
 
@@ -12,3 +12,4 @@ api_router.include_router(users.router, prefix="/users", tags=["Users"])
 api_router.include_router(articles.router, prefix="/articles", tags=["Articles"])
 api_router.include_router(ai.router, prefix="/ai", tags=["AI Features"])
 api_router.include_router(saved_topics.router, prefix="/saved", tags=["Saved Topics"])
+api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
@@ -0,0 +1,167 @@
+"""Admin endpoints (X-Admin-Token: ADMIN_API_KEY)"""
+
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.core.security import require_admin
+from app.core.responses import ORJSONResponse
+from app.core import memory, profiling
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles")
+async def list_profiles():
+    """
+    List stored request profiles, newest first
+    
+    Requires the X-Admin-Token header
+    """
+    return ORJSONResponse({
+        "profiler": "pyinstrument" if profiling.Profiler is not None else "cProfile",
+        "sampleRate": settings.PROFILING_SAMPLE_RATE,
+        "profiles": profiling.list_profiles()
+    })
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str):
+    """
+    Download a stored profile (.html from pyinstrument, .prof pstats from cProfile)
+    
+    Requires the X-Admin-Token header
+    
+    - **profile_id**: Profile ID from the listing or a response's X-Profile-Id header
+    """
+    path = profiling.profile_path(profile_id)
+    if not path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    media_type = "text/html" if profile_id.endswith(".html") else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=profile_id)
+
+
+@router.post("/profiles/token")
+async def create_profile_token(
+    ttl: int = Query(600, ge=1, le=86400, description="Seconds the token stays valid")
+):
+    """
+    Create a signed X-Profile header value; requests sending it are profiled
+    
+    Requires the X-Admin-Token header and PROFILING_SECRET
+    
+    - **ttl**: Seconds the token stays valid
+    """
+    if not settings.PROFILING_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="PROFILING_SECRET is not configured"
+        )
+    
+    return ORJSONResponse({"header": "X-Profile", **profiling.create_profile_token(ttl)})
+
+
+@router.get("/memory")
+async def memory_report():
+    """
+    Worker memory: RSS and its recent history, approximate size of every
+    registered cache and in-process index, gc and tracemalloc state
+    
+    Requires the X-Admin-Token header
+    """
+    return ORJSONResponse(await asyncio.to_thread(memory.memory_report))
+
+
+@router.post("/memory/tracemalloc/start")
+async def start_tracemalloc(
+    frames: Optional[int] = Query(None, ge=1, le=100, description="Traceback depth (default TRACEMALLOC_FRAMES)")
+):
+    """
+    Start tracing allocations (adds CPU and memory overhead until stopped)
+    
+    Requires the X-Admin-Token header
+    """
+    memory.start_tracemalloc(frames)
+    return ORJSONResponse(memory.tracemalloc_state())
+
+
+@router.post("/memory/tracemalloc/stop")
+async def stop_tracemalloc():
+    """
+    Stop tracing allocations and drop stored snapshots
+    
+    Requires the X-Admin-Token header
+    """
+    memory.stop_tracemalloc()
+    return ORJSONResponse(memory.tracemalloc_state())
+
+
+@router.post("/memory/snapshots")
+async def take_memory_snapshot(
+    top: int = Query(20, ge=1, le=500, description="Allocation sites to return")
+):
+    """
+    Take a tracemalloc snapshot and return its largest allocation sites
+    
+    Requires the X-Admin-Token header and a running tracemalloc
+    
+    - **top**: Allocation sites to return
+    """
+    try:
+        return ORJSONResponse(await asyncio.to_thread(memory.take_snapshot, top))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+
+@router.get("/memory/snapshots/{snapshot_id}")
+async def get_memory_snapshot(
+    snapshot_id: int,
+    top: int = Query(20, ge=1, le=500, description="Allocation sites to return")
+):
+    """
+    Largest allocation sites of a stored snapshot
+    
+    Requires the X-Admin-Token header
+    
+    - **snapshot_id**: ID returned when the snapshot was taken
+    """
+    try:
+        return ORJSONResponse(await asyncio.to_thread(memory.snapshot_top, snapshot_id, top))
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Snapshot not found"
+        )
+
+
+@router.get("/memory/snapshots/{snapshot_id}/diff/{other_id}")
+async def diff_memory_snapshots(
+    snapshot_id: int,
+    other_id: int,
+    top: int = Query(20, ge=1, le=500, description="Allocation sites to return")
+):
+    """
+    Allocation sites that grew most from one snapshot to another
+    
+    Requires the X-Admin-Token header
+    
+    - **snapshot_id**: Earlier snapshot
+    - **other_id**: Later snapshot
+    """
+    try:
+        return ORJSONResponse(await asyncio.to_thread(memory.snapshot_diff, snapshot_id, other_id, top))
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Snapshot not found"
+        )
@@ -5,34 +5,42 @@ from typing import List
 from app.models.schemas import (
     SummarizeRequest, SummarizeResponse,
     ChatRequest, ChatResponse,
-    PersonalizeRequest, PersonalizeResponse
+    PersonalizeRequest, PersonalizeResponse,
+    ConversationListResponse, ConversationMessagesResponse
 )
 from app.ai_modules.summarization import summarization_service
 from app.ai_modules.chat import chat_service
 from app.ai_modules.recommendations import recommendation_service
+from app.ai_modules.retrieval import retrieval_service
 from app.core.security import get_current_user, get_current_user_optional
+from app.core.admission import admission
 from app.core.database import get_database
-from app.models.database import ConversationModel
+from app.core.responses import ORJSONResponse
+from app.services.conversation_service import conversation_service
+from app.services.artifact_service import artifact_service
 from bson import ObjectId
 from datetime import datetime
 
 router = APIRouter()
 
 
-@router.post("/summarize", response_model=SummarizeResponse)
+@router.post("/summarize", response_model=SummarizeResponse, dependencies=[Depends(admission("summarize"))])
 async def summarize_content(request: SummarizeRequest):
     """
     Generate AI summary of content
     
     - **content**: Text content to summarize (min 50 characters)
     - **maxLength**: Maximum summary length (50-1000 characters)
-    - **style**: Summary style (concise, eli5, bullet_points, emoji)
+    - **style**: Summary style (concise, eli5, bullet_points, emoji, fast)
     
     Styles:
     - **concise**: Professional, clear summary
     - **eli5**: Explain Like I'm 5 (Gen Z friendly)
     - **bullet_points**: Key points in bullet format
     - **emoji**: Fun summary with emojis
+    - **fast**: Instant extractive summary (the article's own key sentences)
+    
+    If the LLM is slow or unavailable, an extractive summary is returned instead.
     """
     try:
         summary = await summarization_service.summarize(
@@ -54,7 +62,7 @@ async def summarize_content(request: SummarizeRequest):
         )
 
 
-@router.post("/summarize/key-facts")
+@router.post("/summarize/key-facts", dependencies=[Depends(admission("key-facts"))])
 async def extract_key_facts(
     content: str,
     count: int = Query(5, ge=1, le=10, description="Number of key facts to extract")
@@ -79,7 +87,81 @@ async def extract_key_facts(
         )
 
 
-@router.post("/chat", response_model=ChatResponse)
+@router.get("/articles/{article_id}/summary", dependencies=[Depends(admission("article-artifacts"))])
+async def get_article_summary(
+    article_id: str,
+    style: str = Query("concise", pattern="^(concise|eli5|bullet_points|emoji)$")
+):
+    """
+    Get an article's AI summary
+    
+    - **article_id**: Article's ID
+    - **style**: Summary style (concise, eli5, bullet_points, emoji)
+    
+    Summaries are precomputed when an article is created or edited
+    """
+    try:
+        summary = await artifact_service.get_summary(article_id, style)
+        
+        if summary is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Article not found"
+            )
+        
+        return {
+            "articleId": article_id,
+            "style": style,
+            "summary": summary
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get article summary"
+        )
+
+
+@router.get("/articles/{article_id}/key-facts", dependencies=[Depends(admission("article-artifacts"))])
+async def get_article_key_facts(
+    article_id: str,
+    count: int = Query(5, ge=1, le=10, description="Number of key facts to return")
+):
+    """
+    Get key facts from an article
+    
+    - **article_id**: Article's ID
+    - **count**: Number of key facts (1-10)
+    
+    Key facts are precomputed when an article is created or edited
+    """
+    try:
+        facts = await artifact_service.get_artifact(article_id, "keyFacts")
+        
+        if facts is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Article not found"
+            )
+        
+        facts = facts[:count]
+        
+        return {
+            "articleId": article_id,
+            "facts": facts,
+            "count": len(facts)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get key facts"
+        )
+
+
+@router.post("/chat", response_model=ChatResponse, dependencies=[Depends(admission("chat"))])
 async def chat_with_ai(
     request: ChatRequest,
     current_user: dict = Depends(get_current_user_optional)
@@ -96,59 +178,66 @@ async def chat_with_ai(
     AI provides intelligent, context-aware responses
     """
     try:
-        db = get_database()
-        
         # Get or create conversation (only for authenticated users)
         conversation_id = request.conversationId
         conversation_history = []
+        summary = None
+        summarized_through = -1
         article_context = None
         
         # Only manage persistent conversations for authenticated users
         if current_user and conversation_id:
-            # Load existing conversation
-            conversation = await db.conversations.find_one(
-                {"_id": ObjectId(conversation_id)}
+            # Load the rolling summary and the turns it does not cover yet
+            conversation = await conversation_service.get_conversation(
+                conversation_id,
+                current_user["user_id"]
             )
             if conversation:
-                conversation_history = conversation.get('messages', [])
+                summary = conversation.get("summary")
+                summarized_through = conversation.get("summarizedThroughSeq", -1)
+                conversation_history = await conversation_service.get_recent_messages(
+                    conversation_id,
+                    chat_service.max_history,
+                    after_seq=summarized_through
+                )
         elif current_user:
             # Create new conversation for authenticated user
-            conversation_doc = ConversationModel.create_document(
-                user_id=current_user["user_id"],
-                article_id=request.articleId
+            conversation_id = await conversation_service.create_conversation(
+                current_user["user_id"],
+                request.articleId,
+                title=request.message
             )
-            result = await db.conversations.insert_one(conversation_doc)
-            conversation_id = str(result.inserted_id)
         
-        # Get article context if provided
+        # Get the article passages relevant to this message
         if request.articleId:
-            article = await db.articles.find_one({"_id": ObjectId(request.articleId)})
-            if article:
-                article_context = f"{article['title']}\n\n{article['content'][:2000]}"
+            article_context = await retrieval_service.get_article_context(
+                request.articleId,
+                request.message
+            )
         
         # Generate AI response
         ai_response = await chat_service.generate_response(
             request.message,
             conversation_history,
-            article_context
+            article_context,
+            summary
         )
         
         # Save messages to conversation (only for authenticated users)
         if current_user and conversation_id:
-            user_message = ConversationModel.add_message("user", request.message)
-            ai_message = ConversationModel.add_message("assistant", ai_response)
-            
-            await db.conversations.update_one(
-                {"_id": ObjectId(conversation_id)},
-                {
-                    "$push": {
-                        "messages": {
-                            "$each": [user_message, ai_message]
-                        }
-                    },
-                    "$set": {"updatedAt": datetime.utcnow()}
-                }
+            saved = await conversation_service.append_messages(
+                conversation_id,
+                current_user["user_id"],
+                [("user", request.message), ("assistant", ai_response)]
             )
+            
+            # Fold turns that no longer fit the history budget into the summary
+            if saved:
+                conversation_service.compact_history(
+                    conversation_id,
+                    summarized_through,
+                    conversation_history + saved
+                )
         
         return ChatResponse(
             response=ai_response,
@@ -163,7 +252,83 @@ async def chat_with_ai(
         )
 
 
-@router.post("/chat/article-question")
+@router.get("/conversations", response_model=ConversationListResponse)
+async def list_conversations(
+    cursor: str = Query(None, description="nextCursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    List your saved conversations, most recently active first
+    
+    Requires authentication token
+    
+    - **cursor**: Pagination cursor (nextCursor of the previous page)
+    - **limit**: Conversations per page (1-100)
+    """
+    try:
+        page = await conversation_service.list_conversations(
+            current_user["user_id"],
+            cursor,
+            limit
+        )
+        
+        return ORJSONResponse(page)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to list conversations"
+        )
+
+
+@router.get("/conversations/{conversation_id}/messages", response_model=ConversationMessagesResponse)
+async def get_conversation_messages(
+    conversation_id: str,
+    cursor: int = Query(None, ge=0, description="nextCursor from the previous page"),
+    limit: int = Query(50, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Page backwards through a conversation's messages
+    
+    Requires authentication token
+    
+    - **conversation_id**: Conversation's ID
+    - **cursor**: Pagination cursor; omit for the latest messages
+    - **limit**: Messages per page (1-100)
+    
+    Messages in each page are oldest first
+    """
+    try:
+        conversation = await conversation_service.get_conversation(
+            conversation_id,
+            current_user["user_id"]
+        )
+        
+        if not conversation:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conversation not found"
+            )
+        
+        page = await conversation_service.get_messages(conversation_id, cursor, limit)
+        
+        return ORJSONResponse(page)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get conversation messages"
+        )
+
+
+@router.post("/chat/article-question", dependencies=[Depends(admission("article-question"))])
 async def ask_article_question(
     article_id: str,
     question: str,
@@ -180,12 +345,10 @@ async def ask_article_question(
     Returns AI-generated answer based on article content
     """
     try:
-        db = get_database()
+        # Get the article passages relevant to the question
+        index = await retrieval_service.get_index(article_id)
         
-        # Get article
-        article = await db.articles.find_one({"_id": ObjectId(article_id)})
-        
-        if not article:
+        if not index:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Article not found"
@@ -194,8 +357,8 @@ async def ask_article_question(
         # Generate answer
         answer = await chat_service.answer_article_question(
             question,
-            article['title'],
-            article['content']
+            index.title,
+            index.build_context(question)
         )
         
         return {
@@ -213,7 +376,7 @@ async def ask_article_question(
         )
 
 
-@router.get("/chat/follow-up-questions")
+@router.get("/chat/follow-up-questions", dependencies=[Depends(admission("follow-up-questions"))])
 async def generate_follow_up_questions(
     article_id: str,
     count: int = Query(3, ge=1, le=5)
@@ -224,27 +387,20 @@ async def generate_follow_up_questions(
     - **article_id**: Article's ID
     - **count**: Number of questions to generate (1-5)
     
-    Helps users explore topics more deeply
+    Helps users explore topics more deeply. Questions are precomputed when
+    an article is created or edited
     """
     try:
-        db = get_database()
-        
-        article = await db.articles.find_one({"_id": ObjectId(article_id)})
+        questions = await artifact_service.get_artifact(article_id, "followUpQuestions")
         
-        if not article:
+        if questions is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Article not found"
             )
         
-        questions = await chat_service.generate_follow_up_questions(
-            article['title'],
-            article['content'],
-            count
-        )
-        
         return {
-            "questions": questions,
+            "questions": questions[:count],
             "articleId": article_id
         }
         
@@ -257,7 +413,7 @@ async def generate_follow_up_questions(
         )
 
 
-@router.post("/personalize", response_model=PersonalizeResponse)
+@router.post("/personalize", response_model=PersonalizeResponse, dependencies=[Depends(admission("personalize"))])
 async def personalize_content(
     request: PersonalizeRequest,
     current_user: dict = Depends(get_current_user)
@@ -293,7 +449,7 @@ async def personalize_content(
         )
 
 
-@router.get("/recommendations", response_model=List[dict])
+@router.get("/recommendations", response_model=List[dict], dependencies=[Depends(admission("recommendations"))])
 async def get_recommendations(
     limit: int = Query(5, ge=1, le=20),
     current_user: dict = Depends(get_current_user)
@@ -327,14 +483,8 @@ async def get_recommendations(
             limit
         )
         
-        # Format articles
-        from app.services.article_service import article_service
-        formatted_recommendations = [
-            article_service._format_article(article)
-            for article in recommendations
-        ]
-        
-        return formatted_recommendations
+        # Articles are already in their API shape
+        return ORJSONResponse(recommendations)
         
     except HTTPException:
         raise
@@ -345,7 +495,7 @@ async def get_recommendations(
         )
 
 
-@router.get("/topic-suggestions")
+@router.get("/topic-suggestions", dependencies=[Depends(admission("topic-suggestions"))])
 async def get_topic_suggestions(
     query: str = Query(..., min_length=1),
     limit: int = Query(5, ge=1, le=10)
@@ -375,7 +525,7 @@ async def get_topic_suggestions(
         )
 
 
-@router.get("/explain/{concept}")
+@router.get("/explain/{concept}", dependencies=[Depends(admission("explain"))])
 async def explain_concept(
     concept: str,
     context: str = Query(None, description="Optional context for explanation")
@@ -7,6 +7,8 @@ from app.services.article_service import article_service
 from app.services.wikipedia_service import wikipedia_service
 from app.ai_modules.recommendations import recommendation_service
 from app.core.security import get_current_user
+from app.core.http_cache import article_validators, collection_etag
+from app.core.responses import ORJSONResponse
 
 router = APIRouter()
 
@@ -37,7 +39,7 @@ async def create_article(
             current_user["user_id"]
         )
         
-        return article
+        return ORJSONResponse(article, status_code=status.HTTP_201_CREATED)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -82,7 +84,7 @@ async def search_articles(
             skip=skip
         )
         
-        return results
+        return ORJSONResponse(results)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -98,10 +100,12 @@ async def get_trending_articles(
     Get trending articles (most viewed and liked)
     
     - **limit**: Number of articles to return (1-50)
+    
+    Supports conditional requests via ETag / If-None-Match
     """
     try:
         articles = await article_service.get_trending_articles(limit)
-        return articles
+        return ORJSONResponse(articles, headers={"ETag": collection_etag(articles)})
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -119,10 +123,12 @@ async def get_articles_by_category(
     
     - **category**: Category name
     - **limit**: Number of articles to return
+    
+    Supports conditional requests via ETag / If-None-Match
     """
     try:
         articles = await article_service.get_articles_by_category(category, limit)
-        return articles
+        return ORJSONResponse(articles, headers={"ETag": collection_etag(articles)})
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -137,7 +143,7 @@ async def get_article(article_id: str):
     
     - **article_id**: Article's ID
     
-    Automatically increments view count
+    Automatically increments view count (also for 304 revalidations)
     """
     try:
         article = await article_service.get_article_by_id(article_id)
@@ -148,7 +154,7 @@ async def get_article(article_id: str):
                 detail="Article not found"
             )
         
-        return article
+        return ORJSONResponse(article, headers=article_validators(article))
     except HTTPException:
         raise
     except Exception as e:
@@ -164,6 +170,8 @@ async def get_article_by_slug(slug: str):
     Get article by slug (URL-friendly identifier)
     
     - **slug**: Article's slug
+    
+    Automatically increments view count (also for 304 revalidations)
     """
     try:
         article = await article_service.get_article_by_slug(slug)
@@ -174,7 +182,7 @@ async def get_article_by_slug(slug: str):
                 detail="Article not found"
             )
         
-        return article
+        return ORJSONResponse(article, headers=article_validators(article))
     except HTTPException:
         raise
     except Exception as e:
@@ -201,7 +209,7 @@ async def get_related_articles(
             limit
         )
         
-        return related
+        return ORJSONResponse(related)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -229,7 +237,7 @@ async def update_article(
             article_data
         )
         
-        return updated_article
+        return ORJSONResponse(updated_article)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -262,7 +270,7 @@ async def like_article(
             current_user["user_id"]
         )
         
-        return result
+        return ORJSONResponse(result)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -358,10 +366,10 @@ async def import_from_wikipedia(
         existing = await article_service.get_article_by_title(title)
         if existing:
             logger.info(f"Article '{title}' already exists")
-            return {
+            return ORJSONResponse({
                 "message": "Article already exists",
                 "article": existing
-            }
+            })
         
         # Fetch from Wikipedia
         logger.info(f"Fetching article from Wikipedia: {title}")
@@ -400,10 +408,10 @@ async def import_from_wikipedia(
         article = await article_service.create_article(article_data, current_user["user_id"])
         logger.info(f"Article created successfully with ID: {article.get('id')}")
         
-        return {
+        return ORJSONResponse({
             "message": "Article imported successfully",
             "article": article
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
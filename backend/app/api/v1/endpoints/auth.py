@@ -1,8 +1,12 @@
 """Authentication endpoints"""
 
-from fastapi import APIRouter, HTTPException, status
-from app.models.schemas import UserCreate, UserLogin, Token, UserResponse
+from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.security import HTTPAuthorizationCredentials
+from typing import Optional
+from app.models.schemas import UserCreate, UserLogin, Token, UserResponse, RefreshTokenRequest
 from app.services.user_service import user_service
+from app.services.session_service import session_service
+from app.core.security import security, get_current_user, revoke_token
 
 router = APIRouter()
 
@@ -45,7 +49,7 @@ async def login(credentials: UserLogin):
     - **email**: User's email
     - **password**: User's password
     
-    Returns user data and JWT access token
+    Returns user data, a JWT access token and a refresh token
     """
     try:
         user_data = await user_service.authenticate_user(
@@ -63,6 +67,7 @@ async def login(credentials: UserLogin):
                 "level": user_data["level"]
             },
             "access_token": user_data["token"],
+            "refresh_token": user_data["refresh_token"],
             "token_type": "bearer"
         }
     except ValueError as e:
@@ -77,6 +82,56 @@ async def login(credentials: UserLogin):
         )
 
 
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(request: RefreshTokenRequest):
+    """
+    Exchange a refresh token for a new access token
+    
+    - **refresh_token**: Refresh token from login or a previous refresh
+    
+    The refresh token is rotated: use the returned one next time. Reusing an
+    old refresh token revokes every session derived from the same login,
+    unless it was rotated less than REFRESH_TOKEN_REUSE_GRACE_SECONDS ago
+    (concurrent refreshes), in which case the same new refresh token is returned.
+    """
+    try:
+        return await session_service.refresh(request.refresh_token)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to refresh token"
+        )
+
+
+@router.post("/logout", response_model=dict)
+async def logout(
+    request: Optional[RefreshTokenRequest] = None,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Log out by revoking the current access token
+    
+    Requires authentication token
+    
+    - **refresh_token**: Optional refresh token (of the same user) whose session should also be ended
+    
+    The token is rejected immediately by this worker and by the others
+    within JWT_CACHE_TTL_SECONDS
+    """
+    await revoke_token(credentials.credentials)
+    
+    if request:
+        await session_service.revoke(request.refresh_token, current_user["user_id"])
+    
+    return {"message": "Logout successful"}
+
+
 @router.post("/verify", response_model=dict)
 async def verify_token(token: str):
     """
@@ -88,7 +143,7 @@ async def verify_token(token: str):
     """
     from app.core.security import verify_token as verify_jwt_token
     
-    payload = verify_jwt_token(token)
+    payload = await verify_jwt_token(token)
     
     if payload:
         return {
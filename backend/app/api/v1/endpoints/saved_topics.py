@@ -9,6 +9,8 @@ from app.models.schemas import SavedTopicCreate, SavedTopicResponse
 from app.models.database import SavedTopicModel
 from app.core.security import get_current_user
 from app.core.database import get_database
+from app.core.responses import ORJSONResponse
+from app.services.article_serializer import find_article_views
 
 router = APIRouter()
 
@@ -96,21 +98,25 @@ async def get_saved_topics(
         
         saved_topics = await cursor.to_list(limit)
         
-        # Fetch associated articles
+        # Fetch associated articles in one query
+        articles = await find_article_views(
+            db.articles,
+            {"_id": {"$in": [saved['articleId'] for saved in saved_topics]}}
+        )
+        articles_by_id = {article['id']: article for article in articles}
+        
         results = []
         for saved in saved_topics:
-            article = await db.articles.find_one({"_id": saved['articleId']})
+            article = articles_by_id.get(str(saved['articleId']))
             
             if article:
-                from app.services.article_service import article_service
-                
                 results.append({
                     "savedTopicId": str(saved['_id']),
                     "savedAt": saved['savedAt'],
-                    "article": article_service._format_article(article)
+                    "article": article
                 })
         
-        return results
+        return ORJSONResponse(results)
         
     except Exception as e:
         raise HTTPException(
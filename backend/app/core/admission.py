@@ -0,0 +1,277 @@
+"""
+Admission control for expensive (AI) endpoints
+
+Each request passes three gates before its handler runs:
+
+1. A token bucket per user (or client IP for anonymous callers).
+2. Load shedding: if the expected queueing delay already exceeds the
+   route's latency target, reject immediately instead of queueing.
+3. A global concurrency limit shared by all workers, waiting at most
+   `max_wait` seconds for a free slot.
+
+Rejections are 429 responses with a Retry-After header. Shared state lives
+in Redis when the cache tier uses it, otherwise in process memory.
+"""
+
+import asyncio
+import logging
+import math
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.core.cache import RedisCacheBackend, get_cache
+from app.core.config import settings
+from app.core.memory import register_memory
+from app.core.security import get_current_user_optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AdmissionPolicy:
+    """Limits for one route"""
+    rate: float = 1.0              # sustained requests per second per caller
+    burst: float = 10              # bucket capacity per caller
+    concurrency: int = 16          # in-flight requests across all workers
+    max_wait: float = 5.0          # longest time to queue for a slot (seconds)
+    latency_target: float = 2.0    # shed load when expected queueing exceeds this
+    lease_seconds: float = 120.0   # slot lease, reclaimed if a worker dies
+
+
+def get_policy(route: str) -> AdmissionPolicy:
+    """Resolve a route's policy from AI_ADMISSION_LIMITS (route overrides 'default')"""
+    limits = dict(settings.AI_ADMISSION_LIMITS.get("default", {}))
+    limits.update(settings.AI_ADMISSION_LIMITS.get(route, {}))
+    policy = AdmissionPolicy(**limits)
+    policy.concurrency = int(policy.concurrency)
+    return policy
+
+
+class LocalAdmissionBackend:
+    """Process-local buckets and slots (single worker or no Redis)"""
+
+    def __init__(self, max_buckets: int = 100000):
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        register_memory("admission.buckets", self, lambda backend: backend._buckets)
+        register_memory("admission.slots", self, lambda backend: backend._slots)
+
+    async def take_token(self, key: str, rate: float, burst: float) -> float:
+        """Consume one token; return 0 if allowed, else seconds until one is available"""
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated_at) * rate)
+
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_buckets:
+            self._buckets.popitem(last=False)
+
+        return wait
+
+    async def acquire_slot(self, route: str, policy: AdmissionPolicy, timeout: float) -> Optional[str]:
+        semaphore = self._slots.get(route)
+        if semaphore is None:
+            semaphore = self._slots[route] = asyncio.Semaphore(policy.concurrency)
+
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return route
+
+    async def release_slot(self, route: str, lease: str) -> None:
+        self._slots[route].release()
+
+
+class RedisAdmissionBackend:
+    """Buckets and slots shared by all workers through Redis"""
+
+    TOKEN_BUCKET_SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local state = redis.call('hmget', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local wait = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        wait = (1 - tokens) / rate
+    end
+    redis.call('hset', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('expire', KEYS[1], math.ceil(burst / rate) + 1)
+    return tostring(wait)
+    """
+
+    # Sorted-set semaphore: members are leases scored by their expiry time
+    ACQUIRE_SLOT_SCRIPT = """
+    redis.call('zremrangebyscore', KEYS[1], '-inf', ARGV[1])
+    if redis.call('zcard', KEYS[1]) < tonumber(ARGV[2]) then
+        redis.call('zadd', KEYS[1], ARGV[3], ARGV[4])
+        redis.call('expire', KEYS[1], ARGV[5])
+        return 1
+    end
+    return 0
+    """
+
+    def __init__(self, client, prefix: str):
+        self.client = client
+        self.prefix = prefix
+
+    async def take_token(self, key: str, rate: float, burst: float) -> float:
+        wait = await self.client.eval(
+            self.TOKEN_BUCKET_SCRIPT, 1, f"{self.prefix}:bucket:{key}", rate, burst, time.time()
+        )
+        return float(wait)
+
+    async def acquire_slot(self, route: str, policy: AdmissionPolicy, timeout: float) -> Optional[str]:
+        key = f"{self.prefix}:slots:{route}"
+        lease = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+
+        while True:
+            now = time.time()
+            acquired = await self.client.eval(
+                self.ACQUIRE_SLOT_SCRIPT, 1, key,
+                now, policy.concurrency, now + policy.lease_seconds, lease,
+                int(policy.lease_seconds) + 1
+            )
+            if acquired:
+                return lease
+            if time.monotonic() + delay > deadline:
+                return None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.2)
+
+    async def release_slot(self, route: str, lease: str) -> None:
+        await self.client.zrem(f"{self.prefix}:slots:{route}", lease)
+
+
+class RouteStats:
+    """Queue depth and service time estimate for one route (per worker)"""
+
+    def __init__(self):
+        self.waiting = 0
+        self.service_time = 0.0
+
+    def expected_wait(self, concurrency: int) -> float:
+        return (self.waiting + 1) / max(1, concurrency) * self.service_time
+
+    def record(self, elapsed: float) -> None:
+        # Exponentially weighted moving average
+        self.service_time = elapsed if not self.service_time else 0.8 * self.service_time + 0.2 * elapsed
+
+
+class AdmissionController:
+    """Applies AdmissionPolicy gates to incoming requests"""
+
+    def __init__(self):
+        self.local_backend = LocalAdmissionBackend()
+        self._redis_backend: Optional[RedisAdmissionBackend] = None
+        self.stats: Dict[str, RouteStats] = {}
+
+    def _backend(self):
+        cache_backend = get_cache().backend
+        if isinstance(cache_backend, RedisCacheBackend):
+            if self._redis_backend is None or self._redis_backend.client is not cache_backend.client:
+                self._redis_backend = RedisAdmissionBackend(
+                    cache_backend.client,
+                    f"{settings.CACHE_KEY_PREFIX}:admission"
+                )
+            return self._redis_backend
+        return self.local_backend
+
+    @staticmethod
+    def _reject(detail: str, retry_after: float) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+    async def admit(self, route: str, caller: str) -> Optional[str]:
+        """Run the admission gates; return a slot lease or raise a 429"""
+        policy = get_policy(route)
+        backend = self._backend()
+        stats = self.stats.setdefault(route, RouteStats())
+
+        try:
+            wait = await backend.take_token(f"{route}:{caller}", policy.rate, policy.burst)
+        except Exception as e:
+            logger.warning(f"Admission rate check failed for '{route}', allowing request: {e}")
+            wait = 0.0
+        if wait > 0:
+            raise self._reject("Rate limit exceeded, please slow down", wait)
+
+        expected_wait = stats.expected_wait(policy.concurrency)
+        if expected_wait > policy.latency_target:
+            raise self._reject("Service is busy, please retry shortly", expected_wait)
+
+        stats.waiting += 1
+        try:
+            lease = await backend.acquire_slot(route, policy, policy.max_wait)
+        except Exception as e:
+            logger.warning(f"Admission slot acquisition failed for '{route}', allowing request: {e}")
+            return None
+        finally:
+            stats.waiting -= 1
+
+        if lease is None:
+            raise self._reject("Service is busy, please retry shortly", max(stats.service_time, 1.0))
+
+        return lease
+
+    async def release(self, route: str, lease: Optional[str], elapsed: float) -> None:
+        self.stats.setdefault(route, RouteStats()).record(elapsed)
+        if lease is None:
+            return
+
+        try:
+            await self._backend().release_slot(route, lease)
+        except Exception as e:
+            logger.warning(f"Admission slot release failed for '{route}': {e}")
+
+
+admission_controller = AdmissionController()
+
+
+def admission(route: str):
+    """FastAPI dependency applying admission control for `route`"""
+
+    async def dependency(
+        request: Request,
+        current_user: Optional[dict] = Depends(get_current_user_optional)
+    ):
+        if not settings.ADMISSION_CONTROL_ENABLED:
+            yield
+            return
+
+        if current_user:
+            caller = f"user:{current_user['user_id']}"
+        else:
+            caller = f"ip:{request.client.host if request.client else 'unknown'}"
+
+        lease = await admission_controller.admit(route, caller)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            await admission_controller.release(route, lease, time.monotonic() - start)
+
+    return dependency
@@ -0,0 +1,345 @@
+"""Shared cache tier (Redis or in-memory) with namespaces, TTLs and stampede protection"""
+
+import asyncio
+import hashlib
+import logging
+import pickle
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.memory import register_memory
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Byte-level cache backend interface"""
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        raise NotImplementedError
+
+    async def set_many(self, items: Dict[str, bytes], ttl: int) -> None:
+        raise NotImplementedError
+
+    async def delete_many(self, keys: List[str]) -> None:
+        raise NotImplementedError
+
+    async def delete_prefix(self, prefix: str) -> None:
+        raise NotImplementedError
+
+    async def acquire_lock(self, key: str, token: str, ttl: float) -> bool:
+        raise NotImplementedError
+
+    async def release_lock(self, key: str, token: str) -> None:
+        raise NotImplementedError
+
+    async def ping(self) -> bool:
+        return True
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Process-local LRU backend (single worker deployments and tests)"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        register_memory("cache.memory", self, lambda backend: backend._data)
+
+    def _get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [self._get(key) for key in keys]
+
+    async def set_many(self, items: Dict[str, bytes], ttl: int) -> None:
+        for key, value in items.items():
+            self._set(key, value, ttl)
+
+    async def delete_many(self, keys: List[str]) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._data if key.startswith(prefix)]:
+            del self._data[key]
+
+    async def acquire_lock(self, key: str, token: str, ttl: float) -> bool:
+        if self._get(key) is not None:
+            return False
+        self._set(key, token.encode('utf-8'), ttl)
+        return True
+
+    async def release_lock(self, key: str, token: str) -> None:
+        if self._get(key) == token.encode('utf-8'):
+            self._data.pop(key, None)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis backend shared by all workers"""
+
+    # Delete the lock only if we still own it
+    RELEASE_LOCK_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.get(key)
+            return await pipe.execute()
+
+    async def set_many(self, items: Dict[str, bytes], ttl: int) -> None:
+        if not items:
+            return
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, value, ex=ttl or None)
+            await pipe.execute()
+
+    async def delete_many(self, keys: List[str]) -> None:
+        if keys:
+            await self.client.unlink(*keys)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        batch = []
+        async for key in self.client.scan_iter(match=f"{prefix}*", count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                await self.client.unlink(*batch)
+                batch = []
+        if batch:
+            await self.client.unlink(*batch)
+
+    async def acquire_lock(self, key: str, token: str, ttl: float) -> bool:
+        return bool(await self.client.set(key, token, nx=True, px=int(ttl * 1000)))
+
+    async def release_lock(self, key: str, token: str) -> None:
+        await self.client.eval(self.RELEASE_LOCK_SCRIPT, 1, key, token)
+
+    async def ping(self) -> bool:
+        return bool(await self.client.ping())
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class Cache:
+    """
+    Namespaced object cache on top of a CacheBackend
+
+    Values are pickled, so any article dict (datetimes, ObjectIds) can be
+    stored as-is. Backend failures are logged and treated as misses; the
+    cache must never take a request down.
+    """
+
+    def __init__(self, backend: CacheBackend, prefix: str = "genwiki"):
+        self.backend = backend
+        self.prefix = prefix
+        self._inflight: Dict[str, asyncio.Future] = {}
+        register_memory("cache.inflight", self, lambda cache: cache._inflight)
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    @staticmethod
+    def hash_key(*parts: Any) -> str:
+        """Build a compact key from arbitrary (possibly large) parts"""
+        digest = hashlib.sha1()
+        for part in parts:
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        return (await self.get_many(namespace, [key]))[0]
+
+    async def get_many(self, namespace: str, keys: List[str]) -> List[Optional[Any]]:
+        """Fetch several keys in a single round trip"""
+        try:
+            raw_values = await self.backend.get_many([self._key(namespace, key) for key in keys])
+        except Exception as e:
+            logger.warning(f"Cache get failed for namespace '{namespace}': {e}")
+            return [None] * len(keys)
+
+        return [pickle.loads(raw) if raw is not None else None for raw in raw_values]
+
+    async def set(self, namespace: str, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        await self.set_many(namespace, {key: value}, ttl)
+
+    async def set_many(self, namespace: str, items: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        try:
+            await self.backend.set_many(
+                {
+                    self._key(namespace, key): pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                    for key, value in items.items()
+                },
+                ttl if ttl is not None else settings.CACHE_DEFAULT_TTL
+            )
+        except Exception as e:
+            logger.warning(f"Cache set failed for namespace '{namespace}': {e}")
+
+    async def delete(self, namespace: str, *keys: str) -> None:
+        try:
+            await self.backend.delete_many([self._key(namespace, key) for key in keys])
+        except Exception as e:
+            logger.warning(f"Cache delete failed for namespace '{namespace}': {e}")
+
+    async def invalidate_namespace(self, namespace: str) -> None:
+        """Drop every key in a namespace"""
+        try:
+            await self.backend.delete_prefix(self._key(namespace, ""))
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed for namespace '{namespace}': {e}")
+
+    async def get_or_set(
+        self,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Return the cached value or compute it with `loader`
+
+        Concurrent misses for the same key are collapsed: within a process
+        callers share one in-flight load, and across processes a short
+        backend lock lets a single worker recompute while the others wait
+        for the value to appear. `None` results are not cached. If the caller
+        doing the load is cancelled, a waiter takes the load over instead of
+        inheriting the cancellation.
+        """
+        value = await self.get(namespace, key)
+        if value is not None:
+            return value
+
+        full_key = self._key(namespace, key)
+        while (inflight := self._inflight.get(full_key)) is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = future
+        try:
+            value = await self._load_with_lock(namespace, key, loader, ttl)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            # Only this caller was cancelled; waiters retry the load
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unobserved failure does not log a warning
+            future.exception()
+            raise
+        finally:
+            del self._inflight[full_key]
+
+    async def _load_with_lock(
+        self,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int]
+    ) -> Any:
+        lock_key = self._key("lock", f"{namespace}:{key}")
+        token = uuid.uuid4().hex
+        lock_timeout = settings.CACHE_LOCK_TIMEOUT_SECONDS
+
+        try:
+            acquired = await self.backend.acquire_lock(lock_key, token, lock_timeout)
+        except Exception as e:
+            logger.warning(f"Cache lock failed for '{lock_key}': {e}")
+            acquired = True
+            token = None
+
+        if not acquired:
+            # Another worker is loading; wait for its result
+            deadline = time.monotonic() + lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                value = await self.get(namespace, key)
+                if value is not None:
+                    return value
+
+        try:
+            value = await loader()
+            if value is not None:
+                await self.set(namespace, key, value, ttl)
+            return value
+        finally:
+            if acquired and token:
+                try:
+                    await self.backend.release_lock(lock_key, token)
+                except Exception as e:
+                    logger.warning(f"Cache lock release failed for '{lock_key}': {e}")
+
+
+cache = Cache(
+    MemoryCacheBackend(settings.CACHE_MEMORY_MAX_ENTRIES),
+    prefix=settings.CACHE_KEY_PREFIX
+)
+
+
+async def connect_to_cache():
+    """Connect the shared cache to Redis when configured"""
+    if settings.CACHE_BACKEND != "redis":
+        logger.info("Using in-memory cache backend")
+        return
+
+    try:
+        backend = RedisCacheBackend(settings.REDIS_URL)
+        await backend.ping()
+        cache.backend = backend
+        logger.info("✅ Connected to Redis cache")
+    except Exception as e:
+        logger.warning(f"⚠️ Redis unavailable, falling back to in-memory cache: {str(e)}")
+
+
+async def close_cache_connection():
+    """Close the cache backend"""
+    await cache.backend.close()
+
+
+def get_cache() -> Cache:
+    """Get cache instance"""
+    return cache
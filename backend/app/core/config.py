@@ -1,7 +1,7 @@
 """Core Configuration for Gen Z Wikipedia Backend"""
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Any, Dict, List
 
 
 class Settings(BaseSettings):
@@ -16,27 +16,172 @@ class Settings(BaseSettings):
     # Database
     MONGODB_URI: str
     DATABASE_NAME: str = "genz_wikipedia"
+    # Create indexes in a background task at startup (False: run
+    # scripts/create_indexes.py as a deploy step instead)
+    CREATE_INDEXES_ON_STARTUP: bool = True
     
     # AI API Keys
     OPENAI_API_KEY: str = ""
     GEMINI_API_KEY: str = ""
     
+    # LLM provider: "gemini", or "fake" for offline load tests (shaped by FAKE_LLM)
+    LLM_PROVIDER: str = "gemini"
+    LLM_MODEL: str = "gemini-3-flash-preview"
+    FAKE_LLM: Dict[str, Any] = {
+        "seed": 0, "latency": "lognormal", "latency_ms": 600.0, "latency_spread": 0.5,
+        "tokens_per_second": 80.0, "output_tokens": 150, "error_rate": 0.0, "timeout_rate": 0.0,
+    }
+    
     # Authentication
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = 10  # concurrent refreshes of one token get the same successor
+    JWT_CACHE_SIZE: int = 4096
+    JWT_CACHE_TTL_SECONDS: int = 60
+    JWT_REVOCATION_ENABLED: bool = True
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
     
     # Redis (optional)
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Cache ("memory" or "redis"; TTLs in seconds)
+    CACHE_BACKEND: str = "memory"
+    CACHE_KEY_PREFIX: str = "genwiki"
+    CACHE_MEMORY_MAX_ENTRIES: int = 10000
+    CACHE_LOCK_TIMEOUT_SECONDS: float = 10.0
+    CACHE_DEFAULT_TTL: int = 300
+    CACHE_ARTICLE_TTL: int = 60
+    CACHE_TRENDING_TTL: int = 60
+    CACHE_AI_TTL: int = 86400
+    CACHE_WIKIPEDIA_TTL: int = 3600
+    
     # CORS
     ALLOWED_ORIGINS: List[str] = [
         "http://localhost:3000",
         "http://localhost:3001"
     ]
     
+    # AI admission control, per route with "default" as the base
+    # (rate: req/s per caller, burst, concurrency: global in-flight,
+    #  max_wait / latency_target: seconds)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    AI_ADMISSION_LIMITS: Dict[str, Dict[str, float]] = {
+        "default": {"rate": 1.0, "burst": 10, "concurrency": 16, "max_wait": 5.0, "latency_target": 2.0},
+        "chat": {"rate": 0.5, "burst": 5, "concurrency": 16},
+        "personalize": {"rate": 0.1, "burst": 3, "concurrency": 4, "latency_target": 5.0},
+        "summarize": {"rate": 0.5, "burst": 5, "concurrency": 8},
+        # Mostly stored reads; only misses reach the model
+        "article-artifacts": {"rate": 5.0, "burst": 30, "concurrency": 64},
+    }
+    
+    # AI conversations (messages stored in fixed-size buckets; retention
+    # counts from last activity)
+    CONVERSATION_BUCKET_SIZE: int = 50
+    CONVERSATION_RETENTION_DAYS: int = 90
+    
+    # AI prompt sizing (estimated tokens): article retrieval and chat prompts
+    ARTICLE_CHUNK_TOKENS: int = 200
+    ARTICLE_CONTEXT_TOKEN_BUDGET: int = 1200
+    ARTICLE_CONTEXT_TOP_K: int = 6
+    CHAT_PROMPT_TOKEN_BUDGET: int = 3000
+    CHAT_HISTORY_TOKEN_BUDGET: int = 1200
+    CHAT_SUMMARY_TOKENS: int = 250
+    
+    # Precomputed AI artifacts (summaries, follow-up questions, key facts)
+    AI_ARTIFACTS_ON_INGEST: bool = True
+    AI_ARTIFACT_CONCURRENCY: int = 4  # concurrent LLM calls for background generation
+    
+    # Seconds to wait for an LLM summary before answering with the local extractive one
+    SUMMARY_LATENCY_BUDGET_SECONDS: float = 8.0
+    
+    # Outbound dependency resilience, per dependency with "default" as the base
+    # (timeout: deadline for all attempts, delays / hedge_after / recovery_timeout:
+    #  seconds, hedge_after 0 disables hedging)
+    RESILIENCE_POLICIES: Dict[str, Dict[str, float]] = {
+        "default": {"timeout": 10.0, "attempts": 3, "base_delay": 0.2, "max_delay": 2.0,
+                    "hedge_after": 0.0, "failure_threshold": 5, "recovery_timeout": 30.0},
+        "llm": {"timeout": 45.0, "attempts": 2, "base_delay": 0.5},
+        "wikipedia": {"timeout": 8.0, "attempts": 3, "hedge_after": 1.5},
+    }
+    
     # Wikipedia API
     WIKIPEDIA_API_URL: str = "https://en.wikipedia.org/w/api.php"
+    WIKIPEDIA_TIMEOUT_SECONDS: float = 10.0
+    WIKIPEDIA_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    WIKIPEDIA_MAX_CONNECTIONS: int = 20
+    
+    # HTTP caching (Cache-Control lifetimes in seconds)
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_ARTICLE_MAX_AGE: int = 60
+    HTTP_CACHE_LIST_MAX_AGE: int = 30
+    HTTP_CACHE_STALE_WHILE_REVALIDATE: int = 300
+    
+    # Response compression
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    
+    # Prometheus metrics (GET /metrics)
+    METRICS_ENABLED: bool = True
+    
+    # Per-request MongoDB query budget and slow command log (milliseconds)
+    QUERY_TRACKING_ENABLED: bool = True
+    QUERY_BUDGET_MAX_COMMANDS: int = 10
+    QUERY_BUDGET_MAX_DB_MS: float = 200.0
+    SLOW_QUERY_MS: float = 100.0
+    
+    # Request tracing: spans and Server-Timing headers
+    # (TRACE_EXPORTER: "none", "jsonl" or "otlp"; OTLP over HTTP/JSON)
+    TRACING_ENABLED: bool = True
+    SERVER_TIMING_ENABLED: bool = True
+    TRACE_EXPORTER: str = "none"
+    TRACE_SAMPLE_RATE: float = 1.0
+    TRACE_JSONL_PATH: str = "traces.jsonl"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACE_SERVICE_NAME: str = "genwiki-backend"
+    TRACE_EXPORT_INTERVAL_SECONDS: float = 2.0
+    TRACE_MAX_QUEUE: int = 10000
+    
+    # Event-loop lag watchdog (seconds; stack file: rotating log of blocking
+    # call stacks, empty to only log them)
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.1
+    LOOP_LAG_THRESHOLD_SECONDS: float = 0.1
+    LOOP_LAG_STACK_FILE: str = ""
+    LOOP_LAG_STACK_FILE_MAX_BYTES: int = 5_000_000
+    
+    # On-demand request profiling: signed X-Profile header (PROFILING_SECRET)
+    # or a sampled fraction of requests; profiles kept in a bounded directory
+    PROFILING_SECRET: str = ""
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_FILES: int = 200
+    PROFILING_MAX_BYTES: int = 200_000_000
+    PROFILING_INTERVAL_SECONDS: float = 0.001
+    
+    # Memory accounting: RSS sampling interval (0 disables) and history kept,
+    # tracemalloc traceback depth and stored snapshots
+    MEMORY_SAMPLE_INTERVAL_SECONDS: float = 15.0
+    MEMORY_HISTORY_SIZE: int = 240
+    TRACEMALLOC_ON_STARTUP: bool = False
+    TRACEMALLOC_FRAMES: int = 10
+    MEMORY_MAX_SNAPSHOTS: int = 5
+    
+    # Startup warm-up, finished before /health/ready reports ready: MongoDB
+    # connections opened, caches primed for the largest categories and most
+    # viewed articles, LLM and Wikipedia connections opened
+    WARMUP_ENABLED: bool = True
+    WARMUP_TIMEOUT_SECONDS: float = 20.0
+    WARMUP_POOL_CONNECTIONS: int = 5
+    WARMUP_CATEGORIES: int = 8
+    WARMUP_TOP_ARTICLES: int = 20
+    WARMUP_PING_EXTERNAL: bool = True
+    
+    # Admin endpoints (/api/v1/admin, X-Admin-Token header; empty disables them)
+    ADMIN_API_KEY: str = ""
     
     class Config:
         env_file = ".env"
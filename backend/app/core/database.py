@@ -2,9 +2,14 @@
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from pymongo.errors import ConnectionFailure
+import asyncio
 import logging
+import time
 
 from app.core.config import settings
+from app.core.metrics import mongo_event_listeners
+from app.core.query_tracking import query_event_listeners
+from app.core.tracing import tracing_event_listeners
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +33,8 @@ async def connect_to_mongo():
             settings.MONGODB_URI,
             maxPoolSize=10,
             minPoolSize=1,
-            serverSelectionTimeoutMS=5000
+            serverSelectionTimeoutMS=5000,
+            event_listeners=mongo_event_listeners() + query_event_listeners() + tracing_event_listeners()
         )
         
         # Test connection
@@ -38,9 +44,6 @@ async def connect_to_mongo():
         
         logger.info(f"✅ Connected to database: {settings.DATABASE_NAME}")
         
-        # Create indexes
-        await create_indexes()
-        
     except ConnectionFailure as e:
         logger.error(f"❌ Failed to connect to MongoDB: {str(e)}")
         raise
@@ -56,30 +59,75 @@ async def close_mongo_connection():
         logger.info("MongoDB connection closed")
 
 
-async def create_indexes():
-    """Create database indexes for performance"""
-    try:
-        # Articles collection indexes
-        await db.db.articles.create_index("slug", unique=True)
-        await db.db.articles.create_index("category")
-        await db.db.articles.create_index("tags")
-        await db.db.articles.create_index([("title", "text"), ("content", "text")])
-        
-        # Users collection indexes
-        await db.db.users.create_index("email", unique=True)
-        await db.db.users.create_index("interests")
-        
-        # Conversations collection indexes
-        await db.db.conversations.create_index("userId")
-        await db.db.conversations.create_index("createdAt")
-        
-        # Saved topics collection indexes
-        await db.db.saved_topics.create_index([("userId", 1), ("articleId", 1)], unique=True)
-        
-        logger.info("✅ Database indexes created successfully")
-        
-    except Exception as e:
-        logger.warning(f"⚠️ Error creating indexes: {str(e)}")
+# (collection, keys, options) of every index the application relies on
+INDEXES = [
+    # Articles
+    ("articles", "slug", {"unique": True}),
+    ("articles", "category", {}),
+    ("articles", "tags", {}),
+    ("articles", [("title", "text"), ("content", "text")], {}),
+    
+    # Users
+    ("users", "email", {"unique": True}),
+    ("users", "interests", {}),
+    
+    # Conversations (TTL purges inactive conversations)
+    ("conversations", [("userId", 1), ("updatedAt", -1), ("_id", -1)], {}),
+    ("conversations", "createdAt", {}),
+    ("conversations", "expiresAt", {"expireAfterSeconds": 0}),
+    
+    # Conversation message buckets (at most one bucket per start seq)
+    ("conversation_messages", [("conversationId", 1), ("firstSeq", 1)], {"unique": True}),
+    ("conversation_messages", "expiresAt", {"expireAfterSeconds": 0}),
+    
+    # Article chunk indexes (one document per article revision)
+    ("article_chunks", [("articleId", 1), ("revision", 1)], {"unique": True}),
+    
+    # Precomputed AI artifacts (one document per article content revision)
+    ("article_artifacts", [("articleId", 1), ("contentHash", 1)], {"unique": True}),
+    
+    # Saved topics
+    ("saved_topics", [("userId", 1), ("articleId", 1)], {"unique": True}),
+    
+    # Sessions (refresh tokens; TTL purges expired sessions)
+    ("sessions", "tokenHash", {"unique": True}),
+    ("sessions", "familyId", {}),
+    ("sessions", "expiresAt", {"expireAfterSeconds": 0}),
+]
+
+
+async def create_indexes() -> int:
+    """
+    Create database indexes for performance
+    
+    All createIndexes commands are issued concurrently; one failing index
+    is logged without stopping the others. Existing indexes are no-ops.
+    Returns the number of indexes that failed.
+    """
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(db.db[collection].create_index(keys, **options) for collection, keys, options in INDEXES),
+        return_exceptions=True
+    )
+    
+    failed = 0
+    for (collection, keys, _), result in zip(INDEXES, results):
+        if isinstance(result, Exception):
+            failed += 1
+            logger.warning(f"⚠️ Error creating index {collection} {keys}: {str(result)}")
+    
+    if not failed:
+        logger.info(f"✅ Database indexes created successfully in {time.perf_counter() - started:.2f}s")
+    
+    return failed
+
+
+def schedule_index_creation():
+    """Create indexes in the background so startup does not wait for them (CREATE_INDEXES_ON_STARTUP)"""
+    from app.core.tasks import spawn
+    
+    if settings.CREATE_INDEXES_ON_STARTUP:
+        spawn(create_indexes(), name="create-indexes")
 
 
 def get_database() -> AsyncIOMotorDatabase:
@@ -0,0 +1,214 @@
+"""HTTP conditional caching (ETag / Last-Modified, If-None-Match / If-Modified-Since and Cache-Control)"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+
+# Route path templates -> (max-age, stale-while-revalidate)
+CACHE_POLICIES: Dict[str, Tuple[int, int]] = {
+    "/api/v1/articles/{article_id}": (
+        settings.HTTP_CACHE_ARTICLE_MAX_AGE,
+        settings.HTTP_CACHE_STALE_WHILE_REVALIDATE
+    ),
+    "/api/v1/articles/slug/{slug}": (
+        settings.HTTP_CACHE_ARTICLE_MAX_AGE,
+        settings.HTTP_CACHE_STALE_WHILE_REVALIDATE
+    ),
+    "/api/v1/articles/trending": (
+        settings.HTTP_CACHE_LIST_MAX_AGE,
+        settings.HTTP_CACHE_STALE_WHILE_REVALIDATE
+    ),
+    "/api/v1/articles/category/{category}": (
+        settings.HTTP_CACHE_LIST_MAX_AGE,
+        settings.HTTP_CACHE_STALE_WHILE_REVALIDATE
+    ),
+}
+
+# Headers that are still meaningful on a 304 response
+NOT_MODIFIED_HEADERS = {b"etag", b"cache-control", b"vary", b"date", b"expires", b"last-modified"}
+
+
+def article_etag(article: dict) -> str:
+    """
+    Derive a strong ETag from an article's updatedAt and a hash of its content
+
+    View and like counters are deliberately left out so that they do not
+    invalidate client and CDN caches on every read.
+    """
+    updated_at = article.get('updatedAt')
+    if isinstance(updated_at, datetime):
+        updated_at = updated_at.isoformat()
+
+    content_hash = hashlib.sha1((article.get('content') or '').encode('utf-8')).hexdigest()
+
+    digest = hashlib.sha1()
+    digest.update(str(article.get('id', '')).encode('utf-8'))
+    digest.update(str(updated_at).encode('utf-8'))
+    digest.update(content_hash.encode('utf-8'))
+
+    return f'"{digest.hexdigest()}"'
+
+
+def article_last_modified(article: dict) -> Optional[str]:
+    """Last-Modified value (HTTP date) from an article's updatedAt, if known"""
+    updated_at = article.get('updatedAt') or article.get('publishedAt')
+    if not isinstance(updated_at, datetime):
+        return None
+    if updated_at.tzinfo is None:
+        # Stored as naive UTC
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return format_datetime(updated_at.astimezone(timezone.utc), usegmt=True)
+
+
+def article_validators(article: dict) -> Dict[str, str]:
+    """
+    ETag and Last-Modified headers for a single article
+
+    Lists only get an ETag: their membership and order change (views,
+    deletions) without any article's updatedAt changing.
+    """
+    headers = {"ETag": article_etag(article)}
+    last_modified = article_last_modified(article)
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return headers
+
+
+def collection_etag(articles: Iterable[dict]) -> str:
+    """Derive a strong ETag for an ordered list of articles"""
+    digest = hashlib.sha1()
+    for article in articles:
+        digest.update(article_etag(article).encode('utf-8'))
+
+    return f'"{digest.hexdigest()}"'
+
+
+# Suffixes CompressionMiddleware appends to strong ETags of encoded bodies
+ENCODING_SUFFIXES = ("-gzip", "-br")
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    ETag for a body sent with a content-coding
+
+    Strong validators must differ per content-coding (RFC 9110 8.8.3), so
+    `"abc"` becomes `"abc-gzip"`; weak ETags are left as they are.
+    """
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """
+    Check an ETag against an If-None-Match header (weak comparison, RFC 9110)
+
+    Encoding suffixes are ignored, so a tag received with a gzip body also
+    revalidates the identity or brotli form of the same representation.
+    """
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        for suffix in ENCODING_SUFFIXES:
+            if tag.endswith(f'{suffix}"'):
+                return f'{tag[:-len(suffix) - 1]}"'
+        return tag
+
+    return opaque(etag) in {opaque(tag) for tag in if_none_match.split(",")}
+
+
+def not_modified_since(last_modified: str, if_modified_since: str) -> bool:
+    """Check Last-Modified against If-Modified-Since (unparseable dates never match)"""
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def cache_control_header(max_age: int, stale_while_revalidate: int) -> str:
+    """Build a public Cache-Control value"""
+    return f"public, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}"
+
+
+class HTTPCacheMiddleware:
+    """
+    Conditional GET middleware
+
+    Adds per-route Cache-Control to successful GET responses and turns a
+    response whose ETag matches the request's If-None-Match (or, without
+    If-None-Match, whose Last-Modified is not after If-Modified-Since) into
+    an empty 304. Route handlers always run, so side effects such as view
+    counting keep working for revalidated requests.
+    """
+
+    def __init__(self, app: ASGIApp, policies: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.app = app
+        self.policies = CACHE_POLICIES if policies is None else policies
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not settings.HTTP_CACHE_ENABLED
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        if_modified_since = request_headers.get("if-modified-since")
+        not_modified = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal not_modified
+
+            if message["type"] == "http.response.start":
+                if message["status"] == 200:
+                    headers = MutableHeaders(scope=message)
+
+                    route = scope.get("route")
+                    policy = self.policies.get(getattr(route, "path_format", None))
+                    if policy and "cache-control" not in headers:
+                        headers["Cache-Control"] = cache_control_header(*policy)
+
+                    # If-Modified-Since is only evaluated without If-None-Match (RFC 9110 13.2.2)
+                    etag = headers.get("etag")
+                    last_modified = headers.get("last-modified")
+                    if if_none_match:
+                        matched = bool(etag) and etag_matches(etag, if_none_match)
+                    else:
+                        matched = bool(last_modified and if_modified_since) and not_modified_since(
+                            last_modified, if_modified_since
+                        )
+
+                    if matched:
+                        not_modified = True
+                        message = {
+                            "type": "http.response.start",
+                            "status": 304,
+                            "headers": [
+                                (key, value) for key, value in headers.raw
+                                if key in NOT_MODIFIED_HEADERS or key.startswith(b"access-control-")
+                            ]
+                        }
+
+            elif message["type"] == "http.response.body" and not_modified:
+                # Drop the body; only the final chunk is forwarded (empty)
+                if message.get("more_body", False):
+                    return
+                message = {"type": "http.response.body", "body": b"", "more_body": False}
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,183 @@
+"""
+Event-loop lag watchdog
+
+A heartbeat task sleeps LOOP_MONITOR_INTERVAL_SECONDS at a time and
+measures how late it wakes up (event_loop_lag_seconds). A watchdog thread
+checks the heartbeat; while the loop is stalled it snapshots the loop
+thread's stack, which is where the blocking call is. When the loop comes
+back more than LOOP_LAG_THRESHOLD_SECONDS late, the block is counted
+(event_loop_blocks_total, per code site), logged with that stack and, with
+LOOP_LAG_STACK_FILE set, appended to a rotating file.
+
+A C call that holds the GIL for the whole block (e.g. a huge str.split)
+keeps the watchdog from running too; such blocks are reported without a
+stack.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "How late the event-loop heartbeat woke up",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+LOOP_BLOCKS = Counter(
+    "event_loop_blocks_total", "Heartbeats later than LOOP_LAG_THRESHOLD_SECONDS, by blocking code site", ["site"]
+)
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def blocking_site(stack: Optional[List[traceback.FrameSummary]]) -> str:
+    """Innermost application frame of a stack ("module.py:function"), else the innermost frame"""
+    if not stack:
+        return "unknown"
+    for frame in reversed(stack):
+        if frame.filename.startswith(APP_ROOT):
+            return f"{os.path.relpath(frame.filename, os.path.dirname(APP_ROOT))}:{frame.name}"
+    return f"{os.path.basename(stack[-1].filename)}:{stack[-1].name}"
+
+
+class LoopMonitor:
+    """Heartbeat task plus stack-sampling watchdog thread"""
+
+    def __init__(self, interval: float, threshold: float, stack_file: str = ""):
+        self.interval = interval
+        self.threshold = threshold
+        self.blocks = 0
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+
+        self._last_beat = time.monotonic()
+        # Beat during which the watchdog captured a stack, and the stack
+        self._captured: Tuple[float, Optional[List[traceback.FrameSummary]]] = (0.0, None)
+        self._loop_thread: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stack_log = self._stack_logger(stack_file) if stack_file else None
+
+    @staticmethod
+    def _stack_logger(path: str) -> logging.Logger:
+        stack_log = logging.getLogger(f"{__name__}.stacks")
+        stack_log.propagate = False
+        stack_log.setLevel(logging.INFO)
+        if not stack_log.handlers:
+            handler = RotatingFileHandler(
+                path, maxBytes=settings.LOOP_LAG_STACK_FILE_MAX_BYTES, backupCount=3, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            stack_log.addHandler(handler)
+        return stack_log
+
+    # ---- watchdog thread ----
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval / 2):
+            beat = self._last_beat
+            if time.monotonic() - beat > self.interval + self.threshold and self._captured[0] != beat:
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is not None:
+                    self._captured = (beat, traceback.extract_stack(frame))
+
+    # ---- heartbeat ----
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - scheduled - self.interval)
+
+            previous_beat = self._last_beat
+            self._last_beat = time.monotonic()
+
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG.observe(lag)
+
+            if lag > self.threshold:
+                beat, stack = self._captured
+                self._report(lag, stack if beat == previous_beat else None)
+
+    def _report(self, lag: float, stack: Optional[List[traceback.FrameSummary]]) -> None:
+        self.blocks += 1
+        site = blocking_site(stack)
+        LOOP_BLOCKS.labels(site).inc()
+
+        trace = "".join(traceback.format_list(stack)) if stack else "  (stack not captured: the call held the GIL)\n"
+        message = f"Event loop blocked for {lag * 1000:.0f}ms at {site}\n{trace}"
+        logger.warning(message.rstrip())
+        if self._stack_log is not None:
+            self._stack_log.info(message)
+
+    # ---- lifecycle ----
+
+    def start(self) -> None:
+        from app.core.tasks import spawn
+
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._task = spawn(self._heartbeat(), name="loop-monitor")
+        self._thread = threading.Thread(target=self._watch, name="loop-monitor-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Lag summary for /health"""
+        return {
+            "lag_ms": round(self.last_lag * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "blocks": self.blocks,
+        }
+
+
+_monitor: Optional[LoopMonitor] = None
+
+
+def start_loop_monitor() -> None:
+    """Start the monitor on the running loop (application startup)"""
+    global _monitor
+    if not settings.LOOP_MONITOR_ENABLED or _monitor is not None:
+        return
+    _monitor = LoopMonitor(
+        settings.LOOP_MONITOR_INTERVAL_SECONDS,
+        settings.LOOP_LAG_THRESHOLD_SECONDS,
+        settings.LOOP_LAG_STACK_FILE
+    )
+    _monitor.start()
+    logger.info(f"Event loop monitor started (threshold {settings.LOOP_LAG_THRESHOLD_SECONDS * 1000:.0f}ms)")
+
+
+async def stop_loop_monitor() -> None:
+    """Stop the monitor (application shutdown)"""
+    global _monitor
+    if _monitor is not None:
+        await _monitor.stop()
+        _monitor = None
+
+
+def loop_monitor_state() -> Optional[Dict[str, Any]]:
+    return _monitor.snapshot() if _monitor is not None else None
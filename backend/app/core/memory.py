@@ -0,0 +1,273 @@
+"""
+Memory accounting
+
+- In-process caches, indexes and other growing structures register with
+  `register_memory(name, owner, contents)`; `component_sizes()` reports
+  their entry counts and approximate byte sizes (memory_component_bytes).
+  Owners are held weakly, so replaced components drop out on their own.
+- A background sampler records the worker's RSS every
+  MEMORY_SAMPLE_INTERVAL_SECONDS (memory_rss_bytes, kept per worker in
+  multi-process mode) and keeps a short history for the admin endpoint.
+- tracemalloc can be started at runtime; snapshots are kept (up to
+  MEMORY_MAX_SNAPSHOTS) so any two can be diffed to find growing
+  allocation sites.
+
+Exposed through /api/v1/admin/memory.
+"""
+
+import asyncio
+import gc
+import itertools
+import logging
+import os
+import resource
+import sys
+import time
+import tracemalloc
+import weakref
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from prometheus_client import Gauge
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MEMORY_RSS = Gauge(
+    "memory_rss_bytes", "Resident set size of this worker", multiprocess_mode="all"
+)
+MEMORY_COMPONENT = Gauge(
+    "memory_component_bytes", "Approximate size of a registered in-process component",
+    ["component"], multiprocess_mode="all"
+)
+
+# Items inspected per container when estimating its size
+SIZE_SAMPLE = 100
+SIZE_MAX_DEPTH = 6
+
+_SCALARS = (str, bytes, bytearray, int, float, bool, complex, type(None))
+
+
+# ============ Size estimation ============
+
+def approximate_size(obj: Any, sample: int = SIZE_SAMPLE, _depth: int = 0) -> int:
+    """
+    Approximate deep size of `obj` in bytes
+
+    Large containers are sized from their first `sample` items and
+    extrapolated, so the cost stays bounded for caches of any size.
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, _SCALARS) or _depth >= SIZE_MAX_DEPTH:
+        return size
+
+    if isinstance(obj, dict):
+        count = len(obj)
+        items = list(itertools.islice(obj.items(), sample))
+        if not items:
+            return size
+        measured = sum(
+            approximate_size(key, sample, _depth + 1) + approximate_size(value, sample, _depth + 1)
+            for key, value in items
+        )
+        return size + int(measured * count / len(items))
+
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        count = len(obj)
+        items = list(itertools.islice(obj, sample))
+        if not items:
+            return size
+        measured = sum(approximate_size(item, sample, _depth + 1) for item in items)
+        return size + int(measured * count / len(items))
+
+    if hasattr(obj, "__dict__"):
+        return size + approximate_size(vars(obj), sample, _depth + 1)
+
+    return size
+
+
+# ============ Component registry ============
+
+_components: Dict[str, Tuple[weakref.ref, Callable[[Any], Any]]] = {}
+
+
+def register_memory(name: str, owner: Any, contents: Callable[[Any], Any] = lambda owner: owner) -> None:
+    """
+    Register a component for memory accounting
+
+    `contents(owner)` returns the container(s) to size; registering a name
+    again replaces the previous owner.
+    """
+    _components[name] = (weakref.ref(owner), contents)
+
+
+def component_sizes() -> List[Dict[str, Any]]:
+    """Entries and approximate bytes of every live registered component, largest first"""
+    sizes = []
+    for name, (owner_ref, contents) in list(_components.items()):
+        owner = owner_ref()
+        if owner is None:
+            _components.pop(name, None)
+            continue
+        try:
+            container = contents(owner)
+            size = approximate_size(container)
+            entries = len(container) if hasattr(container, "__len__") else None
+        except Exception as e:
+            logger.warning(f"Could not size memory component {name}: {e!r}")
+            continue
+
+        MEMORY_COMPONENT.labels(name).set(size)
+        sizes.append({"name": name, "type": type(owner).__name__, "entries": entries, "bytes": size})
+
+    sizes.sort(key=lambda component: component["bytes"], reverse=True)
+    return sizes
+
+
+# ============ RSS ============
+
+def current_rss() -> int:
+    """Resident set size in bytes (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+_rss_history: Deque[Tuple[float, int]] = deque(maxlen=max(1, settings.MEMORY_HISTORY_SIZE))
+
+
+def rss_history() -> List[Dict[str, Any]]:
+    return [{"at": datetime.utcfromtimestamp(at), "rss": rss} for at, rss in _rss_history]
+
+
+async def _sample_memory() -> None:
+    while True:
+        rss = current_rss()
+        MEMORY_RSS.set(rss)
+        _rss_history.append((time.time(), rss))
+        await asyncio.sleep(settings.MEMORY_SAMPLE_INTERVAL_SECONDS)
+
+
+def start_memory_sampler() -> None:
+    """Start sampling RSS (application startup)"""
+    from app.core.tasks import spawn
+
+    if settings.TRACEMALLOC_ON_STARTUP:
+        start_tracemalloc()
+    if settings.MEMORY_SAMPLE_INTERVAL_SECONDS > 0:
+        spawn(_sample_memory(), name="memory-sampler")
+
+
+# ============ tracemalloc ============
+
+_snapshots: "OrderedDict[int, Tuple[datetime, tracemalloc.Snapshot]]" = OrderedDict()
+_snapshot_ids = itertools.count(1)
+
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def start_tracemalloc(frames: Optional[int] = None) -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames or settings.TRACEMALLOC_FRAMES)
+        logger.info("tracemalloc started")
+
+
+def stop_tracemalloc() -> None:
+    """Stop tracing (frees its overhead) and drop stored snapshots"""
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+        logger.info("tracemalloc stopped")
+    _snapshots.clear()
+
+
+def tracemalloc_state() -> Dict[str, Any]:
+    traced, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+    return {
+        "tracing": tracemalloc.is_tracing(),
+        "frames": tracemalloc.get_traceback_limit() if tracemalloc.is_tracing() else 0,
+        "traced": traced,
+        "peak": peak,
+        "snapshots": [{"id": snapshot_id, "takenAt": taken_at} for snapshot_id, (taken_at, _) in _snapshots.items()],
+    }
+
+
+def _format_stat(stat) -> Dict[str, Any]:
+    frame = stat.traceback[0]
+    entry = {
+        "location": f"{frame.filename}:{frame.lineno}",
+        "size": stat.size,
+        "count": stat.count,
+    }
+    if hasattr(stat, "size_diff"):
+        entry["sizeDiff"] = stat.size_diff
+        entry["countDiff"] = stat.count_diff
+    return entry
+
+
+def take_snapshot(top: int = 20) -> Dict[str, Any]:
+    """Store a snapshot (oldest dropped beyond MEMORY_MAX_SNAPSHOTS) and return its top allocation sites"""
+    if not tracemalloc.is_tracing():
+        raise ValueError("tracemalloc is not running")
+
+    snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+    snapshot_id = next(_snapshot_ids)
+    _snapshots[snapshot_id] = (datetime.utcnow(), snapshot)
+    while len(_snapshots) > settings.MEMORY_MAX_SNAPSHOTS:
+        _snapshots.popitem(last=False)
+
+    return snapshot_top(snapshot_id, top)
+
+
+def _get_snapshot(snapshot_id: int) -> Tuple[datetime, tracemalloc.Snapshot]:
+    if snapshot_id not in _snapshots:
+        raise KeyError(f"Snapshot {snapshot_id} not found")
+    return _snapshots[snapshot_id]
+
+
+def snapshot_top(snapshot_id: int, top: int = 20, key_type: str = "lineno") -> Dict[str, Any]:
+    """Largest allocation sites of a stored snapshot"""
+    taken_at, snapshot = _get_snapshot(snapshot_id)
+    stats = snapshot.statistics(key_type)
+    return {
+        "id": snapshot_id,
+        "takenAt": taken_at,
+        "total": sum(stat.size for stat in stats),
+        "top": [_format_stat(stat) for stat in stats[:top]],
+    }
+
+
+def snapshot_diff(old_id: int, new_id: int, top: int = 20, key_type: str = "lineno") -> Dict[str, Any]:
+    """Allocation sites that grew most between two stored snapshots"""
+    old_taken_at, old = _get_snapshot(old_id)
+    new_taken_at, new = _get_snapshot(new_id)
+    stats = new.compare_to(old, key_type)
+    return {
+        "from": {"id": old_id, "takenAt": old_taken_at},
+        "to": {"id": new_id, "takenAt": new_taken_at},
+        "totalDiff": sum(stat.size_diff for stat in stats),
+        "top": [_format_stat(stat) for stat in stats[:top]],
+    }
+
+
+def memory_report() -> Dict[str, Any]:
+    """Everything the admin memory endpoint shows"""
+    rss = current_rss()
+    MEMORY_RSS.set(rss)
+    return {
+        "pid": os.getpid(),
+        "rss": rss,
+        "rssHistory": rss_history(),
+        "components": component_sizes(),
+        "gc": {"counts": gc.get_count(), "objects": len(gc.get_objects())},
+        "tracemalloc": tracemalloc_state(),
+    }
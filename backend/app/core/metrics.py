@@ -0,0 +1,264 @@
+"""
+Prometheus metrics
+
+Exposed at GET /metrics (text exposition format):
+
+- HTTP: request latency histogram, request count and in-flight gauge per
+  route template (MetricsMiddleware)
+- MongoDB: command latency and count per collection and command
+  (CommandMetricsListener), pool checkout wait, failures and connection
+  counts (PoolMetricsListener); registered on the Motor client
+- LLM: call latency, time to first chunk and estimated token counts
+- Wikipedia: call latency and count per HTTP status
+
+With several worker processes, set PROMETHEUS_MULTIPROC_DIR (see the
+prometheus-client documentation) so /metrics aggregates all of them.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from pymongo import monitoring
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.memory import register_memory
+
+
+# Label for requests that match no route (keeps label cardinality bounded)
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+MONGO_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+POOL_BUCKETS = (0.00001, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+OUTBOUND_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response is complete",
+    ["method", "route"], buckets=HTTP_BUCKETS
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests being served", ["method", "route"],
+    multiprocess_mode="livesum"
+)
+
+MONGO_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency (driver round trip)",
+    ["collection", "command"], buckets=MONGO_BUCKETS
+)
+MONGO_COMMANDS = Counter(
+    "mongodb_commands_total", "MongoDB commands", ["collection", "command", "outcome"]
+)
+MONGO_POOL_CHECKOUT_WAIT = Histogram(
+    "mongodb_pool_checkout_wait_seconds", "Time spent waiting to check a connection out of the pool",
+    buckets=POOL_BUCKETS
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongodb_pool_checkout_failures_total", "Failed connection checkouts", ["reason"]
+)
+MONGO_POOL_CONNECTIONS = Gauge(
+    "mongodb_pool_connections", "Open pool connections", multiprocess_mode="livesum"
+)
+MONGO_POOL_CHECKED_OUT = Gauge(
+    "mongodb_pool_connections_checked_out", "Pool connections currently in use", multiprocess_mode="livesum"
+)
+
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds", "LLM call latency (all attempts, until the last chunk)",
+    ["provider", "operation", "outcome"], buckets=OUTBOUND_BUCKETS
+)
+LLM_TIME_TO_FIRST_CHUNK = Histogram(
+    "llm_time_to_first_chunk_seconds", "Streaming LLM latency until the first chunk",
+    ["provider"], buckets=OUTBOUND_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total", "Estimated LLM tokens (prompt / completion)", ["provider", "kind"]
+)
+
+WIKIPEDIA_REQUEST_DURATION = Histogram(
+    "wikipedia_request_duration_seconds", "Wikipedia API request latency (per attempt)",
+    ["status"], buckets=OUTBOUND_BUCKETS
+)
+WIKIPEDIA_REQUESTS = Counter(
+    "wikipedia_requests_total", "Wikipedia API requests (per attempt)", ["status"]
+)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, and its content type"""
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+# ============ HTTP ============
+
+def route_template(scope: Scope) -> str:
+    """Path template of the route matching `scope` (e.g. /api/v1/articles/{article_id})"""
+    template = scope.get("route_template")
+    if template is not None:
+        return template
+
+    template = UNMATCHED_ROUTE
+    router = getattr(scope.get("app"), "router", None)
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            template = getattr(route, "path_format", None) or getattr(route, "path", UNMATCHED_ROUTE)
+            break
+
+    # Resolved once per request, shared by the middleware that need it
+    scope["route_template"] = template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    Per-route request metrics
+
+    Register last (outermost) so the measured latency includes the other
+    middleware. Latency runs until the final body chunk has been sent, which
+    covers streaming responses.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            HTTP_REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+
+
+# ============ MongoDB ============
+
+def command_collection(command_name: str, command: dict) -> str:
+    """Collection a command targets ("" for database/admin commands)"""
+    if command_name == "getMore":
+        return command.get("collection", "")
+    target = command.get(command_name)
+    return target if isinstance(target, str) else ""
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Times every driver command (runs on the driver's threads)"""
+
+    def __init__(self):
+        # (connection, request id) -> collection; started events carry the
+        # command, completion events only the timing
+        self._collections: Dict[tuple, str] = {}
+        register_memory("metrics.open_commands", self, lambda listener: listener._collections)
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self._collections[(event.connection_id, event.request_id)] = command_collection(
+            event.command_name, event.command
+        )
+
+    def _finish(self, event, outcome: str) -> None:
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_COMMANDS.labels(collection, event.command_name, outcome).inc()
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, "success")
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, "failure")
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Pool checkout wait and connection counts"""
+
+    def __init__(self):
+        # Checkouts run synchronously on one thread, so the start time is
+        # kept per thread (events before pymongo 4.7 carry no duration)
+        self._local = threading.local()
+
+    def _wait(self, event) -> Optional[float]:
+        duration = getattr(event, "duration", None)
+        if duration is not None:
+            return duration
+        started = getattr(self._local, "started", None)
+        return time.perf_counter() - started if started is not None else None
+
+    def connection_check_out_started(self, event) -> None:
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event) -> None:
+        wait = self._wait(event)
+        if wait is not None:
+            MONGO_POOL_CHECKOUT_WAIT.observe(wait)
+        MONGO_POOL_CHECKED_OUT.inc()
+
+    def connection_check_out_failed(self, event) -> None:
+        MONGO_POOL_CHECKOUT_FAILURES.labels(str(event.reason)).inc()
+
+    def connection_checked_in(self, event) -> None:
+        MONGO_POOL_CHECKED_OUT.dec()
+
+    def connection_created(self, event) -> None:
+        MONGO_POOL_CONNECTIONS.inc()
+
+    def connection_closed(self, event) -> None:
+        MONGO_POOL_CONNECTIONS.dec()
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+
+def mongo_event_listeners() -> list:
+    """Listeners to pass to the Motor client (`event_listeners=`)"""
+    if not settings.METRICS_ENABLED:
+        return []
+    return [CommandMetricsListener(), PoolMetricsListener()]
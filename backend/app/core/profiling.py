@@ -0,0 +1,228 @@
+"""
+On-demand request profiling
+
+A request is profiled when it carries a valid signed `X-Profile` header
+(see `create_profile_token`; PROFILING_SECRET) or is picked by
+PROFILING_SAMPLE_RATE. Everything else passes straight through, so with
+both off the cost is one settings check per request.
+
+Profiles are written to PROFILING_DIR, named by time, method and route,
+and the directory is pruned to PROFILING_MAX_FILES / PROFILING_MAX_BYTES.
+The profiled response carries an X-Profile-Id header; admin endpoints
+(/api/v1/admin/profiles) list and download profiles.
+
+pyinstrument (optional) gives async-aware HTML profiles covering only the
+profiled request. Without it cProfile is used: its .prof files (pstats,
+snakeviz) include whatever else ran on the loop meanwhile, and only one
+request is profiled at a time.
+"""
+
+import asyncio
+import cProfile
+import hashlib
+import hmac
+import logging
+import os
+import random
+import re
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import route_template
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # pyinstrument is optional; cProfile is always available
+    Profiler = None
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_EXTENSIONS = (".html", ".prof")
+
+_PROFILE_ID_RE = re.compile(r"^[\w~-]+\.\w+$")
+
+
+# ============ Signed header ============
+
+def _signature(expires: int) -> str:
+    return hmac.new(settings.PROFILING_SECRET.encode(), str(expires).encode(), hashlib.sha256).hexdigest()
+
+
+def create_profile_token(ttl_seconds: int) -> Dict[str, object]:
+    """Signed X-Profile value valid for `ttl_seconds`"""
+    expires = int(time.time()) + ttl_seconds
+    return {"token": f"{expires}.{_signature(expires)}", "expiresAt": datetime.utcfromtimestamp(expires)}
+
+
+def verify_profile_token(token: Optional[str]) -> bool:
+    if not token or not settings.PROFILING_SECRET:
+        return False
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(int(expires)))
+
+
+# ============ Profile storage ============
+
+def _profile_dir() -> str:
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    return settings.PROFILING_DIR
+
+
+def profile_path(profile_id: str) -> Optional[str]:
+    """Path of a stored profile, or None for unknown / malformed IDs"""
+    if not _PROFILE_ID_RE.match(profile_id) or not profile_id.endswith(PROFILE_EXTENSIONS):
+        return None
+    path = os.path.join(settings.PROFILING_DIR, profile_id)
+    return path if os.path.isfile(path) else None
+
+
+def list_profiles() -> List[Dict[str, object]]:
+    """Stored profiles, newest first"""
+    if not os.path.isdir(settings.PROFILING_DIR):
+        return []
+
+    profiles = []
+    for entry in os.scandir(settings.PROFILING_DIR):
+        if not entry.is_file() or not entry.name.endswith(PROFILE_EXTENSIONS):
+            continue
+        stat = entry.stat()
+        # <timestamp>_<method>_<route>_<status>_<ms>ms.<ext>
+        parts = entry.name.rsplit(".", 1)[0].split("_")
+        profiles.append({
+            "id": entry.name,
+            "method": parts[1] if len(parts) > 4 else None,
+            "route": "/" + "_".join(parts[2:-2]).replace("~", "/") if len(parts) > 4 else None,
+            "status": parts[-2] if len(parts) > 4 else None,
+            "durationMs": int(parts[-1][:-2]) if len(parts) > 4 and parts[-1][:-2].isdigit() else None,
+            "size": stat.st_size,
+            "createdAt": datetime.utcfromtimestamp(stat.st_mtime),
+        })
+
+    profiles.sort(key=lambda profile: profile["createdAt"], reverse=True)
+    return profiles
+
+
+def _prune() -> None:
+    """Delete the oldest profiles beyond PROFILING_MAX_FILES / PROFILING_MAX_BYTES"""
+    entries = sorted(
+        (entry for entry in os.scandir(settings.PROFILING_DIR) if entry.name.endswith(PROFILE_EXTENSIONS)),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True
+    )
+    total = 0
+    for index, entry in enumerate(entries):
+        total += entry.stat().st_size
+        if index >= settings.PROFILING_MAX_FILES or total > settings.PROFILING_MAX_BYTES:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+def _profile_name(scope: Scope, status: int, seconds: float, extension: str) -> str:
+    route = route_template(scope).strip("/").replace("/", "~")
+    route = re.sub(r"[^\w~-]", "", route) or "root"
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    return f"{stamp}_{scope['method']}_{route}_{status}_{int(seconds * 1000)}ms{extension}"
+
+
+# ============ Profilers ============
+
+class _RequestProfiler:
+    """pyinstrument when installed, else cProfile"""
+
+    _cprofile_busy = False
+
+    def __init__(self):
+        self.extension = ".html" if Profiler is not None else ".prof"
+        self._profiler = None
+
+    def start(self) -> bool:
+        if Profiler is not None:
+            self._profiler = Profiler(interval=settings.PROFILING_INTERVAL_SECONDS, async_mode="enabled")
+            self._profiler.start()
+            return True
+
+        # cProfile profiles the whole thread; never run two at once
+        if _RequestProfiler._cprofile_busy:
+            return False
+        _RequestProfiler._cprofile_busy = True
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        return True
+
+    def stop(self) -> None:
+        if Profiler is not None:
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+            _RequestProfiler._cprofile_busy = False
+
+    def write(self, path: str) -> None:
+        if Profiler is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self._profiler.output_html())
+        else:
+            self._profiler.dump_stats(path)
+        _prune()
+
+
+def should_profile(scope: Scope) -> bool:
+    """Whether this request is profiled (signed header or sampling)"""
+    if settings.PROFILING_SECRET and verify_profile_token(Headers(scope=scope).get(PROFILE_HEADER)):
+        return True
+    return settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+class ProfilingMiddleware:
+    """Profiles selected requests around the route handler"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not (settings.PROFILING_SECRET or settings.PROFILING_SAMPLE_RATE > 0)
+            or not should_profile(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = _RequestProfiler()
+        if not profiler.start():
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+        profile_id = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, profile_id
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                profile_id = _profile_name(scope, status, time.perf_counter() - started, profiler.extension)
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            if profile_id is None:
+                profile_id = _profile_name(scope, status, time.perf_counter() - started, profiler.extension)
+            try:
+                path = os.path.join(_profile_dir(), profile_id)
+                await asyncio.to_thread(profiler.write, path)
+                logger.info(f"Profile written: {path}")
+            except Exception as e:
+                logger.warning(f"Failed to write profile {profile_id}: {e!r}")
@@ -0,0 +1,213 @@
+"""
+Per-request MongoDB query accounting
+
+QueryTrackingMiddleware opens a QueryStats for every HTTP request in a
+context variable; QueryTrackingListener (a pymongo CommandListener on the
+Motor client) adds each command and its duration to it. Motor runs driver
+calls in executor threads with a copy of the caller's context, so commands
+land on the request that issued them.
+
+- A request issuing more than QUERY_BUDGET_MAX_COMMANDS commands or
+  spending more than QUERY_BUDGET_MAX_DB_MS in the database is logged with
+  its per-command breakdown (N+1 loops show up as one command repeated).
+- Any command slower than SLOW_QUERY_MS is logged with its filter shape
+  (field names and operators, values replaced by "?").
+- `assert_max_queries(n)` fails a test block that issues more than `n`
+  commands. mongomock emits no driver events; the tests' `tracked_db`
+  fixture records its commands instead.
+"""
+
+import logging
+import threading
+from collections import Counter
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from pymongo import monitoring
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.memory import register_memory
+from app.core.metrics import command_collection
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Commands and database time accumulated by one request (or test block)"""
+
+    def __init__(self, label: str = "", parent: Optional["QueryStats"] = None):
+        self.label = label
+        self.parent = parent
+        self.commands = 0
+        self.db_time = 0.0
+        self.by_command: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, key: str, duration: float) -> None:
+        stats = self
+        while stats is not None:
+            with stats._lock:
+                stats.commands += 1
+                stats.db_time += duration
+                stats.by_command[key] += 1
+            stats = stats.parent
+
+    def breakdown(self) -> str:
+        return ", ".join(f"{key} x{count}" for key, count in self.by_command.most_common())
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Stats of the request (or tracking block) running in this context"""
+    return _current_stats.get()
+
+
+# ============ Filter shapes ============
+
+def query_shape(value: Any) -> Any:
+    """Replace the values in a filter with "?", keeping field names and operators"""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, dict) for item in value):
+            return [query_shape(item) for item in value]
+        return "?"
+    return "?"
+
+
+def command_shape(command_name: str, command: dict) -> Dict[str, Any]:
+    """The parts of a command that determine its plan (filter, sort, pipeline)"""
+    if command_name in ("find", "count", "distinct", "findAndModify"):
+        shape = {"filter": query_shape(command.get("filter", command.get("query", {})))}
+        if command.get("sort"):
+            shape["sort"] = dict(command["sort"])
+        return shape
+    if command_name == "aggregate":
+        return {"pipeline": [
+            {stage: (query_shape(body) if stage in ("$match", "$lookup") else "...")}
+            for step in command.get("pipeline", []) for stage, body in step.items()
+        ]}
+    if command_name in ("update", "delete"):
+        statements = command.get(f"{command_name}s") or [{}]
+        return {"filter": query_shape(statements[0].get("q", {})), "statements": len(statements)}
+    if command_name == "insert":
+        return {"documents": len(command.get("documents", []))}
+    return {}
+
+
+# ============ Listener ============
+
+class QueryTrackingListener(monitoring.CommandListener):
+    """Adds each command to the current QueryStats and logs slow commands"""
+
+    def __init__(self):
+        # (connection, request id) -> (collection, command); only completion
+        # events carry the duration
+        self._started: Dict[tuple, tuple] = {}
+        register_memory("query_tracking.open_commands", self, lambda listener: listener._started)
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self._started[(event.connection_id, event.request_id)] = (
+            command_collection(event.command_name, event.command),
+            event.command
+        )
+
+    def _finish(self, event, failed: bool) -> None:
+        collection, command = self._started.pop((event.connection_id, event.request_id), ("", {}))
+        duration = event.duration_micros / 1e6
+        key = f"{collection}.{event.command_name}" if collection else event.command_name
+
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(key, duration)
+
+        if duration * 1000 >= settings.SLOW_QUERY_MS:
+            logger.warning(
+                f"Slow MongoDB command: {key} took {duration * 1000:.1f}ms"
+                f"{' (failed)' if failed else ''} "
+                f"shape={command_shape(event.command_name, command)}"
+                f"{f' request={stats.label}' if stats is not None and stats.label else ''}"
+            )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, failed=True)
+
+
+def query_event_listeners() -> list:
+    """Listeners to pass to the Motor client (`event_listeners=`)"""
+    if not settings.QUERY_TRACKING_ENABLED:
+        return []
+    return [QueryTrackingListener()]
+
+
+# ============ Request scope ============
+
+class QueryTrackingMiddleware:
+    """Opens a QueryStats per HTTP request and enforces the query budget"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.QUERY_TRACKING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        label = f"{scope['method']} {scope['path']}"
+        stats = QueryStats(label, parent=_current_stats.get())
+        token = _current_stats.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_stats.reset(token)
+            check_budget(stats)
+
+
+def check_budget(stats: QueryStats) -> bool:
+    """Log a warning if `stats` exceeds the query budget; return whether it fit"""
+    over_commands = stats.commands > settings.QUERY_BUDGET_MAX_COMMANDS
+    over_time = stats.db_time * 1000 > settings.QUERY_BUDGET_MAX_DB_MS
+
+    if over_commands or over_time:
+        logger.warning(
+            f"Query budget exceeded: {stats.label} issued {stats.commands} MongoDB commands "
+            f"(budget {settings.QUERY_BUDGET_MAX_COMMANDS}) taking {stats.db_time * 1000:.1f}ms "
+            f"(budget {settings.QUERY_BUDGET_MAX_DB_MS:.0f}ms): {stats.breakdown()}"
+        )
+        return False
+    return True
+
+
+@asynccontextmanager
+async def track_queries(label: str = ""):
+    """Collect the commands issued inside the block (including nested requests)"""
+    stats = QueryStats(label, parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@asynccontextmanager
+async def assert_max_queries(max_commands: int, label: str = ""):
+    """
+    Test helper: fail if the block issues more than `max_commands` commands
+
+        async with assert_max_queries(2):
+            await client.post(f"/api/v1/articles/{article_id}/like", headers=auth)
+    """
+    async with track_queries(label) as stats:
+        yield stats
+
+    assert stats.commands <= max_commands, (
+        f"{label or 'Block'} issued {stats.commands} MongoDB commands "
+        f"(expected at most {max_commands}): {stats.breakdown()}"
+    )
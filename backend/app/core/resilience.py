@@ -0,0 +1,254 @@
+"""
+Resilience for outbound dependency calls (LLM provider, Wikipedia)
+
+Every call goes through `call(dependency, operation)`, which applies the
+dependency's policy from RESILIENCE_POLICIES:
+
+- a deadline covering all attempts (`timeout`), so a slow upstream cannot
+  hold a request for longer than that;
+- retries with full-jitter exponential backoff for transient failures
+  (timeouts, connection errors, 429/5xx), only while the deadline allows;
+- optional hedging: if an attempt has not finished after `hedge_after`
+  seconds a second one is started and the first success wins;
+- a circuit breaker that opens after `failure_threshold` consecutive
+  transient failures and fails fast for `recovery_timeout` seconds, then
+  lets a single probe through before closing again.
+
+`breaker_states()` reports every breaker for monitoring (/health).
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the dependency while its circuit is open"""
+
+    def __init__(self, dependency: str, retry_after: float):
+        super().__init__(f"{dependency} is unavailable (circuit open, retry in {retry_after:.0f}s)")
+        self.dependency = dependency
+        self.retry_after = retry_after
+
+
+class TransientHTTPError(Exception):
+    """Retryable HTTP status returned by a dependency"""
+
+    def __init__(self, dependency: str, status: int, message: str = ""):
+        super().__init__(f"{dependency} returned HTTP {status} {message}".strip())
+        self.dependency = dependency
+        self.status = status
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Whether a failure is worth retrying and counts against the breaker"""
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError, TransientHTTPError)):
+        return True
+
+    # aiohttp connection/payload errors, without importing aiohttp here
+    if type(exc).__module__.startswith("aiohttp") and "Connection" in type(exc).__name__:
+        return True
+
+    # google.api_core errors expose the HTTP status as `code`
+    code = getattr(exc, "code", None)
+    return isinstance(code, int) and code in RETRYABLE_STATUS
+
+
+@dataclass
+class ResiliencePolicy:
+    """Call policy for one dependency"""
+    timeout: float = 10.0            # deadline for the whole call, all attempts included
+    attempts: int = 3                # total attempts (1 = no retries)
+    base_delay: float = 0.2          # backoff base (seconds)
+    max_delay: float = 2.0           # backoff cap (seconds)
+    hedge_after: float = 0.0         # start a second attempt after this long (0 = off)
+    failure_threshold: int = 5       # consecutive transient failures that open the circuit
+    recovery_timeout: float = 30.0   # open -> half-open after this long (seconds)
+
+
+def get_policy(dependency: str) -> ResiliencePolicy:
+    """Resolve a dependency's policy (dependency overrides 'default')"""
+    values = dict(settings.RESILIENCE_POLICIES.get("default", {}))
+    values.update(settings.RESILIENCE_POLICIES.get(dependency, {}))
+    policy = ResiliencePolicy(**values)
+    policy.attempts = max(1, int(policy.attempts))
+    policy.failure_threshold = max(1, int(policy.failure_threshold))
+    return policy
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed -> open -> half-open)"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+
+    def before_call(self, policy: ResiliencePolicy) -> None:
+        """Raise CircuitOpenError unless a call may proceed"""
+        if self.state == self.OPEN:
+            remaining = self.opened_at + policy.recovery_timeout - time.monotonic()
+            if remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, remaining)
+            self.state = self.HALF_OPEN
+            self.probe_in_flight = False
+            logger.info(f"Circuit for {self.name} half-open, probing")
+
+        if self.state == self.HALF_OPEN:
+            if self.probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, policy.recovery_timeout)
+            self.probe_in_flight = True
+
+        self.calls += 1
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
+
+    def record_failure(self, policy: ResiliencePolicy) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.probe_in_flight = False
+
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= policy.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(
+                    f"Circuit for {self.name} opened after {self.consecutive_failures} consecutive failures"
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def record_neutral(self) -> None:
+        """Non-transient outcome (e.g. a 4xx): the dependency itself is healthy"""
+        self.probe_in_flight = False
+        if self.state == self.HALF_OPEN:
+            self.record_success()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "calls": self.calls,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(dependency: str) -> CircuitBreaker:
+    breaker = _breakers.get(dependency)
+    if breaker is None:
+        breaker = _breakers[dependency] = CircuitBreaker(dependency)
+    return breaker
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every dependency's circuit breaker"""
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
+
+
+def backoff_delay(attempt: int, policy: ResiliencePolicy) -> float:
+    """Full-jitter exponential backoff before retry number `attempt` (1-based)"""
+    return random.uniform(0, min(policy.max_delay, policy.base_delay * (2 ** (attempt - 1))))
+
+
+async def _hedged(operation: Callable[[], Awaitable[Any]], hedge_after: float) -> Any:
+    """Run `operation`, starting a second copy if the first is slow; first success wins"""
+    pending = {asyncio.ensure_future(operation())}
+    error: Optional[BaseException] = None
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_after)
+        if done:
+            return done.pop().result()
+
+        pending.add(asyncio.ensure_future(operation()))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        # Also on the caller's deadline or cancellation: no attempt outlives the call
+        for task in pending:
+            task.cancel()
+
+
+async def call(
+    dependency: str,
+    operation: Callable[[], Awaitable[Any]],
+    idempotent: bool = True,
+    timeout: Optional[float] = None
+) -> Any:
+    """
+    Call `operation` (a zero-argument coroutine factory) under `dependency`'s policy
+
+    Non-idempotent operations are neither retried nor hedged. Raises
+    CircuitOpenError when the circuit is open, asyncio.TimeoutError when the
+    deadline passes, or the operation's last error.
+    """
+    policy = get_policy(dependency)
+    breaker = get_breaker(dependency)
+    deadline = time.monotonic() + (timeout or policy.timeout)
+    attempts = policy.attempts if idempotent else 1
+    hedge_after = policy.hedge_after if idempotent else 0
+
+    attempt = 0
+    while True:
+        attempt += 1
+        breaker.before_call(policy)
+
+        remaining = deadline - time.monotonic()
+        try:
+            async with asyncio.timeout(remaining):
+                if hedge_after and hedge_after < remaining:
+                    result = await _hedged(operation, hedge_after)
+                else:
+                    result = await operation()
+        except Exception as e:
+            if not is_transient(e):
+                breaker.record_neutral()
+                raise
+            breaker.record_failure(policy)
+
+            delay = backoff_delay(attempt, policy)
+            if attempt >= attempts or time.monotonic() + delay >= deadline:
+                logger.warning(f"{dependency} call failed after {attempt} attempt(s): {e!r}")
+                raise
+            logger.info(f"{dependency} call attempt {attempt} failed ({e!r}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            continue
+        except BaseException:
+            # Cancelled (client disconnect, caller's timeout, shutdown): no
+            # verdict on the dependency, but the next call may probe again
+            breaker.probe_in_flight = False
+            raise
+
+        breaker.record_success()
+        return result
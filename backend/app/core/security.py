@@ -1,33 +1,71 @@
 """Security utilities for authentication and authorization"""
 
+import asyncio
+import hashlib
+import hmac
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
 from jose import JWTError, jwt
 import bcrypt
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, status, Depends, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.config import settings
+from app.core.cache import get_cache
+from app.core.memory import register_memory
 
 # HTTP Bearer token
 security = HTTPBearer()
 
+# Dedicated, bounded pool for bcrypt so hashing never blocks the event loop
+# and cannot starve the executors used for database I/O
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
+    """Hash a password using bcrypt (blocking; prefer hash_password_async)"""
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash"""
+    """Verify a password against a hash (blocking; prefer verify_password_async)"""
     password_bytes = plain_password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, verify_password, plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a bcrypt hash was made with a cost other than BCRYPT_ROUNDS"""
+    try:
+        # Format: $2b$<cost>$<salt+hash>
+        cost = int(hashed_password.split('$')[2])
+    except (IndexError, ValueError):
+        return True
+    
+    return cost != settings.BCRYPT_ROUNDS
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -43,27 +81,165 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> dict:
-    """Decode and verify JWT token"""
+# How often expired entries are swept from the local revocation list
+REVOKED_PRUNE_INTERVAL_SECONDS = 60
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified JWT claims, keyed by a digest of the token
+    
+    Entries live until the token's `exp` or JWT_CACHE_TTL_SECONDS, whichever
+    comes first; the shorter bound is how revocations made by other workers
+    (published through the shared cache) reach this one.
+    """
+    
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._revoked: Dict[bytes, float] = {}
+        self._next_prune = 0.0
+        register_memory("auth.token_cache", self, lambda cache: cache._entries)
+        register_memory("auth.revoked_tokens", self, lambda cache: cache._revoked)
+    
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode('utf-8')).digest()
+    
+    def get(self, digest: bytes) -> Optional[dict]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        
+        valid_until, claims = entry
+        if valid_until <= time.time():
+            del self._entries[digest]
+            return None
+        
+        self._entries.move_to_end(digest)
+        return claims
+    
+    def put(self, digest: bytes, claims: dict) -> None:
+        if self.max_size <= 0 or "exp" not in claims:
+            return
+        
+        self._entries[digest] = (min(float(claims["exp"]), time.time() + self.ttl), claims)
+        self._entries.move_to_end(digest)
+        
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def revoke(self, digest: bytes, expires_at: float) -> None:
+        self._entries.pop(digest, None)
+        self._revoked[digest] = expires_at
+        self._prune_revoked(time.time(), force=True)
+    
+    def is_revoked(self, digest: bytes) -> bool:
+        now = time.time()
+        self._prune_revoked(now)
+        
+        expires_at = self._revoked.get(digest)
+        if expires_at is None:
+            return False
+        if expires_at <= now:
+            del self._revoked[digest]
+            return False
+        return True
+    
+    def _prune_revoked(self, now: float, force: bool = False) -> None:
+        """Forget revocations of expired tokens (they fail verification anyway), at most once a minute"""
+        if not force and now < self._next_prune:
+            return
+        self._next_prune = now + REVOKED_PRUNE_INTERVAL_SECONDS
+        for revoked_digest in [d for d, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[revoked_digest]
+    
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+token_cache = TokenCache(settings.JWT_CACHE_SIZE, settings.JWT_CACHE_TTL_SECONDS)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid authentication credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _verify_signature(token: str) -> dict:
+    """Fully verify a JWT (signature and expiry)"""
     try:
-        payload = jwt.decode(
+        return jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM]
         )
-        return payload
     except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _credentials_exception()
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Decode and verify JWT token (served from the verified-token cache when possible)
+    
+    Only this worker's revocations are checked; use `authenticate_token`
+    wherever a logout on another worker must be honoured.
+    """
+    digest = TokenCache.digest(token)
+    
+    if token_cache.is_revoked(digest):
+        raise _credentials_exception()
+    
+    payload = token_cache.get(digest)
+    if payload is None:
+        payload = _verify_signature(token)
+        token_cache.put(digest, payload)
+    
+    return payload
+
+
+async def authenticate_token(token: str) -> dict:
+    """Verify a bearer token, also honouring revocations made by other workers"""
+    digest = TokenCache.digest(token)
+    
+    if token_cache.is_revoked(digest):
+        raise _credentials_exception()
+    
+    payload = token_cache.get(digest)
+    if payload is not None:
+        return payload
+    
+    payload = _verify_signature(token)
+    
+    if settings.JWT_REVOCATION_ENABLED and await get_cache().get("auth:revoked", digest.hex()):
+        token_cache.revoke(digest, float(payload.get("exp", time.time())))
+        raise _credentials_exception()
+    
+    token_cache.put(digest, payload)
+    return payload
+
+
+async def revoke_token(token: str) -> None:
+    """Revoke an access token until it expires (logout)"""
+    payload = _verify_signature(token)
+    digest = TokenCache.digest(token)
+    expires_at = float(payload.get("exp", time.time()))
+    
+    token_cache.revoke(digest, expires_at)
+    
+    if settings.JWT_REVOCATION_ENABLED:
+        ttl = max(1, int(expires_at - time.time()) + 1)
+        await get_cache().set("auth:revoked", digest.hex(), True, ttl)
 
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Get current authenticated user from JWT token"""
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = await authenticate_token(token)
     
     user_id = payload.get("sub")
     if user_id is None:
@@ -75,10 +251,10 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     return {"user_id": user_id, "email": payload.get("email")}
 
 
-def verify_token(token: str) -> Optional[dict]:
-    """Verify token and return payload if valid"""
+async def verify_token(token: str) -> Optional[dict]:
+    """Verify token (including revocations made by other workers) and return payload if valid"""
     try:
-        return decode_access_token(token)
+        return await authenticate_token(token)
     except HTTPException:
         return None
 
@@ -90,7 +266,7 @@ async def get_current_user_optional(credentials: Optional[HTTPAuthorizationCrede
     
     try:
         token = credentials.credentials
-        payload = decode_access_token(token)
+        payload = await authenticate_token(token)
         
         user_id = payload.get("sub")
         if user_id is None:
@@ -99,3 +275,16 @@ async def get_current_user_optional(credentials: Optional[HTTPAuthorizationCrede
         return {"user_id": user_id, "email": payload.get("email")}
     except HTTPException:
         return None
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Allow only requests carrying ADMIN_API_KEY in the X-Admin-Token header"""
+    if (
+        not settings.ADMIN_API_KEY
+        or not x_admin_token
+        or not hmac.compare_digest(x_admin_token.encode(), settings.ADMIN_API_KEY.encode())
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
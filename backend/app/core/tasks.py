@@ -0,0 +1,36 @@
+"""
+Fire-and-forget background tasks
+
+asyncio only keeps weak references to tasks, so work started after a
+response is sent must be referenced somewhere until it finishes.
+"""
+
+import asyncio
+import logging
+from typing import Coroutine, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _on_done(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background task {task.get_name()} failed: {task.exception()}")
+
+
+def spawn(coro: Coroutine, name: Optional[str] = None) -> asyncio.Task:
+    """Run `coro` in the background, keeping it alive until it completes"""
+    task = asyncio.create_task(coro, name=name)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_done)
+    return task
+
+
+async def cancel_background_tasks() -> None:
+    """Cancel pending background tasks (application shutdown)"""
+    tasks = list(_background_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,442 @@
+"""
+Request tracing
+
+TracingMiddleware opens a server span per HTTP request (continuing an
+incoming W3C `traceparent`); nested spans are recorded for every MongoDB
+command (TracingCommandListener on the Motor client), LLM call and
+Wikipedia request, and code can add its own with `span(...)` / `traced`.
+
+Each response carries a Server-Timing header with the time spent per phase
+(db, llm, http) and in total, so browser devtools show the breakdown.
+
+Finished spans of sampled traces (TRACE_SAMPLE_RATE) are exported in
+batches by TRACE_EXPORTER:
+
+- "jsonl": one JSON span per line appended to TRACE_JSONL_PATH
+- "otlp": OTLP/HTTP JSON to TRACE_OTLP_ENDPOINT (an OpenTelemetry collector)
+- "none": Server-Timing only
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import orjson
+from pymongo import monitoring
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.memory import register_memory
+from app.core.metrics import command_collection, route_template
+
+logger = logging.getLogger(__name__)
+
+# Server-Timing phases and their descriptions
+PHASES = {"db": "MongoDB", "llm": "LLM", "http": "Outbound HTTP"}
+
+# OTLP span kinds
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+class RequestTiming:
+    """Time per phase within one request (for Server-Timing)"""
+
+    def __init__(self):
+        self.phases: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            total = self.phases.setdefault(phase, [0.0, 0])
+            total[0] += seconds
+            total[1] += 1
+
+    def header(self, total_seconds: float) -> str:
+        """Server-Timing value (phase durations in milliseconds)"""
+        entries = []
+        with self._lock:
+            for phase, (seconds, count) in self.phases.items():
+                entries.append(f'{phase};dur={seconds * 1000:.1f};desc="{PHASES.get(phase, phase)} x{count}"')
+        entries.append(f"total;dur={total_seconds * 1000:.1f}")
+        return ", ".join(entries)
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    kind: str = "internal"
+    phase: Optional[str] = None
+    sampled: bool = True
+    timing: Optional[RequestTiming] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    error: Optional[str] = None
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"[:500]
+
+        if self.phase and self.timing is not None:
+            self.timing.add(self.phase, (self.end_ns - self.start_ns) / 1e9)
+        if self.sampled:
+            _processor.add(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSONL representation"""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": self.start_ns / 1e9,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP/JSON representation"""
+        otlp = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": SPAN_KINDS.get(self.kind, 1),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            otlp["parentSpanId"] = self.parent_id
+        return otlp
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def start_span(
+    name: str,
+    kind: str = "internal",
+    phase: Optional[str] = None,
+    parent: Optional[Span] = None,
+    **attributes: Any
+) -> Span:
+    """
+    Start a span under `parent` (default: the current span) without making
+    it current; the caller must `end()` it. Without a parent a new trace is
+    started.
+    """
+    parent = parent if parent is not None else _current_span.get()
+    if parent is None:
+        return Span(
+            name, os.urandom(16).hex(), os.urandom(8).hex(), kind=kind, phase=phase,
+            sampled=_sample(), attributes=attributes
+        )
+    return Span(
+        name, parent.trace_id, os.urandom(8).hex(), parent.span_id, kind=kind, phase=phase,
+        sampled=parent.sampled, timing=parent.timing, attributes=attributes
+    )
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", phase: Optional[str] = None, **attributes: Any):
+    """Record the enclosed block as a span (current for nested spans)"""
+    if not settings.TRACING_ENABLED:
+        yield None
+        return
+
+    current = start_span(name, kind, phase, **attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.end(error=e)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+
+
+def traced(name: Optional[str] = None):
+    """Decorator recording each call of an async function as a span"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(span_name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+def _sample() -> bool:
+    return settings.TRACE_EXPORTER != "none" and random.random() < settings.TRACE_SAMPLE_RATE
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Span]:
+    """Remote parent from a W3C traceparent header (version-traceid-spanid-flags)"""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return Span("remote", parts[1], parts[2], sampled=sampled and settings.TRACE_EXPORTER != "none")
+
+
+# ============ Export ============
+
+class SpanExporter:
+    """Destination for finished spans"""
+
+    async def export(self, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Appends spans to a JSON lines file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _write(self, lines: bytes) -> None:
+        with open(self.path, "ab") as f:
+            f.write(lines)
+
+    async def export(self, spans: List[Span]) -> None:
+        lines = b"".join(orjson.dumps(span.to_dict(), default=str) + b"\n" for span in spans)
+        await asyncio.to_thread(self._write, lines)
+
+
+class OtlpSpanExporter(SpanExporter):
+    """Posts spans to an OTLP/HTTP endpoint using the JSON encoding"""
+
+    def __init__(self, endpoint: str, service_name: str):
+        self.endpoint = endpoint
+        self.resource = {"attributes": [_otlp_attribute("service.name", service_name)]}
+        self._session = None
+
+    async def export(self, spans: List[Span]) -> None:
+        import aiohttp
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+
+        body = {"resourceSpans": [{
+            "resource": self.resource,
+            "scopeSpans": [{"scope": {"name": "genwiki"}, "spans": [span.to_otlp() for span in spans]}],
+        }]}
+        async with self._session.post(
+            self.endpoint, data=orjson.dumps(body, default=str), headers={"Content-Type": "application/json"}
+        ) as response:
+            if response.status >= 400:
+                raise RuntimeError(f"OTLP endpoint returned HTTP {response.status}")
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+
+def create_exporter() -> Optional[SpanExporter]:
+    """Exporter selected by TRACE_EXPORTER"""
+    if settings.TRACE_EXPORTER == "jsonl":
+        return JsonlSpanExporter(settings.TRACE_JSONL_PATH)
+    if settings.TRACE_EXPORTER == "otlp":
+        return OtlpSpanExporter(settings.TRACE_OTLP_ENDPOINT, settings.TRACE_SERVICE_NAME)
+    if settings.TRACE_EXPORTER != "none":
+        logger.warning(f"Unknown TRACE_EXPORTER '{settings.TRACE_EXPORTER}', spans are not exported")
+    return None
+
+
+class SpanProcessor:
+    """
+    Buffers finished spans and exports them from a periodic task
+
+    Spans end on driver threads too, so `add` only appends; a full buffer
+    drops spans rather than blocking requests.
+    """
+
+    def __init__(self):
+        self.exporter: Optional[SpanExporter] = None
+        self.dropped = 0
+        self._buffer: List[Span] = []
+        self._task: Optional[asyncio.Task] = None
+        register_memory("tracing.span_buffer", self, lambda processor: processor._buffer)
+
+    def add(self, span: Span) -> None:
+        if self.exporter is None:
+            return
+        if len(self._buffer) >= settings.TRACE_MAX_QUEUE:
+            self.dropped += 1
+            return
+        self._buffer.append(span)
+
+    async def flush(self) -> None:
+        if self.exporter is None or not self._buffer:
+            return
+        spans, self._buffer = self._buffer, []
+        try:
+            await self.exporter.export(spans)
+        except Exception as e:
+            logger.warning(f"Span export failed ({len(spans)} spans dropped): {e!r}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.TRACE_EXPORT_INTERVAL_SECONDS)
+            await self.flush()
+
+    def start(self) -> None:
+        from app.core.tasks import spawn
+
+        self.exporter = create_exporter()
+        if self.exporter is not None and self._task is None:
+            self._task = spawn(self._run(), name="span-export")
+            logger.info(f"Tracing: exporting spans via {settings.TRACE_EXPORTER}")
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+        if self.exporter is not None:
+            await self.exporter.close()
+            self.exporter = None
+
+
+_processor = SpanProcessor()
+
+
+def start_tracing() -> None:
+    """Start exporting spans (application startup)"""
+    if settings.TRACING_ENABLED:
+        _processor.start()
+
+
+async def shutdown_tracing() -> None:
+    """Export remaining spans (application shutdown)"""
+    await _processor.shutdown()
+
+
+# ============ Instrumentation ============
+
+class TracingCommandListener(monitoring.CommandListener):
+    """A client span per MongoDB command issued inside a traced request"""
+
+    def __init__(self):
+        self._spans: Dict[tuple, Span] = {}
+        register_memory("tracing.open_command_spans", self, lambda listener: listener._spans)
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        parent = _current_span.get()
+        if parent is None:
+            return
+        self._spans[(event.connection_id, event.request_id)] = start_span(
+            f"mongodb.{event.command_name}", "client", "db", parent,
+            **{
+                "db.system": "mongodb",
+                "db.name": event.database_name,
+                "db.operation": event.command_name,
+                "db.mongodb.collection": command_collection(event.command_name, event.command),
+            }
+        )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        current = self._spans.pop((event.connection_id, event.request_id), None)
+        if current is not None:
+            current.end()
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        current = self._spans.pop((event.connection_id, event.request_id), None)
+        if current is not None:
+            failure = event.failure if isinstance(event.failure, dict) else {}
+            current.error = str(failure.get("errmsg", event.failure))[:500]
+            current.end()
+
+
+def tracing_event_listeners() -> list:
+    """Listeners to pass to the Motor client (`event_listeners=`)"""
+    if not settings.TRACING_ENABLED:
+        return []
+    return [TracingCommandListener()]
+
+
+class TracingMiddleware:
+    """Server span per request and the Server-Timing response header"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        route = route_template(scope)
+        remote_parent = parse_traceparent(Headers(scope=scope).get("traceparent"))
+        root = start_span(
+            f"{scope['method']} {route}", "server", parent=remote_parent,
+            **{"http.method": scope["method"], "http.route": route, "http.target": scope["path"]}
+        )
+        root.timing = RequestTiming()
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.set("http.status_code", message["status"])
+                if settings.SERVER_TIMING_ENABLED:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", root.timing.header(time.perf_counter() - started))
+            await send(message)
+
+        token = _current_span.set(root)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            root.end(error=e)
+            raise
+        finally:
+            _current_span.reset(token)
+            root.end()
@@ -0,0 +1,165 @@
+"""
+Startup warm-up
+
+After a deploy the first requests would otherwise pay for cold caches, an
+unopened MongoDB pool and fresh TLS handshakes. `start_warmup` runs these
+steps in the background once the app is up:
+
+- mongo_pool: WARMUP_POOL_CONNECTIONS concurrent pings open pool connections
+- llm / wikipedia: the LLM provider is created and pinged and a Wikipedia
+  connection opened (WARMUP_PING_EXTERNAL)
+- caches: trending, the WARMUP_CATEGORIES largest categories and the
+  WARMUP_TOP_ARTICLES most viewed articles (by ID and slug)
+- indexes: retrieval chunk indexes of those articles
+
+A failing step is logged and skipped; the whole phase is bounded by
+WARMUP_TIMEOUT_SECONDS. /health/ready answers 503 until it has finished,
+so traffic is only routed to warm instances. Durations are exported as
+app_warmup_seconds and app_warmup_step_seconds{step}.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from prometheus_client import Gauge
+
+from app.core.config import settings
+from app.core.database import db, get_database
+
+logger = logging.getLogger(__name__)
+
+WARMUP_DURATION = Gauge(
+    "app_warmup_seconds", "Duration of the startup warm-up phase", multiprocess_mode="max"
+)
+WARMUP_STEP_DURATION = Gauge(
+    "app_warmup_step_seconds", "Duration of each startup warm-up step", ["step"], multiprocess_mode="max"
+)
+
+# Page size the article list endpoints use by default
+DEFAULT_PAGE_SIZE = 10
+
+_state: Dict[str, Any] = {"ready": False, "status": "pending", "seconds": None, "steps": {}}
+
+
+# ============ Steps ============
+
+async def _warm_pool() -> int:
+    """Check out WARMUP_POOL_CONNECTIONS connections at once so the pool opens them"""
+    await asyncio.gather(*(db.client.admin.command("ping") for _ in range(settings.WARMUP_POOL_CONNECTIONS)))
+    return settings.WARMUP_POOL_CONNECTIONS
+
+
+async def _ping_llm() -> str:
+    from app.ai_modules.llm import get_llm_provider
+
+    provider = get_llm_provider()
+    await provider.ping()
+    return provider.name
+
+
+async def _ping_wikipedia() -> None:
+    from app.services.wikipedia_service import wikipedia_service
+
+    await wikipedia_service.ping()
+
+
+async def _prime_caches() -> List[str]:
+    """Fill the trending, category and article caches; return the primed article IDs"""
+    from app.services.article_service import article_service
+
+    database = get_database()
+    categories = [
+        group["_id"] async for group in database.articles.aggregate([
+            {"$group": {"_id": "$category", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+            {"$limit": settings.WARMUP_CATEGORIES}
+        ]) if group["_id"]
+    ]
+    top_articles = await database.articles.find(
+        {}, {"slug": 1}
+    ).sort([("views", -1), ("likes", -1)]).limit(settings.WARMUP_TOP_ARTICLES).to_list(None)
+
+    await asyncio.gather(
+        article_service.get_trending_articles(DEFAULT_PAGE_SIZE),
+        *(article_service.get_articles_by_category(category, DEFAULT_PAGE_SIZE) for category in categories),
+        *(
+            article_service.get_article_by_slug(article["slug"], increment_views=False)
+            for article in top_articles if article.get("slug")
+        )
+    )
+    return [str(article["_id"]) for article in top_articles]
+
+
+async def _load_indexes(article_ids: List[str]) -> int:
+    from app.ai_modules.retrieval import retrieval_service
+
+    await asyncio.gather(*(retrieval_service.get_index(article_id) for article_id in article_ids))
+    return len(article_ids)
+
+
+async def _step(name: str, func: Callable[..., Awaitable[Any]], *args) -> Optional[Any]:
+    start = time.perf_counter()
+    try:
+        result = await func(*args)
+        status = "ok"
+    except asyncio.CancelledError:
+        status = "cancelled"
+        raise
+    except Exception as e:
+        logger.warning(f"Warm-up step {name} failed: {e!r}")
+        result, status = None, "failed"
+    finally:
+        seconds = time.perf_counter() - start
+        WARMUP_STEP_DURATION.labels(name).set(seconds)
+        _state["steps"][name] = {"status": status, "ms": round(seconds * 1000, 1)}
+    return result
+
+
+async def _run_steps() -> None:
+    concurrent = [_step("mongo_pool", _warm_pool)]
+    if settings.WARMUP_PING_EXTERNAL:
+        concurrent += [_step("llm", _ping_llm), _step("wikipedia", _ping_wikipedia)]
+    caches = _step("caches", _prime_caches)
+
+    results = await asyncio.gather(caches, *concurrent)
+    await _step("indexes", _load_indexes, results[0] or [])
+
+
+async def run_warmup() -> None:
+    """Run every warm-up step (bounded by WARMUP_TIMEOUT_SECONDS), then report ready"""
+    start = time.perf_counter()
+    _state["status"] = "running"
+    try:
+        await asyncio.wait_for(_run_steps(), settings.WARMUP_TIMEOUT_SECONDS)
+        _state["status"] = "complete"
+    except asyncio.TimeoutError:
+        logger.warning(f"Warm-up timed out after {settings.WARMUP_TIMEOUT_SECONDS:.0f}s; reporting ready anyway")
+        _state["status"] = "timed_out"
+    finally:
+        seconds = time.perf_counter() - start
+        WARMUP_DURATION.set(seconds)
+        _state["seconds"] = round(seconds, 3)
+        _state["ready"] = True
+
+    logger.info(f"✅ Warm-up {_state['status']} in {seconds:.2f}s")
+
+
+def start_warmup() -> None:
+    """Start the warm-up in the background (application startup)"""
+    from app.core.tasks import spawn
+
+    if not settings.WARMUP_ENABLED:
+        _state.update(ready=True, status="disabled")
+        return
+    spawn(run_warmup(), name="warmup")
+
+
+def warmup_state() -> Dict[str, Any]:
+    """Readiness and per-step timings for /health/ready"""
+    return _state
+
+
+def is_ready() -> bool:
+    return _state["ready"]
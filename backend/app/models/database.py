@@ -1,5 +1,6 @@
 """Database models for MongoDB collections"""
 
+import hashlib
 from datetime import datetime
 from typing import List, Optional
 from bson import ObjectId
@@ -58,6 +59,11 @@ class UserModel:
 class ArticleModel:
     """Article document model"""
     
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """Hash identifying a revision of an article's content"""
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
     @staticmethod
     def create_document(
         title: str,
@@ -90,6 +96,7 @@ class ArticleModel:
             "difficulty": difficulty,
             "readingTime": reading_time,
             "sources": sources or [],
+            "contentHash": ArticleModel.content_hash(content),
             "publishedAt": datetime.utcnow(),
             "createdAt": datetime.utcnow(),
             "updatedAt": datetime.utcnow()
@@ -97,33 +104,105 @@ class ArticleModel:
 
 
 class ConversationModel:
-    """Conversation document model"""
+    """
+    Conversation document model
+    
+    Messages are not embedded; they live in `conversation_messages` buckets
+    (see ConversationModel.create_bucket) so a conversation document stays
+    small no matter how long the chat runs.
+    """
     
     @staticmethod
     def create_document(
         user_id: str,
-        article_id: str = None
+        article_id: str = None,
+        expires_at: datetime = None
     ) -> dict:
         """Create a new conversation document"""
         return {
             "userId": ObjectId(user_id),
             "articleId": ObjectId(article_id) if article_id else None,
-            "messages": [],
+            "title": None,
+            "messageCount": 0,
+            "lastMessage": None,
+            "summary": None,
+            "summarizedThroughSeq": -1,
             "createdAt": datetime.utcnow(),
-            "updatedAt": datetime.utcnow()
+            "updatedAt": datetime.utcnow(),
+            "expiresAt": expires_at
         }
     
     @staticmethod
     def add_message(
         role: str,
-        content: str
+        content: str,
+        seq: int = None
     ) -> dict:
-        """Create a message object"""
+        """Create a message object (`seq` is its position in the conversation)"""
         return {
+            "seq": seq,
             "role": role,
             "content": content,
             "timestamp": datetime.utcnow()
         }
+    
+    @staticmethod
+    def bucket_push(messages: List[dict], expires_at: datetime) -> dict:
+        """
+        Update appending `messages` to an existing bucket
+        
+        Messages are kept sorted by seq, so a turn that reserved earlier seqs
+        but is written after a concurrent later one still lands in order.
+        """
+        return {
+            "$push": {"messages": {"$each": messages, "$sort": {"seq": 1}}},
+            "$inc": {"count": len(messages)},
+            "$max": {"lastSeq": messages[-1]["seq"], "updatedAt": messages[-1]["timestamp"]},
+            "$set": {"expiresAt": expires_at}
+        }
+    
+    @staticmethod
+    def create_bucket(
+        conversation_id: ObjectId,
+        user_id: ObjectId,
+        messages: List[dict],
+        expires_at: datetime
+    ) -> dict:
+        """Create a message bucket starting at the first message's seq"""
+        return {
+            "conversationId": conversation_id,
+            "userId": user_id,
+            "firstSeq": messages[0]["seq"],
+            "lastSeq": messages[-1]["seq"],
+            "count": len(messages),
+            "messages": messages,
+            "createdAt": messages[0]["timestamp"],
+            "updatedAt": messages[-1]["timestamp"],
+            "expiresAt": expires_at
+        }
+
+
+class SessionModel:
+    """Refresh-token session document model"""
+    
+    @staticmethod
+    def create_document(
+        user_id: str,
+        email: str,
+        token_hash: str,
+        family_id: str,
+        expires_at: datetime
+    ) -> dict:
+        """Create a new session document (one per issued refresh token)"""
+        return {
+            "userId": ObjectId(user_id),
+            "email": email,
+            "tokenHash": token_hash,
+            "familyId": family_id,
+            "rotatedAt": None,
+            "expiresAt": expires_at,
+            "createdAt": datetime.utcnow()
+        }
 
 
 class SavedTopicModel:
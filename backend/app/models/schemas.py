@@ -89,6 +89,7 @@ class ArticleResponse(BaseModel):
     difficulty: str
     readingTime: int
     publishedAt: datetime
+    updatedAt: Optional[datetime] = None
     author: Optional[dict] = None
     
     class Config:
@@ -111,7 +112,7 @@ class SummarizeRequest(BaseModel):
     """Request for content summarization"""
     content: str = Field(..., min_length=50)
     maxLength: int = Field(default=300, ge=50, le=1000)
-    style: Optional[str] = "concise"  # concise, eli5, bullet_points, emoji
+    style: Optional[str] = "concise"  # concise, eli5, bullet_points, emoji, fast
 
 
 class SummarizeResponse(BaseModel):
@@ -188,11 +189,21 @@ class SavedTopicResponse(BaseModel):
 
 # ============ Conversation Models ============
 
+class ConversationMessage(BaseModel):
+    """Single chat message"""
+    seq: int
+    role: str
+    content: str
+    timestamp: datetime
+
+
 class ConversationResponse(BaseModel):
-    """Conversation response model"""
+    """Conversation response model (messages are paged separately)"""
     id: str
-    userId: str
-    messages: List[dict]
+    articleId: Optional[str] = None
+    title: Optional[str] = None
+    messageCount: int = 0
+    lastMessage: Optional[dict] = None
     createdAt: datetime
     updatedAt: datetime
     
@@ -200,6 +211,19 @@ class ConversationResponse(BaseModel):
         from_attributes = True
 
 
+class ConversationListResponse(BaseModel):
+    """Page of conversations, most recently active first"""
+    conversations: List[ConversationResponse]
+    nextCursor: Optional[str] = None
+
+
+class ConversationMessagesResponse(BaseModel):
+    """Page of messages, oldest first; nextCursor fetches older messages"""
+    conversationId: str
+    messages: List[ConversationMessage]
+    nextCursor: Optional[str] = None
+
+
 # ============ Recommendation Models ============
 
 class RecommendationRequest(BaseModel):
@@ -219,9 +243,15 @@ class RecommendationResponse(BaseModel):
 class Token(BaseModel):
     """JWT token response"""
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
 
 
+class RefreshTokenRequest(BaseModel):
+    """Refresh token exchange / revocation request"""
+    refresh_token: str = Field(..., min_length=1)
+
+
 class TokenData(BaseModel):
     """Token payload data"""
     email: Optional[str] = None
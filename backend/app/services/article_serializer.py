@@ -0,0 +1,110 @@
+"""
+Article serialization pipeline
+
+Article documents are shaped into their API form by MongoDB itself (an
+aggregation `$project` stage) and the resulting dicts are written straight
+to JSON bytes with orjson. There is no Python-side formatting copy and no
+response_model re-validation on the way out.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, TypedDict
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from app.core.cache import get_cache
+
+
+class ArticleView(TypedDict):
+    """Article as returned by the API (see ArticleResponse)"""
+    id: str
+    title: str
+    slug: str
+    content: str
+    summary: str
+    category: str
+    tags: List[str]
+    imageUrl: Optional[str]
+    views: int
+    likes: int
+    difficulty: str
+    readingTime: int
+    publishedAt: Optional[datetime]
+    updatedAt: Optional[datetime]
+
+
+# $project stage producing an ArticleView from a raw article document
+ARTICLE_VIEW_PROJECTION: Dict[str, Any] = {
+    "_id": 0,
+    "id": {"$toString": "$_id"},
+    "title": 1,
+    "slug": 1,
+    "content": 1,
+    "summary": 1,
+    "category": 1,
+    "tags": {"$ifNull": ["$tags", []]},
+    "imageUrl": {"$ifNull": ["$imageUrl", None]},
+    "views": {"$ifNull": ["$views", 0]},
+    "likes": {"$ifNull": ["$likes", 0]},
+    "difficulty": {"$ifNull": ["$difficulty", "medium"]},
+    "readingTime": {"$ifNull": ["$readingTime", 5]},
+    "publishedAt": {"$ifNull": ["$publishedAt", None]},
+    "updatedAt": {"$ifNull": ["$updatedAt", None]},
+}
+
+
+def article_view_pipeline(
+    match: Dict[str, Any],
+    sort: Optional[List[tuple]] = None,
+    skip: int = 0,
+    limit: int = 0
+) -> List[Dict[str, Any]]:
+    """Build an aggregation pipeline returning ArticleViews"""
+    pipeline: List[Dict[str, Any]] = [{"$match": match}]
+
+    if sort:
+        pipeline.append({"$sort": dict(sort)})
+    if skip:
+        pipeline.append({"$skip": skip})
+    if limit:
+        pipeline.append({"$limit": limit})
+
+    pipeline.append({"$project": ARTICLE_VIEW_PROJECTION})
+
+    return pipeline
+
+
+async def find_article_views(
+    collection: AsyncIOMotorCollection,
+    match: Dict[str, Any],
+    sort: Optional[List[tuple]] = None,
+    skip: int = 0,
+    limit: int = 0
+) -> List[ArticleView]:
+    """Fetch articles matching `match` in their API shape"""
+    cursor = collection.aggregate(article_view_pipeline(match, sort, skip, limit))
+    return await cursor.to_list(limit or None)
+
+
+async def find_article_view(
+    collection: AsyncIOMotorCollection,
+    match: Dict[str, Any]
+) -> Optional[ArticleView]:
+    """Fetch a single article in its API shape"""
+    views = await find_article_views(collection, match, limit=1)
+    return views[0] if views else None
+
+
+async def invalidate_article_views(article_id: str, *slugs: Optional[str]) -> None:
+    """
+    Drop the cached copies of an article after a write: its view, the slug
+    lookups resolving to it (old and new) and the trending and category
+    lists it may appear in
+    """
+    cache = get_cache()
+    await cache.delete("articles", article_id)
+    slugs = [slug for slug in slugs if slug]
+    if slugs:
+        await cache.delete("article-slugs", *slugs)
+    await cache.invalidate_namespace("trending")
+    await cache.invalidate_namespace("category")
@@ -4,12 +4,20 @@ import logging
 from typing import Optional, List
 from bson import ObjectId
 from datetime import datetime
+from pymongo import ReturnDocument
 import re
 
+from app.core.config import settings
 from app.core.database import get_database
+from app.core.cache import get_cache
+from app.services.article_serializer import (
+    ArticleView, find_article_view, find_article_views, invalidate_article_views
+)
 from app.models.database import ArticleModel
 from app.models.schemas import ArticleCreate, ArticleUpdate
-from app.ai_modules.summarization import summarization_service
+from app.ai_modules.extractive import extractive_summarizer
+from app.ai_modules.retrieval import retrieval_service
+from app.services.artifact_service import artifact_service
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +25,8 @@ logger = logging.getLogger(__name__)
 class ArticleService:
     """Service for article-related operations"""
     
-    async def create_article(self, article_data: ArticleCreate, author_id: str) -> dict:
-        """Create a new article with AI-generated summary"""
+    async def create_article(self, article_data: ArticleCreate, author_id: str) -> ArticleView:
+        """Create a new article with an extractive summary (upgraded by Gemini in the background)"""
         try:
             logger.info(f"Creating article: {article_data.title}")
             db = get_database()
@@ -34,24 +42,8 @@ class ArticleService:
                 slug = f"{slug}-{int(datetime.utcnow().timestamp())}"
                 logger.info(f"Slug already exists, using: {slug}")
             
-            # Generate AI summary
-            try:
-                logger.info("Generating AI summary...")
-                summary = await summarization_service.summarize(
-                    article_data.content[:5000],  # Limit content for API
-                    max_length=300,
-                    style="concise"
-                )
-                logger.info(f"AI summary generated: {len(summary)} chars")
-            except Exception as e:
-                logger.warning(f"Failed to generate AI summary, using fallback: {e}")
-                # Create a better fallback summary
-                content = article_data.content
-                sentences = content.split('. ')
-                summary = '. '.join(sentences[:3]) + '.'
-                if len(summary) > 300:
-                    summary = summary[:297] + "..."
-                logger.info("Using fallback summary")
+            # Instant extractive summary; replaced by the Gemini one once it is generated
+            summary = extractive_summarizer.summarize(article_data.content, max_length=300)
             
             # Create article document
             logger.info("Creating article document...")
@@ -72,65 +64,67 @@ class ArticleService:
             logger.info("Inserting into database...")
             result = await db.articles.insert_one(article_doc)
             logger.info(f"Article inserted with ID: {result.inserted_id}")
+            await invalidate_article_views(str(result.inserted_id), slug)
             
-            # Retrieve created article
-            created_article = await db.articles.find_one({"_id": result.inserted_id})
+            # Precompute AI artifacts in the background
+            artifact_service.schedule(str(result.inserted_id))
             
-            return self._format_article(created_article)
+            # Retrieve created article
+            return await find_article_view(db.articles, {"_id": result.inserted_id})
         except Exception as e:
             logger.error(f"Failed to create article: {str(e)}", exc_info=True)
             raise
-        
-        return self._format_article(created_article)
     
-    async def get_article_by_id(self, article_id: str, increment_views: bool = True) -> Optional[dict]:
-        """Get article by ID"""
+    async def get_article_by_id(self, article_id: str, increment_views: bool = True) -> Optional[ArticleView]:
+        """Get article by ID (served from the shared cache when warm)"""
         db = get_database()
+        cache = get_cache()
         
-        article = await db.articles.find_one({"_id": ObjectId(article_id)})
+        async def load():
+            return await find_article_view(db.articles, {"_id": ObjectId(article_id)})
+        
+        article = await cache.get_or_set("articles", article_id, load, settings.CACHE_ARTICLE_TTL)
         
         if not article:
             return None
         
-        # Increment view count
+        # Increment view count (only the counter travels back from the database)
         if increment_views:
-            await db.articles.update_one(
+            counters = await db.articles.find_one_and_update(
                 {"_id": ObjectId(article_id)},
-                {"$inc": {"views": 1}}
+                {"$inc": {"views": 1}},
+                projection={"views": 1},
+                return_document=ReturnDocument.AFTER
             )
-            article['views'] = article.get('views', 0) + 1
+            if not counters:
+                await cache.delete("articles", article_id)
+                return None
+            article['views'] = counters['views']
         
-        return self._format_article(article)
+        return article
     
-    async def get_article_by_slug(self, slug: str, increment_views: bool = True) -> Optional[dict]:
+    async def get_article_by_slug(self, slug: str, increment_views: bool = True) -> Optional[ArticleView]:
         """Get article by slug"""
         db = get_database()
+        cache = get_cache()
         
-        article = await db.articles.find_one({"slug": slug})
+        # Slugs resolve to IDs so that one cached copy serves both lookups
+        async def load_id():
+            article = await db.articles.find_one({"slug": slug}, projection={"_id": 1})
+            return str(article['_id']) if article else None
         
-        if not article:
-            return None
+        article_id = await cache.get_or_set("article-slugs", slug, load_id, settings.CACHE_ARTICLE_TTL)
         
-        # Increment view count
-        if increment_views:
-            await db.articles.update_one(
-                {"slug": slug},
-                {"$inc": {"views": 1}}
-            )
-            article['views'] = article.get('views', 0) + 1
+        if not article_id:
+            return None
         
-        return self._format_article(article)
+        return await self.get_article_by_id(article_id, increment_views)
     
-    async def get_article_by_title(self, title: str) -> Optional[dict]:
+    async def get_article_by_title(self, title: str) -> Optional[ArticleView]:
         """Get article by exact title match"""
         db = get_database()
         
-        article = await db.articles.find_one({"title": title})
-        
-        if not article:
-            return None
-        
-        return self._format_article(article)
+        return await find_article_view(db.articles, {"title": title})
     
     async def search_articles(
         self,
@@ -164,14 +158,13 @@ class ArticleService:
             search_query["difficulty"] = difficulty
         
         # Execute search
-        cursor = db.articles.find(search_query).skip(skip).limit(limit)
-        articles = await cursor.to_list(limit)
+        articles = await find_article_views(db.articles, search_query, skip=skip, limit=limit)
         
         # Get total count
         total = await db.articles.count_documents(search_query)
         
         return {
-            "results": [self._format_article(article) for article in articles],
+            "results": articles,
             "total": total,
             "query": query or ""
         }
@@ -180,29 +173,34 @@ class ArticleService:
         self,
         category: str,
         limit: int = 10
-    ) -> List[dict]:
+    ) -> List[ArticleView]:
         """Get articles by category"""
         db = get_database()
         
-        cursor = db.articles.find({"category": category}).limit(limit)
-        articles = await cursor.to_list(limit)
+        async def load():
+            return await find_article_views(db.articles, {"category": category}, limit=limit)
         
-        return [self._format_article(article) for article in articles]
+        return await get_cache().get_or_set(
+            "category", f"{category}:{limit}", load, settings.CACHE_TRENDING_TTL
+        )
     
-    async def get_trending_articles(self, limit: int = 10) -> List[dict]:
+    async def get_trending_articles(self, limit: int = 10) -> List[ArticleView]:
         """Get trending articles (most views and likes)"""
         db = get_database()
         
-        cursor = db.articles.find().sort([
-            ("views", -1),
-            ("likes", -1)
-        ]).limit(limit)
-        
-        articles = await cursor.to_list(limit)
+        async def load():
+            return await find_article_views(
+                db.articles,
+                {},
+                sort=[("views", -1), ("likes", -1)],
+                limit=limit
+            )
         
-        return [self._format_article(article) for article in articles]
+        return await get_cache().get_or_set(
+            "trending", str(limit), load, settings.CACHE_TRENDING_TTL
+        )
     
-    async def update_article(self, article_id: str, article_data: ArticleUpdate) -> dict:
+    async def update_article(self, article_id: str, article_data: ArticleUpdate) -> ArticleView:
         """Update article"""
         db = get_database()
         
@@ -213,15 +211,9 @@ class ArticleService:
             update_doc['slug'] = self._generate_slug(article_data.title)
         if article_data.content is not None:
             update_doc['content'] = article_data.content
-            # Regenerate summary
-            try:
-                summary = await summarization_service.summarize(
-                    article_data.content,
-                    max_length=300
-                )
-                update_doc['summary'] = summary
-            except:
-                pass
+            update_doc['contentHash'] = ArticleModel.content_hash(article_data.content)
+            # Instant extractive summary; replaced by the Gemini one once it is generated
+            update_doc['summary'] = extractive_summarizer.summarize(article_data.content, max_length=300)
         if article_data.category is not None:
             update_doc['category'] = article_data.category
         if article_data.tags is not None:
@@ -236,65 +228,83 @@ class ArticleService:
         
         update_doc['updatedAt'] = datetime.utcnow()
         
-        # Update article
-        result = await db.articles.update_one(
+        # Update article (the previous slug is returned so its cached lookup can be dropped)
+        previous = await db.articles.find_one_and_update(
             {"_id": ObjectId(article_id)},
-            {"$set": update_doc}
+            {"$set": update_doc},
+            projection={"slug": 1}
         )
         
-        if result.matched_count == 0:
+        if previous is None:
             raise ValueError("Article not found")
         
-        # Return updated article
-        updated_article = await db.articles.find_one({"_id": ObjectId(article_id)})
+        await invalidate_article_views(article_id, previous.get('slug'), update_doc.get('slug'))
+        
+        # Content changed: precompute AI artifacts for the new revision
+        if article_data.content is not None:
+            artifact_service.schedule(article_id)
         
-        return self._format_article(updated_article)
+        # Return updated article
+        return await find_article_view(db.articles, {"_id": ObjectId(article_id)})
     
     async def delete_article(self, article_id: str) -> bool:
         """Delete article"""
         db = get_database()
         
-        result = await db.articles.delete_one({"_id": ObjectId(article_id)})
+        deleted = await db.articles.find_one_and_delete({"_id": ObjectId(article_id)}, projection={"slug": 1})
+        await invalidate_article_views(article_id, deleted.get('slug') if deleted else None)
+        await retrieval_service.delete_index(article_id)
+        await artifact_service.delete_artifacts(article_id)
         
-        return result.deleted_count > 0
+        return deleted is not None
     
     async def like_article(self, article_id: str, user_id: str) -> dict:
-        """Like/unlike article"""
+        """
+        Like/unlike article
+        
+        The toggle is two conditional updates instead of read-then-write: a
+        like costs one round trip, an unlike two. The article itself comes
+        from the shared cache with the fresh counters applied; the cached
+        copy is dropped rather than written back, since a write-back could
+        restore content that a concurrent update just invalidated.
+        """
         db = get_database()
+        cache = get_cache()
         
-        article = await db.articles.find_one({"_id": ObjectId(article_id)})
-        
-        if not article:
-            raise ValueError("Article not found")
-        
-        liked_by = article.get('likedBy', [])
         user_object_id = ObjectId(user_id)
+        counters_projection = {"views": 1, "likes": 1}
+        
+        # Like, unless the user already has
+        counters = await db.articles.find_one_and_update(
+            {"_id": ObjectId(article_id), "likedBy": {"$ne": user_object_id}},
+            {"$push": {"likedBy": user_object_id}, "$inc": {"likes": 1}},
+            projection=counters_projection,
+            return_document=ReturnDocument.AFTER
+        )
+        liked = counters is not None
         
-        if user_object_id in liked_by:
+        if not liked:
             # Unlike
-            await db.articles.update_one(
-                {"_id": ObjectId(article_id)},
-                {
-                    "$pull": {"likedBy": user_object_id},
-                    "$inc": {"likes": -1}
-                }
-            )
-            liked = False
-        else:
-            # Like
-            await db.articles.update_one(
-                {"_id": ObjectId(article_id)},
-                {
-                    "$push": {"likedBy": user_object_id},
-                    "$inc": {"likes": 1}
-                }
+            counters = await db.articles.find_one_and_update(
+                {"_id": ObjectId(article_id), "likedBy": user_object_id},
+                {"$pull": {"likedBy": user_object_id}, "$inc": {"likes": -1}},
+                projection=counters_projection,
+                return_document=ReturnDocument.AFTER
             )
-            liked = True
         
-        updated_article = await db.articles.find_one({"_id": ObjectId(article_id)})
+        if not counters:
+            raise ValueError("Article not found")
+        
+        article = await cache.get("articles", article_id)
+        if article is None:
+            article = await find_article_view(db.articles, {"_id": ObjectId(article_id)})
+        await cache.delete("articles", article_id)
+        if article:
+            article['views'] = counters.get('views', 0)
+            article['likes'] = counters['likes']
         
         return {
-            "article": self._format_article(updated_article),
+            "article": article,
             "liked": liked
         }
     
@@ -304,25 +314,6 @@ class ArticleService:
         slug = re.sub(r'[^a-z0-9]+', '-', slug)
         slug = slug.strip('-')
         return slug
-    
-    def _format_article(self, article: dict) -> dict:
-        """Format article document for response"""
-        return {
-            "id": str(article['_id']),
-            "title": article['title'],
-            "slug": article['slug'],
-            "content": article['content'],
-            "summary": article['summary'],
-            "category": article['category'],
-            "tags": article.get('tags', []),
-            "imageUrl": article.get('imageUrl'),
-            "views": article.get('views', 0),
-            "likes": article.get('likes', 0),
-            "difficulty": article.get('difficulty', 'medium'),
-            "readingTime": article.get('readingTime', 5),
-            "publishedAt": article.get('publishedAt'),
-            "updatedAt": article.get('updatedAt')
-        }
 
 
 # Singleton instance
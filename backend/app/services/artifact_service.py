@@ -0,0 +1,231 @@
+"""
+Article AI artifact service
+
+Summaries in every style, follow-up questions and key facts depend only on
+an article's content, so they are generated once per content revision in
+the background after an article is created, imported or edited, and
+stored in `article_artifacts` keyed by (articleId, contentHash). Reads are
+then two small indexed lookups; an artifact that is not ready yet is
+generated on demand and stored for the next reader.
+
+Articles are stored with an instant extractive summary; once the concise
+Gemini summary exists it replaces that, unless the content changed since.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from bson import ObjectId
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.tasks import spawn
+from app.models.database import ArticleModel
+from app.services.article_serializer import invalidate_article_views
+from app.ai_modules.summarization import summarization_service
+from app.ai_modules.chat import chat_service
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_STYLES = ("concise", "eli5", "bullet_points", "emoji")
+
+# Stored counts; endpoints slice these down to the requested count
+FOLLOW_UP_QUESTION_COUNT = 5
+KEY_FACT_COUNT = 10
+
+# Same content window and length used for the article's own summary at creation
+SUMMARY_CONTENT_CHARS = 5000
+SUMMARY_MAX_LENGTH = 300
+
+
+def summary_field(style: str) -> str:
+    return f"summaries.{style}"
+
+
+ARTIFACT_FIELDS = tuple(summary_field(style) for style in SUMMARY_STYLES) + ("followUpQuestions", "keyFacts")
+
+
+def _get_field(document: Optional[dict], field: str) -> Any:
+    """Read a dotted field path from a document"""
+    value = document
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+class ArtifactService:
+    """Service for precomputed per-article AI outputs"""
+
+    def __init__(self):
+        # Bounds concurrent LLM calls made by background generation across
+        # all articles (bulk imports), not articles in flight
+        self._generation_slots = asyncio.Semaphore(settings.AI_ARTIFACT_CONCURRENCY)
+
+    def _generators(self, article: dict) -> Dict[str, Callable[[], Awaitable[Any]]]:
+        """Coroutine factories producing each artifact for `article`"""
+        content = article.get("content", "")
+        excerpt = content[:SUMMARY_CONTENT_CHARS]
+
+        generators = {
+            summary_field(style): (
+                lambda style=style: summarization_service.summarize(
+                    excerpt, SUMMARY_MAX_LENGTH, style, fallback=False
+                )
+            )
+            for style in SUMMARY_STYLES
+        }
+        generators["followUpQuestions"] = lambda: chat_service.generate_follow_up_questions(
+            article.get("title", ""), content, FOLLOW_UP_QUESTION_COUNT
+        )
+        generators["keyFacts"] = lambda: summarization_service.extract_key_facts(excerpt, KEY_FACT_COUNT)
+
+        return generators
+
+    async def _current_hash(self, article_id: ObjectId) -> Optional[str]:
+        """Content hash of an article's current revision (None if the article does not exist)"""
+        db = get_database()
+
+        article = await db.articles.find_one({"_id": article_id}, {"contentHash": 1})
+        if not article:
+            return None
+        if article.get("contentHash"):
+            return article["contentHash"]
+
+        # Backfill articles stored before content hashes were recorded
+        article = await db.articles.find_one({"_id": article_id}, {"content": 1})
+        content_hash = ArticleModel.content_hash(article.get("content", ""))
+        await db.articles.update_one({"_id": article_id}, {"$set": {"contentHash": content_hash}})
+
+        return content_hash
+
+    async def _store(self, article_id: ObjectId, content_hash: str, values: Dict[str, Any]) -> None:
+        db = get_database()
+        now = datetime.utcnow()
+
+        await db.article_artifacts.update_one(
+            {"articleId": article_id, "contentHash": content_hash},
+            {
+                "$set": dict(values, updatedAt=now),
+                "$setOnInsert": {"createdAt": now}
+            },
+            upsert=True
+        )
+
+    async def _upgrade_article_summary(self, article_id: ObjectId, content_hash: str, summary: str) -> None:
+        """Replace the article's extractive summary with the Gemini one for the same revision"""
+        db = get_database()
+
+        result = await db.articles.update_one(
+            {"_id": article_id, "contentHash": content_hash},
+            {"$set": {"summary": summary}}
+        )
+        if result.modified_count:
+            await invalidate_article_views(str(article_id))
+
+    def schedule(self, article_id: str) -> None:
+        """Generate an article's artifacts in the background (ingestion hook)"""
+        if settings.AI_ARTIFACTS_ON_INGEST:
+            spawn(self.generate_artifacts(article_id), name=f"article-artifacts:{article_id}")
+
+    async def _generate_in_slot(self, generator: Callable[[], Awaitable[Any]]) -> Any:
+        async with self._generation_slots:
+            return await generator()
+
+    async def generate_artifacts(self, article_id: str) -> Dict[str, Any]:
+        """Generate and store every missing artifact for the article's current content"""
+        db = get_database()
+
+        article = await db.articles.find_one(
+            {"_id": ObjectId(article_id)},
+            {"title": 1, "content": 1}
+        )
+        if not article:
+            return {}
+
+        content_hash = ArticleModel.content_hash(article.get("content", ""))
+        stored = await db.article_artifacts.find_one(
+            {"articleId": article["_id"], "contentHash": content_hash}
+        )
+
+        generators = self._generators(article)
+        missing = [field for field in ARTIFACT_FIELDS if _get_field(stored, field) is None]
+        results = await asyncio.gather(
+            *[self._generate_in_slot(generators[field]) for field in missing],
+            return_exceptions=True
+        )
+
+        values = {}
+        for field, result in zip(missing, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to generate {field} for article {article_id}: {result}")
+            else:
+                values[field] = result
+
+        if values:
+            await self._store(article["_id"], content_hash, values)
+
+        concise = values.get(summary_field("concise")) or _get_field(stored, summary_field("concise"))
+        if concise:
+            await self._upgrade_article_summary(article["_id"], content_hash, concise)
+
+        # Artifacts of earlier revisions are never served again
+        await db.article_artifacts.delete_many(
+            {"articleId": article["_id"], "contentHash": {"$ne": content_hash}}
+        )
+
+        logger.info(
+            f"Generated {len(values)}/{len(missing)} missing AI artifacts for article {article_id}"
+        )
+
+        return values
+
+    async def get_artifact(self, article_id: str, field: str) -> Any:
+        """
+        Get one stored artifact, generating and storing it if it is not ready
+
+        Returns None if the article does not exist.
+        """
+        db = get_database()
+
+        if not ObjectId.is_valid(article_id):
+            return None
+
+        object_id = ObjectId(article_id)
+        content_hash = await self._current_hash(object_id)
+        if content_hash is None:
+            return None
+
+        stored = await db.article_artifacts.find_one(
+            {"articleId": object_id, "contentHash": content_hash},
+            {field: 1}
+        )
+        value = _get_field(stored, field)
+        if value is not None:
+            return value
+
+        # Not generated yet (or generation failed): produce it now
+        article = await db.articles.find_one({"_id": object_id}, {"title": 1, "content": 1})
+        if not article:
+            return None
+
+        value = await self._generators(article)[field]()
+        await self._store(object_id, content_hash, {field: value})
+
+        return value
+
+    async def get_summary(self, article_id: str, style: str = "concise") -> Optional[str]:
+        return await self.get_artifact(article_id, summary_field(style))
+
+    async def delete_artifacts(self, article_id: str) -> None:
+        """Drop every stored artifact of an article"""
+        db = get_database()
+
+        await db.article_artifacts.delete_many({"articleId": ObjectId(article_id)})
+
+
+# Singleton instance
+artifact_service = ArtifactService()
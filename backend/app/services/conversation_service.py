@@ -0,0 +1,466 @@
+"""
+Conversation service
+
+Chat messages are stored in fixed-size buckets in `conversation_messages`
+(at most CONVERSATION_BUCKET_SIZE messages each, plus the turn that filled
+it), keyed by conversation and the sequence number of their first message.
+The conversation document only carries counters and a preview, so loading
+history and appending a turn cost the same on the first message and the
+ten-thousandth. Both collections carry an `expiresAt` TTL that is pushed
+forward on every turn.
+
+Turns that no longer fit the chat history budget are folded into a rolling
+`summary` on the conversation document; `summarizedThroughSeq` records the
+last message it covers, so history reads skip everything before it.
+"""
+
+import base64
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.tasks import spawn
+from app.models.database import ConversationModel
+from app.ai_modules.chat import chat_service
+
+logger = logging.getLogger(__name__)
+
+# Fields of a conversation document returned by reads (never the legacy array)
+CONVERSATION_PROJECTION = {
+    "userId": 1,
+    "articleId": 1,
+    "title": 1,
+    "messageCount": 1,
+    "lastMessage": 1,
+    "summary": 1,
+    "summarizedThroughSeq": 1,
+    "createdAt": 1,
+    "updatedAt": 1,
+}
+
+
+class ConversationService:
+    """Service for persisted AI chat conversations"""
+
+    @staticmethod
+    def _expires_at() -> datetime:
+        return datetime.utcnow() + timedelta(days=settings.CONVERSATION_RETENTION_DAYS)
+
+    @staticmethod
+    def _format_conversation(conversation: dict) -> dict:
+        return {
+            "id": str(conversation["_id"]),
+            "articleId": str(conversation["articleId"]) if conversation.get("articleId") else None,
+            "title": conversation.get("title"),
+            "messageCount": conversation.get("messageCount", 0),
+            "lastMessage": conversation.get("lastMessage"),
+            "createdAt": conversation["createdAt"],
+            "updatedAt": conversation["updatedAt"]
+        }
+
+    @staticmethod
+    def _format_message(message: dict) -> dict:
+        return {
+            "seq": message["seq"],
+            "role": message["role"],
+            "content": message["content"],
+            "timestamp": message["timestamp"]
+        }
+
+    @staticmethod
+    def _encode_cursor(conversation: dict) -> str:
+        raw = f"{conversation['updatedAt'].isoformat()}|{conversation['_id']}"
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+            updated_at, conversation_id = raw.split("|", 1)
+            return datetime.fromisoformat(updated_at), ObjectId(conversation_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    async def create_conversation(
+        self,
+        user_id: str,
+        article_id: Optional[str] = None,
+        title: Optional[str] = None
+    ) -> str:
+        """Create an empty conversation and return its ID"""
+        db = get_database()
+
+        conversation_doc = ConversationModel.create_document(
+            user_id=user_id,
+            article_id=article_id,
+            expires_at=self._expires_at()
+        )
+        if title:
+            conversation_doc["title"] = title[:100]
+
+        result = await db.conversations.insert_one(conversation_doc)
+
+        return str(result.inserted_id)
+
+    async def get_conversation(self, conversation_id: str, user_id: str) -> Optional[dict]:
+        """Get a conversation owned by `user_id` (without its messages)"""
+        db = get_database()
+
+        if not ObjectId.is_valid(conversation_id):
+            return None
+
+        # The one-element slice is only there to spot pre-bucketing documents
+        projection = dict(CONVERSATION_PROJECTION, messages={"$slice": 1})
+        conversation = await db.conversations.find_one(
+            {"_id": ObjectId(conversation_id), "userId": ObjectId(user_id)},
+            projection
+        )
+
+        if conversation and conversation.get("messages"):
+            conversation = await self._migrate_embedded_messages(conversation["_id"])
+
+        return conversation
+
+    async def _migrate_embedded_messages(self, conversation_id: ObjectId) -> Optional[dict]:
+        """Move a legacy embedded `messages` array into buckets (once per conversation)"""
+        db = get_database()
+
+        expires_at = self._expires_at()
+        bucket_size = settings.CONVERSATION_BUCKET_SIZE
+
+        # Detach the array atomically so concurrent readers migrate it only once
+        conversation = await db.conversations.find_one_and_update(
+            {"_id": conversation_id, "messages.0": {"$exists": True}},
+            {"$unset": {"messages": ""}, "$set": {"expiresAt": expires_at}}
+        )
+        messages = conversation.get("messages", []) if conversation else []
+
+        buckets = []
+        for start in range(0, len(messages), bucket_size):
+            chunk = []
+            for offset, original in enumerate(messages[start:start + bucket_size]):
+                message = ConversationModel.add_message(
+                    original.get("role", "user"),
+                    original.get("content", ""),
+                    start + offset
+                )
+                message["timestamp"] = original.get("timestamp") or conversation["updatedAt"]
+                chunk.append(message)
+            buckets.append({
+                "conversationId": conversation_id,
+                "userId": conversation["userId"],
+                "firstSeq": start,
+                "lastSeq": start + len(chunk) - 1,
+                "count": len(chunk),
+                "messages": chunk,
+                "createdAt": chunk[0]["timestamp"],
+                "updatedAt": chunk[-1]["timestamp"],
+                "expiresAt": expires_at
+            })
+
+        if buckets:
+            await db.conversation_messages.insert_many(buckets)
+            await db.conversations.update_one(
+                {"_id": conversation_id},
+                {
+                    "$inc": {"messageCount": len(messages)},
+                    "$set": {"lastMessage": buckets[-1]["messages"][-1]}
+                }
+            )
+            logger.info(f"Moved {len(messages)} embedded messages of conversation {conversation_id} into buckets")
+
+        return await db.conversations.find_one({"_id": conversation_id}, CONVERSATION_PROJECTION)
+
+    async def get_recent_messages(
+        self,
+        conversation_id: str,
+        limit: int,
+        after_seq: int = -1
+    ) -> List[dict]:
+        """
+        Get the last `limit` messages with seq > `after_seq`, oldest first,
+        reading only the newest buckets
+        """
+        db = get_database()
+
+        bucket_count = math.ceil(limit / settings.CONVERSATION_BUCKET_SIZE) + 1
+        cursor = db.conversation_messages.find(
+            {"conversationId": ObjectId(conversation_id), "lastSeq": {"$gt": after_seq}},
+            {"_id": 0, "messages": {"$slice": -limit}}
+        ).sort("firstSeq", -1).limit(bucket_count)
+
+        messages = []
+        async for bucket in cursor:
+            messages = [message for message in bucket["messages"] if message["seq"] > after_seq] + messages
+            if len(messages) >= limit:
+                break
+
+        return messages[-limit:]
+
+    async def append_messages(
+        self,
+        conversation_id: str,
+        user_id: str,
+        messages: List[Tuple[str, str]]
+    ) -> Optional[List[dict]]:
+        """
+        Append (role, content) messages to a conversation
+
+        Returns the stored messages, or None if the conversation does not
+        exist or is not owned by `user_id`.
+        """
+        db = get_database()
+        expires_at = self._expires_at()
+        now = datetime.utcnow()
+
+        # Reserve sequence numbers and refresh the conversation in one write
+        last_role, last_content = messages[-1]
+        conversation = await db.conversations.find_one_and_update(
+            {"_id": ObjectId(conversation_id), "userId": ObjectId(user_id)},
+            {
+                "$inc": {"messageCount": len(messages)},
+                "$set": {
+                    "lastMessage": {"role": last_role, "content": last_content[:200], "timestamp": now},
+                    "updatedAt": now,
+                    "expiresAt": expires_at
+                }
+            },
+            projection={"messageCount": 1},
+            return_document=ReturnDocument.AFTER
+        )
+
+        if not conversation:
+            return None
+
+        first_seq = conversation["messageCount"] - len(messages)
+        documents = [
+            ConversationModel.add_message(role, content, first_seq + offset)
+            for offset, (role, content) in enumerate(messages)
+        ]
+
+        await self._store_messages(conversation["_id"], ObjectId(user_id), documents, expires_at)
+
+        return documents
+
+    async def _store_messages(
+        self,
+        conversation_id: ObjectId,
+        user_id: ObjectId,
+        messages: List[dict],
+        expires_at: datetime
+    ) -> None:
+        """
+        Write messages with freshly reserved seqs to their bucket
+
+        Usually they extend the open bucket ending right before them (one
+        write). Otherwise (first turn, full bucket, or a concurrent turn that
+        reserved later seqs was written first) they go to the newest bucket
+        starting at or before them if it still has room or already reaches
+        past them, else to a new bucket starting at their first seq. Buckets
+        never overlap, so paging by firstSeq stays correct.
+        """
+        db = get_database()
+        bucket_size = settings.CONVERSATION_BUCKET_SIZE
+        first_seq = messages[0]["seq"]
+        update = ConversationModel.bucket_push(messages, expires_at)
+
+        result = await db.conversation_messages.update_one(
+            {"conversationId": conversation_id, "lastSeq": first_seq - 1, "count": {"$lt": bucket_size}},
+            update
+        )
+        if result.matched_count:
+            return
+
+        bucket = await db.conversation_messages.find_one(
+            {"conversationId": conversation_id, "firstSeq": {"$lte": first_seq}},
+            {"_id": 1},
+            sort=[("firstSeq", -1)]
+        )
+        if bucket is not None:
+            # A full bucket's lastSeq no longer grows, so this cannot race with
+            # a later turn opening the next bucket
+            result = await db.conversation_messages.update_one(
+                {
+                    "_id": bucket["_id"],
+                    "$or": [{"count": {"$lt": bucket_size}}, {"lastSeq": {"$gt": first_seq}}]
+                },
+                update
+            )
+            if result.matched_count:
+                return
+
+        try:
+            await db.conversation_messages.insert_one(
+                ConversationModel.create_bucket(conversation_id, user_id, messages, expires_at)
+            )
+        except DuplicateKeyError:
+            # The bucket starting at first_seq was created meanwhile
+            await db.conversation_messages.update_one(
+                {"conversationId": conversation_id, "firstSeq": first_seq}, update
+            )
+
+    def compact_history(
+        self,
+        conversation_id: str,
+        summarized_through: int,
+        messages: List[dict]
+    ) -> None:
+        """
+        Fold the unsummarized turns that no longer fit the chat history
+        budget into the conversation's rolling summary, in the background
+
+        `messages` are the newest unsummarized messages at hand (history and
+        the turn just stored). A fold is considered when they overflow
+        CHAT_HISTORY_TOKEN_BUDGET, or when older unsummarized turns exist
+        that they do not include; the fold itself decides on the full set.
+        """
+        if not messages:
+            return
+
+        overflow, _ = chat_service.split_history(messages, settings.CHAT_HISTORY_TOKEN_BUDGET, len(messages))
+        if not overflow and messages[0]["seq"] <= summarized_through + 1:
+            return
+
+        spawn(self._fold_into_summary(conversation_id), name=f"conversation-summary:{conversation_id}")
+
+    async def get_messages_after(self, conversation_id: str, after_seq: int) -> List[dict]:
+        """Every message with seq > `after_seq`, oldest first"""
+        db = get_database()
+
+        cursor = db.conversation_messages.find(
+            {"conversationId": ObjectId(conversation_id), "lastSeq": {"$gt": after_seq}},
+            {"_id": 0, "messages": 1}
+        ).sort("firstSeq", 1)
+
+        messages = [
+            message async for bucket in cursor for message in bucket["messages"]
+            if message["seq"] > after_seq
+        ]
+        return sorted(messages, key=lambda message: message["seq"])
+
+    async def _fold_into_summary(self, conversation_id: str) -> None:
+        """
+        Fold the oldest unsummarized turns into the summary once all of them
+        overflow the history budget, compacting down to half the budget so
+        the summary is rewritten every few turns rather than on every turn
+
+        Only the contiguous run of messages right after summarizedThroughSeq
+        is folded, so a turn whose write has not landed yet is never skipped.
+        """
+        db = get_database()
+        budget = settings.CHAT_HISTORY_TOKEN_BUDGET
+
+        conversation = await db.conversations.find_one(
+            {"_id": ObjectId(conversation_id)},
+            {"summary": 1, "summarizedThroughSeq": 1}
+        )
+        if not conversation:
+            return
+        summarized_through = conversation.get("summarizedThroughSeq")
+        summarized_through = -1 if summarized_through is None else summarized_through
+
+        messages = []
+        for message in await self.get_messages_after(conversation_id, summarized_through):
+            if message["seq"] != summarized_through + 1 + len(messages):
+                break
+            messages.append(message)
+
+        overflow, _ = chat_service.split_history(messages, budget, len(messages))
+        if not overflow:
+            return
+        older, _ = chat_service.split_history(messages, budget // 2, len(messages))
+
+        try:
+            new_summary = await chat_service.summarize_history(conversation.get("summary"), older)
+        except Exception as e:
+            logger.warning(f"Failed to update summary of conversation {conversation_id}: {e}")
+            return
+
+        # Only apply on top of the summary it was built from; a concurrent fold wins otherwise
+        previous = {"$in": [-1, None]} if summarized_through < 0 else summarized_through
+        await db.conversations.update_one(
+            {"_id": ObjectId(conversation_id), "summarizedThroughSeq": previous},
+            {"$set": {"summary": new_summary, "summarizedThroughSeq": older[-1]["seq"]}}
+        )
+
+    async def list_conversations(
+        self,
+        user_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> dict:
+        """List a user's conversations, most recently active first"""
+        db = get_database()
+
+        query = {"userId": ObjectId(user_id)}
+        if cursor:
+            updated_at, last_id = self._decode_cursor(cursor)
+            query["$or"] = [
+                {"updatedAt": {"$lt": updated_at}},
+                {"updatedAt": updated_at, "_id": {"$lt": last_id}}
+            ]
+
+        conversations = await db.conversations.find(query, CONVERSATION_PROJECTION).sort(
+            [("updatedAt", -1), ("_id", -1)]
+        ).limit(limit + 1).to_list(limit + 1)
+
+        has_more = len(conversations) > limit
+        conversations = conversations[:limit]
+
+        return {
+            "conversations": [self._format_conversation(conversation) for conversation in conversations],
+            "nextCursor": self._encode_cursor(conversations[-1]) if has_more else None
+        }
+
+    async def get_messages(
+        self,
+        conversation_id: str,
+        before: Optional[int] = None,
+        limit: int = 50
+    ) -> dict:
+        """
+        Page backwards through a conversation's messages
+
+        Returns up to `limit` messages with seq < `before` (newest page when
+        omitted), oldest first, and the cursor for the previous page.
+        """
+        db = get_database()
+
+        query = {"conversationId": ObjectId(conversation_id)}
+        if before is not None:
+            query["firstSeq"] = {"$lt": before}
+
+        bucket_count = math.ceil(limit / settings.CONVERSATION_BUCKET_SIZE) + 1
+        cursor = db.conversation_messages.find(query, {"_id": 0, "messages": 1}).sort(
+            "firstSeq", -1
+        ).limit(bucket_count)
+
+        messages = []
+        async for bucket in cursor:
+            page = [
+                message for message in bucket["messages"]
+                if before is None or message["seq"] < before
+            ]
+            messages = page + messages
+            if len(messages) >= limit:
+                break
+
+        messages = messages[-limit:]
+        oldest_seq = messages[0]["seq"] if messages else 0
+
+        return {
+            "conversationId": conversation_id,
+            "messages": [self._format_message(message) for message in messages],
+            "nextCursor": str(oldest_seq) if oldest_seq > 0 else None
+        }
+
+
+# Singleton instance
+conversation_service = ConversationService()
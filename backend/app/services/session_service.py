@@ -0,0 +1,157 @@
+"""Session service for refresh-token rotation"""
+
+import base64
+import hashlib
+import hmac
+import logging
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from bson import ObjectId
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.security import create_access_token
+from app.models.database import SessionModel
+
+logger = logging.getLogger(__name__)
+
+
+class SessionService:
+    """
+    Service for refresh-token sessions
+
+    Refresh tokens are opaque random strings; only their SHA-256 hash is
+    stored. Every refresh rotates the token, and presenting an already
+    rotated token is treated as theft: the whole token family is revoked.
+
+    Within REFRESH_TOKEN_REUSE_GRACE_SECONDS of a rotation (two tabs or a
+    retried request refreshing at once) the rotated token instead gets the
+    same successor again, as long as that successor has not been rotated
+    itself. The successor is derived from its predecessor
+    with an HMAC, so no plaintext token is stored for this. The trade-off:
+    a stolen token replayed inside the window also receives the successor.
+    """
+
+    @staticmethod
+    def _hash_token(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _successor_token(refresh_token: str) -> str:
+        """The refresh token that replaces `refresh_token` on rotation"""
+        digest = hmac.new(
+            settings.JWT_SECRET_KEY.encode('utf-8'),
+            f"refresh:{refresh_token}".encode('utf-8'),
+            hashlib.sha256
+        ).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode('ascii')
+
+    async def create_session(
+        self,
+        user_id: str,
+        email: str,
+        family_id: Optional[str] = None,
+        refresh_token: Optional[str] = None
+    ) -> str:
+        """Issue a refresh token (random unless given) and store its session"""
+        db = get_database()
+
+        refresh_token = refresh_token or secrets.token_urlsafe(32)
+        session_doc = SessionModel.create_document(
+            user_id=user_id,
+            email=email,
+            token_hash=self._hash_token(refresh_token),
+            family_id=family_id or uuid.uuid4().hex,
+            expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        )
+
+        await db.sessions.insert_one(session_doc)
+
+        return refresh_token
+
+    async def refresh(self, refresh_token: str) -> dict:
+        """Exchange a refresh token for a new access token and a rotated refresh token"""
+        db = get_database()
+        token_hash = self._hash_token(refresh_token)
+        now = datetime.utcnow()
+
+        # Atomically claim the session so concurrent reuse cannot rotate twice
+        session = await db.sessions.find_one_and_update(
+            {"tokenHash": token_hash, "rotatedAt": None, "expiresAt": {"$gt": now}},
+            {"$set": {"rotatedAt": now}}
+        )
+
+        if not session:
+            reused = await db.sessions.find_one({"tokenHash": token_hash})
+            if reused and reused.get("rotatedAt"):
+                grace = timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+                if now - reused["rotatedAt"] <= grace and reused["expiresAt"] > now:
+                    # Concurrent refresh of the same token: hand out the same successor,
+                    # unless the client has already rotated it (a stale duplicate,
+                    # rejected without revoking the family)
+                    successor = self._successor_token(refresh_token)
+                    unrotated = await db.sessions.find_one(
+                        {"tokenHash": self._hash_token(successor), "rotatedAt": None, "expiresAt": {"$gt": now}},
+                        {"_id": 1}
+                    )
+                    if unrotated and await self._user_exists(reused["userId"]):
+                        return self._token_response(reused, successor)
+                    raise ValueError("Invalid or expired refresh token")
+
+                logger.warning(
+                    f"Refresh token reuse detected for user {reused['userId']}; "
+                    f"revoking session family {reused['familyId']}"
+                )
+                await db.sessions.delete_many({"familyId": reused["familyId"]})
+            raise ValueError("Invalid or expired refresh token")
+
+        if not await self._user_exists(session["userId"]):
+            await db.sessions.delete_many({"familyId": session["familyId"]})
+            raise ValueError("Invalid or expired refresh token")
+
+        new_refresh_token = await self.create_session(
+            str(session["userId"]),
+            session["email"],
+            session["familyId"],
+            refresh_token=self._successor_token(refresh_token)
+        )
+
+        return self._token_response(session, new_refresh_token)
+
+    @staticmethod
+    async def _user_exists(user_id: ObjectId) -> bool:
+        """Deleted users get no new access tokens"""
+        db = get_database()
+        return await db.users.find_one({"_id": user_id}, {"_id": 1}) is not None
+
+    @staticmethod
+    def _token_response(session: dict, refresh_token: str) -> dict:
+        user_id = str(session["userId"])
+        access_token = create_access_token(data={"sub": user_id, "email": session["email"]})
+
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer"
+        }
+
+    async def revoke(self, refresh_token: str, user_id: str) -> bool:
+        """Revoke the session family of one of `user_id`'s refresh tokens (logout)"""
+        db = get_database()
+
+        session = await db.sessions.find_one(
+            {"tokenHash": self._hash_token(refresh_token), "userId": ObjectId(user_id)}
+        )
+        if not session:
+            return False
+
+        await db.sessions.delete_many({"familyId": session["familyId"], "userId": ObjectId(user_id)})
+
+        return True
+
+
+# Singleton instance
+session_service = SessionService()
@@ -5,9 +5,13 @@ from typing import Optional, List
 from datetime import datetime
 from bson import ObjectId
 
+from app.core.config import settings
 from app.core.database import get_database
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import (
+    hash_password_async, verify_password_async, password_needs_rehash, create_access_token
+)
 from app.models.database import UserModel
+from app.services.session_service import session_service
 from app.models.schemas import UserCreate, UserUpdate
 
 logger = logging.getLogger(__name__)
@@ -26,7 +30,7 @@ class UserService:
             raise ValueError("User with this email already exists")
         
         # Hash password
-        password_hash = hash_password(user_data.password)
+        password_hash = await hash_password_async(user_data.password)
         
         # Create user document
         user_doc = UserModel.create_document(
@@ -56,13 +60,18 @@ class UserService:
             raise ValueError("Invalid email or password")
         
         # Verify password
-        if not verify_password(password, user['password']):
+        if not await verify_password_async(password, user['password']):
             raise ValueError("Invalid email or password")
         
-        # Update last login
+        # Update last login, upgrading the hash if the bcrypt cost changed
+        login_update = {"lastLogin": datetime.utcnow()}
+        if password_needs_rehash(user['password']):
+            logger.info(f"Rehashing password for user {user['_id']} with cost {settings.BCRYPT_ROUNDS}")
+            login_update['password'] = await hash_password_async(password)
+        
         await db.users.update_one(
             {"_id": user['_id']},
-            {"$set": {"lastLogin": datetime.utcnow()}}
+            {"$set": login_update}
         )
         
         # Generate token
@@ -70,8 +79,12 @@ class UserService:
             data={"sub": str(user['_id']), "email": user['email']}
         )
         
+        # Long-lived refresh token so clients can renew without re-entering the password
+        refresh_token = await session_service.create_session(str(user['_id']), user['email'])
+        
         user_data = self._format_user(user)
         user_data['token'] = token
+        user_data['refresh_token'] = refresh_token
         
         return user_data
     
@@ -1,9 +1,16 @@
 """Wikipedia integration service for fetching article content"""
 
+import asyncio
 import logging
+import time
 import aiohttp
 from typing import Optional, Dict, List
-from urllib.parse import quote
+
+from app.core.config import settings
+from app.core.cache import Cache, get_cache
+from app.core import resilience
+from app.core.metrics import WIKIPEDIA_REQUEST_DURATION, WIKIPEDIA_REQUESTS
+from app.core.tracing import start_span
 
 logger = logging.getLogger(__name__)
 
@@ -11,11 +18,87 @@ logger = logging.getLogger(__name__)
 class WikipediaService:
     """Service for fetching content from Wikipedia API"""
     
-    BASE_URL = "https://en.wikipedia.org/w/api.php"
     HEADERS = {
         'User-Agent': 'GenZWikipedia/1.0 (Educational Project; Contact: student@example.com)'
     }
     
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    @property
+    def base_url(self) -> str:
+        return settings.WIKIPEDIA_API_URL
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared session (connection pooling); per-request deadlines come from resilience"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.HEADERS,
+                timeout=aiohttp.ClientTimeout(
+                    total=settings.WIKIPEDIA_TIMEOUT_SECONDS,
+                    connect=settings.WIKIPEDIA_CONNECT_TIMEOUT_SECONDS
+                ),
+                connector=aiohttp.TCPConnector(limit=settings.WIKIPEDIA_MAX_CONNECTIONS)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared session (application shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _query(self, params: Dict) -> Dict:
+        """
+        Run a MediaWiki API query with deadline, retries and circuit breaking
+        
+        429/5xx responses are retried; other non-200 responses raise
+        aiohttp.ClientResponseError.
+        """
+        async def fetch() -> Dict:
+            start = time.perf_counter()
+            status = "error"
+            http_span = start_span(
+                "GET wikipedia", "client", "http",
+                **{"http.method": "GET", "http.url": self.base_url, "wikipedia.action": params.get("list") or params.get("prop", "")}
+            )
+            try:
+                async with self._get_session().get(self.base_url, params=params) as response:
+                    status = str(response.status)
+                    http_span.set("http.status_code", response.status)
+                    if response.status == 200:
+                        return await response.json()
+                    
+                    error_text = await response.text()
+                    if response.status in resilience.RETRYABLE_STATUS:
+                        raise resilience.TransientHTTPError("wikipedia", response.status, error_text[:200])
+                    raise aiohttp.ClientResponseError(
+                        response.request_info,
+                        response.history,
+                        status=response.status,
+                        message=error_text[:200]
+                    )
+            except asyncio.TimeoutError:
+                status = "timeout"
+                raise
+            except asyncio.CancelledError:
+                # Deadline expired or a hedged attempt won
+                status = "cancelled"
+                raise
+            except Exception as e:
+                http_span.end(error=e)
+                raise
+            finally:
+                http_span.end()
+                WIKIPEDIA_REQUEST_DURATION.labels(status).observe(time.perf_counter() - start)
+                WIKIPEDIA_REQUESTS.labels(status).inc()
+        
+        return await resilience.call("wikipedia", fetch)
+    
+    async def ping(self) -> None:
+        """Open a pooled connection (DNS, TCP, TLS) ahead of the first real request"""
+        await self._query({"action": "query", "format": "json", "meta": "siteinfo"})
+    
     async def search_articles(self, query: str, limit: int = 10) -> List[Dict]:
         """Search for articles on Wikipedia"""
         params = {
@@ -27,21 +110,22 @@ class WikipediaService:
             "srprop": "title|snippet"
         }
         
+        cache_key = Cache.hash_key("search", query, limit)
+        cached = await get_cache().get("wikipedia", cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             logger.info(f"Searching Wikipedia for: {query}")
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.BASE_URL, params=params, headers=self.HEADERS) as response:
-                    logger.info(f"Wikipedia API response status: {response.status}")
-                    if response.status == 200:
-                        data = await response.json()
-                        results = data.get("query", {}).get("search", [])
-                        logger.info(f"Found {len(results)} Wikipedia results")
-                        return results
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Wikipedia API error {response.status}: {error_text}")
+            data = await self._query(params)
+            results = data.get("query", {}).get("search", [])
+            logger.info(f"Found {len(results)} Wikipedia results")
+            await get_cache().set("wikipedia", cache_key, results, settings.CACHE_WIKIPEDIA_TTL)
+            return results
+        except resilience.CircuitOpenError as e:
+            logger.warning(f"Skipping Wikipedia search: {e}")
         except Exception as e:
-            logger.error(f"Failed to search Wikipedia: {e}", exc_info=True)
+            logger.error(f"Failed to search Wikipedia: {e}")
         
         return []
     
@@ -52,46 +136,47 @@ class WikipediaService:
             "format": "json",
             "titles": title,
             "prop": "extracts|pageimages|categories|info",
-            "explaintext": True,
+            "explaintext": 1,
             "exsectionformat": "plain",
             "piprop": "original",
             "inprop": "url",
             "cllimit": 10
         }
         
+        cache_key = Cache.hash_key("content", title)
+        cached = await get_cache().get("wikipedia", cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             logger.info(f"Fetching Wikipedia article: {title}")
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.BASE_URL, params=params, headers=self.HEADERS) as response:
-                    logger.info(f"Article fetch response status: {response.status}")
-                    if response.status == 200:
-                        data = await response.json()
-                        pages = data.get("query", {}).get("pages", {})
-                        
-                        # Get the first (and only) page
-                        page = next(iter(pages.values()))
-                        
-                        if "missing" in page:
-                            logger.warning(f"Article not found: {title}")
-                            return None
-                        
-                        result = {
-                            "title": page.get("title", ""),
-                            "content": page.get("extract", ""),
-                            "image_url": page.get("original", {}).get("source"),
-                            "url": page.get("fullurl", ""),
-                            "categories": [
-                                cat.get("title", "").replace("Category:", "")
-                                for cat in page.get("categories", [])
-                            ]
-                        }
-                        logger.info(f"Successfully fetched article: {result['title']}, content length: {len(result['content'])}")
-                        return result
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Wikipedia API error {response.status}: {error_text}")
+            data = await self._query(params)
+            pages = data.get("query", {}).get("pages", {})
+            
+            # Get the first (and only) page
+            page = next(iter(pages.values()))
+            
+            if "missing" in page:
+                logger.warning(f"Article not found: {title}")
+                return None
+            
+            result = {
+                "title": page.get("title", ""),
+                "content": page.get("extract", ""),
+                "image_url": page.get("original", {}).get("source"),
+                "url": page.get("fullurl", ""),
+                "categories": [
+                    cat.get("title", "").replace("Category:", "")
+                    for cat in page.get("categories", [])
+                ]
+            }
+            logger.info(f"Successfully fetched article: {result['title']}, content length: {len(result['content'])}")
+            await get_cache().set("wikipedia", cache_key, result, settings.CACHE_WIKIPEDIA_TTL)
+            return result
+        except resilience.CircuitOpenError as e:
+            logger.warning(f"Skipping Wikipedia article fetch: {e}")
         except Exception as e:
-            logger.error(f"Failed to fetch article from Wikipedia: {e}", exc_info=True)
+            logger.error(f"Failed to fetch article from Wikipedia: {e}")
         
         return None
     
@@ -102,21 +187,18 @@ class WikipediaService:
             "format": "json",
             "titles": title,
             "prop": "extracts",
-            "exintro": True,
-            "explaintext": True,
+            "exintro": 1,
+            "explaintext": 1,
             "exsentences": sentences
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.BASE_URL, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        pages = data.get("query", {}).get("pages", {})
-                        page = next(iter(pages.values()))
-                        
-                        if "missing" not in page:
-                            return page.get("extract", "")
+            data = await self._query(params)
+            pages = data.get("query", {}).get("pages", {})
+            page = next(iter(pages.values()))
+            
+            if "missing" not in page:
+                return page.get("extract", "")
         except Exception as e:
             logger.error(f"Failed to fetch summary from Wikipedia: {e}")
         
@@ -0,0 +1,112 @@
+"""
+Article formatting benchmark
+Compares the legacy per-article pipeline (BSON decode -> _format_article ->
+response_model validation -> JSON) with the projection pipeline (BSON
+decode of the $project output -> orjson) for single articles and feeds
+
+Usage: python benchmarks/bench_article_formatting.py [--feed-size 50]
+"""
+
+import argparse
+import json
+from datetime import datetime
+from typing import List
+
+import bson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from bench_serialization import make_article, run_sync, timeit
+from app.core.responses import ORJSONResponse
+from app.models.schemas import ArticleResponse
+
+
+def legacy_format_article(article: dict) -> dict:
+    """Copy of the removed ArticleService._format_article"""
+    return {
+        "id": str(article['_id']),
+        "title": article['title'],
+        "slug": article['slug'],
+        "content": article['content'],
+        "summary": article['summary'],
+        "category": article['category'],
+        "tags": article.get('tags', []),
+        "imageUrl": article.get('imageUrl'),
+        "views": article.get('views', 0),
+        "likes": article.get('likes', 0),
+        "difficulty": article.get('difficulty', 'medium'),
+        "readingTime": article.get('readingTime', 5),
+        "publishedAt": article.get('publishedAt'),
+        "updatedAt": article.get('updatedAt')
+    }
+
+
+def stored_document(view: dict, liked_by: int) -> dict:
+    """Full MongoDB document as written by ArticleModel.create_document"""
+    document = {key: value for key, value in view.items() if key != "id"}
+    document.update({
+        "_id": ObjectId(view["id"]),
+        "author": ObjectId(),
+        "likedBy": [ObjectId() for _ in range(liked_by)],
+        "sources": ["https://en.wikipedia.org/wiki/Quantum_computing"],
+        "createdAt": datetime.utcnow(),
+    })
+    return document
+
+
+def bench(name: str, views: List[dict], field, liked_by: int, repeat: int) -> dict:
+    """Time the legacy and projection pipelines on BSON input"""
+    full_raw = [bson.encode(stored_document(view, liked_by)) for view in views]
+    projected_raw = [bson.encode(view) for view in views]
+    single = len(views) == 1
+
+    def legacy():
+        formatted = [legacy_format_article(bson.decode(raw)) for raw in full_raw]
+        content = run_sync(serialize_response(
+            field=field,
+            response_content=formatted[0] if single else formatted
+        ))
+        return JSONResponse(content).body
+
+    def projection():
+        decoded = [bson.decode(raw) for raw in projected_raw]
+        return ORJSONResponse(decoded[0] if single else decoded).body
+
+    legacy_us = timeit(legacy, repeat)
+    projection_us = timeit(projection, repeat)
+
+    return {
+        "payload": name,
+        "legacy_us": round(legacy_us, 1),
+        "projection_us": round(projection_us, 1),
+        "speedup": round(legacy_us / projection_us, 1),
+        "bson_bytes_legacy": sum(len(raw) for raw in full_raw),
+        "bson_bytes_projection": sum(len(raw) for raw in projected_raw),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--content-chars", type=int, default=20000)
+    parser.add_argument("--feed-size", type=int, default=50)
+    parser.add_argument("--liked-by", type=int, default=200, help="likedBy entries per document")
+    args = parser.parse_args()
+
+    article_field = create_model_field(name="Response", type_=ArticleResponse, mode="serialization")
+    feed_field = create_model_field(name="Response", type_=List[ArticleResponse], mode="serialization")
+
+    feed = [make_article(i, args.content_chars) for i in range(args.feed_size)]
+
+    results = [
+        bench("article", feed[:1], article_field, args.liked_by, args.repeat),
+        bench(f"feed[{args.feed_size}]", feed, feed_field, args.liked_by, max(1, args.repeat // 10)),
+    ]
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
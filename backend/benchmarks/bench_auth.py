@@ -0,0 +1,73 @@
+"""
+Authentication overhead benchmark
+Measures per-request cost of the get_current_user dependency with and
+without the verified-token cache
+
+Usage: python benchmarks/bench_auth.py [--requests 5000] [--tokens 50]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+from bson import ObjectId
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import security
+from app.core.security import create_access_token, get_current_user
+
+
+async def measure(tokens, requests: int) -> float:
+    """Mean microseconds per get_current_user call, cycling through tokens"""
+    credentials = [
+        HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        for token in tokens
+    ]
+
+    start = time.perf_counter()
+    for i in range(requests):
+        await get_current_user(credentials[i % len(credentials)])
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def run(args):
+    tokens = [
+        create_access_token({"sub": str(ObjectId()), "email": f"user{i}@example.com"})
+        for i in range(args.tokens)
+    ]
+
+    security.token_cache.max_size = 0
+    security.token_cache.clear()
+    uncached = await measure(tokens, args.requests)
+
+    security.token_cache.max_size = args.cache_size
+    cached = await measure(tokens, args.requests)
+
+    print(json.dumps({
+        "requests": args.requests,
+        "distinct_tokens": args.tokens,
+        "uncached_us_per_request": round(uncached, 2),
+        "cached_us_per_request": round(cached, 2),
+        "speedup": round(uncached / cached, 1),
+    }, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Authentication overhead benchmark")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--tokens", type=int, default=50)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,692 @@
+"""
+End-to-end endpoint benchmark
+Boots main:app in-process against a local mongod (or mongomock-motor), with
+the fake LLM provider and a fake Wikipedia server, seeds a synthetic corpus
+of each requested size and drives every /api/v1 route at a fixed
+concurrency. Reports per-route p50/p95/p99 latency and throughput as JSON.
+
+Usage:
+    python benchmarks/bench_endpoints.py --mongo-uri mongodb://localhost:27017 --sizes 1000,100000,1000000
+    python benchmarks/bench_endpoints.py --mongo-uri mock --sizes 1000 --output results.json
+
+Every size gets its own database (bench_<size>), dropped before seeding
+unless --reuse is given. mongomock-motor (mock) keeps data in Python and
+scans collections linearly, so it is only practical for the 1k corpus and
+does not support $text search; use a real mongod for the larger ones.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("ADMISSION_CONTROL_ENABLED", "false")
+os.environ.setdefault("DEBUG", "false")
+
+import httpx
+from bson import ObjectId
+
+from benchmarks.fake_wikipedia import start_server as start_fake_wikipedia
+
+from app.core import database
+from app.core.cache import MemoryCacheBackend, get_cache
+from app.core.config import settings
+from app.core.security import create_access_token, hash_password
+from app.models.database import ArticleModel, SavedTopicModel, UserModel
+from app.services.conversation_service import conversation_service
+from app.services.session_service import session_service
+
+CATEGORIES = ["Technology", "Science", "History", "Environment", "Health", "Culture", "Business", "Education"]
+TAGS = [f"tag-{index}" for index in range(500)]
+BENCH_PASSWORD = "benchmark-password"
+
+_WORDS = (
+    "the of and in to a is was for as by on with that from at which it were an are this "
+    "history science energy system theory language culture research network structure "
+    "development century period region government species process model population "
+    "university company design evidence analysis method concept early modern public"
+).split()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile in milliseconds"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return round(ordered[index] * 1000, 2)
+
+
+def zipf_cum_weights(count: int, exponent: float = 1.0) -> List[float]:
+    """Cumulative Zipf weights for ranks 1..count (for random.choices)"""
+    return list(itertools.accumulate(1 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+# ============ Corpus ============
+
+@dataclass
+class Corpus:
+    """Identifiers of the seeded data the request builders draw from"""
+    size: int
+    article_ids: List[ObjectId] = field(default_factory=list)
+    slugs: List[str] = field(default_factory=list)
+    user_ids: List[ObjectId] = field(default_factory=list)
+    article_weights: List[float] = field(default_factory=list)
+
+
+async def seed_corpus(db, size: int, seed: int, content_chars: int, batch_size: int = 5000) -> Corpus:
+    """Bulk-insert `size` articles (Zipf popularity) and size/100 users"""
+    rng = random.Random(seed)
+    corpus = Corpus(size=size)
+
+    # One bcrypt hash shared by every synthetic user
+    password_hash = hash_password(BENCH_PASSWORD)
+    user_count = max(10, size // 100)
+    users = []
+    for index in range(user_count):
+        user = UserModel.create_document(
+            f"user{index}@bench.example", password_hash, f"Bench User {index}",
+            rng.sample(CATEGORIES, 3), rng.choice(["beginner", "intermediate", "advanced"])
+        )
+        user["_id"] = ObjectId()
+        users.append(user)
+    for start in range(0, len(users), batch_size):
+        await db.users.insert_many(users[start:start + batch_size], ordered=False)
+    corpus.user_ids = [user["_id"] for user in users]
+
+    sentences = [
+        " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 24))).capitalize() + "."
+        for _ in range(2000)
+    ]
+    category_weights = zipf_cum_weights(len(CATEGORIES))
+    tag_weights = zipf_cum_weights(len(TAGS), 1.1)
+    now = datetime.utcnow()
+
+    def make_article(rank: int) -> dict:
+        parts = []
+        length = 0
+        while length < content_chars:
+            sentence = rng.choice(sentences)
+            parts.append(sentence)
+            length += len(sentence) + 1
+        content = " ".join(parts)
+        title = f"Synthetic Article {rank}"
+
+        article = ArticleModel.create_document(
+            title=title,
+            slug=f"synthetic-article-{rank}",
+            content=content,
+            summary=" ".join(parts[:2]),
+            author_id=str(rng.choice(corpus.user_ids)),
+            category=rng.choices(CATEGORIES, cum_weights=category_weights)[0],
+            tags=list(set(rng.choices(TAGS, cum_weights=tag_weights, k=3))),
+            difficulty=rng.choice(["easy", "medium", "hard"])
+        )
+        created = now - timedelta(minutes=rng.randint(0, 525600))
+        article["_id"] = ObjectId()
+        article["views"] = int(1_000_000 / rank)
+        article["likes"] = int(article["views"] / 20)
+        article["publishedAt"] = article["createdAt"] = article["updatedAt"] = created
+        return article
+
+    # Build the next batch while up to 4 inserts are in flight (Motor runs them on threads)
+    pending: List[asyncio.Task] = []
+    for start in range(1, size + 1, batch_size):
+        batch = [make_article(rank) for rank in range(start, min(size, start + batch_size - 1) + 1)]
+        corpus.article_ids.extend(article["_id"] for article in batch)
+        corpus.slugs.extend(article["slug"] for article in batch)
+        pending.append(asyncio.create_task(db.articles.insert_many(batch, ordered=False)))
+        if len(pending) >= 4:
+            await pending.pop(0)
+    await asyncio.gather(*pending)
+
+    corpus.article_weights = zipf_cum_weights(len(corpus.article_ids))
+    return corpus
+
+
+# ============ Routes ============
+
+@dataclass
+class Context:
+    """Shared state for building requests"""
+    db: object
+    corpus: Corpus
+    rng: random.Random
+    user_id: str
+    email: str
+    token: str
+    run_id: str
+    batches: Iterator[int] = field(default_factory=itertools.count)
+
+    @property
+    def auth(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    def articles(self, count: int) -> List[str]:
+        """Article IDs drawn by Zipf popularity"""
+        ids = self.rng.choices(self.corpus.article_ids, cum_weights=self.corpus.article_weights, k=count)
+        return [str(article_id) for article_id in ids]
+
+    def distinct_articles(self, count: int) -> List[str]:
+        """Distinct article IDs (for routes with one-per-article semantics)"""
+        return [str(article_id) for article_id in self.rng.sample(self.corpus.article_ids, min(count, self.corpus.size))]
+
+    async def disposable_articles(self, count: int) -> List[str]:
+        """Articles created only to be updated or deleted by the benchmark"""
+        prefix = f"{self.run_id}-{next(self.batches)}"
+        documents = [
+            ArticleModel.create_document(
+                f"Disposable {prefix} {index}", f"disposable-{prefix}-{index}",
+                "Disposable benchmark article content. " * 20, "Disposable.", self.user_id, "Science"
+            )
+            for index in range(count)
+        ]
+        result = await self.db.articles.insert_many(documents)
+        return [str(article_id) for article_id in result.inserted_ids]
+
+    async def disposable_users(self, count: int) -> List[dict]:
+        """Users with an access and refresh token each"""
+        password_hash = hash_password(BENCH_PASSWORD)
+        prefix = f"{self.run_id}-{next(self.batches)}"
+        documents = [
+            UserModel.create_document(f"disposable-{prefix}-{index}@bench.example", password_hash, "Disposable")
+            for index in range(count)
+        ]
+        result = await self.db.users.insert_many(documents)
+        users = []
+        for user_id, document in zip(result.inserted_ids, documents):
+            users.append({
+                "id": str(user_id),
+                "token": create_access_token({"sub": str(user_id), "email": document["email"]}),
+                "refresh_token": await session_service.create_session(str(user_id), document["email"])
+            })
+        return users
+
+    async def conversation(self, messages: int = 0) -> str:
+        """A conversation of the benchmark user with `messages` stored messages"""
+        conversation_id = await conversation_service.create_conversation(self.user_id, title="Benchmark")
+        for start in range(0, messages, 2):
+            await conversation_service.append_messages(conversation_id, self.user_id, [
+                ("user", f"Question {start}?"),
+                ("assistant", f"Answer {start}. " * 10)
+            ])
+        return conversation_id
+
+    async def saves(self, count: int) -> List[tuple]:
+        """(saved topic ID, article ID) pairs saved by the benchmark user"""
+        article_ids = [ObjectId(article_id) for article_id in self.distinct_articles(count)]
+        await self.db.saved_topics.delete_many({"userId": ObjectId(self.user_id), "articleId": {"$in": article_ids}})
+        documents = [SavedTopicModel.create_document(self.user_id, str(article_id)) for article_id in article_ids]
+        result = await self.db.saved_topics.insert_many(documents)
+        return [(str(saved_id), str(article_id)) for saved_id, article_id in zip(result.inserted_ids, article_ids)]
+
+
+RequestSpec = Dict[str, object]
+Builder = Callable[[Context, int], Awaitable[List[RequestSpec]]]
+
+
+@dataclass
+class Route:
+    name: str
+    build: Builder
+    max_requests: Optional[int] = None  # cap for intrinsically slow routes (bcrypt)
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(_WORDS[20:]) for _ in range(count))
+
+
+def simple(method: str, path: str, auth: bool = False, **kwargs) -> Builder:
+    """Same request every time"""
+    async def build(ctx: Context, n: int) -> List[RequestSpec]:
+        headers = ctx.auth if auth else {}
+        return [dict(method=method, url=path, headers=headers, **kwargs) for _ in range(n)]
+    return build
+
+
+def per_article(method: str, path: str, auth: bool = False, distinct: bool = False, **kwargs) -> Builder:
+    """`path` formatted with a Zipf-distributed (or distinct) article ID"""
+    async def build(ctx: Context, n: int) -> List[RequestSpec]:
+        ids = ctx.distinct_articles(n) if distinct else ctx.articles(n)
+        headers = ctx.auth if auth else {}
+        return [dict(method=method, url=path.format(id=article_id), headers=headers, **kwargs) for article_id in ids]
+    return build
+
+
+async def build_login(ctx, n):
+    return [
+        dict(method="POST", url="/api/v1/auth/login", json={"email": ctx.email, "password": BENCH_PASSWORD})
+        for _ in range(n)
+    ]
+
+
+async def build_verify(ctx, n):
+    return [dict(method="POST", url="/api/v1/auth/verify", params={"token": ctx.token}) for _ in range(n)]
+
+
+async def build_register(ctx, n):
+    return [
+        dict(method="POST", url="/api/v1/auth/register", json={
+            "email": f"register-{ctx.run_id}-{index}@bench.example",
+            "password": BENCH_PASSWORD,
+            "name": "Bench Register"
+        })
+        for index in range(n)
+    ]
+
+
+async def build_refresh(ctx, n):
+    users = await ctx.disposable_users(n)
+    return [dict(method="POST", url="/api/v1/auth/refresh", json={"refresh_token": user["refresh_token"]}) for user in users]
+
+
+async def build_logout(ctx, n):
+    users = await ctx.disposable_users(n)
+    return [
+        dict(method="POST", url="/api/v1/auth/logout", headers={"Authorization": f"Bearer {user['token']}"},
+             json={"refresh_token": user["refresh_token"]})
+        for user in users
+    ]
+
+
+async def build_delete_me(ctx, n):
+    users = await ctx.disposable_users(n)
+    return [dict(method="DELETE", url="/api/v1/users/me", headers={"Authorization": f"Bearer {user['token']}"}) for user in users]
+
+
+async def build_user_by_id(ctx, n):
+    ids = ctx.rng.choices(ctx.corpus.user_ids, k=n)
+    return [dict(method="GET", url=f"/api/v1/users/{user_id}") for user_id in ids]
+
+
+async def build_update_me(ctx, n):
+    return [dict(method="PUT", url="/api/v1/users/me", headers=ctx.auth, json={"bio": f"Bio {index}"}) for index in range(n)]
+
+
+async def build_create_article(ctx, n):
+    return [
+        dict(method="POST", url="/api/v1/articles/", headers=ctx.auth, json={
+            "title": f"Created {ctx.run_id} {index}",
+            "content": " ".join(f"{_words(ctx.rng, 14).capitalize()}." for _ in range(20)),
+            "category": ctx.rng.choice(CATEGORIES),
+            "tags": ctx.rng.sample(TAGS[:20], 2)
+        })
+        for index in range(n)
+    ]
+
+
+async def build_search(ctx, n):
+    return [
+        dict(method="GET", url="/api/v1/articles/search", params={"query": _words(ctx.rng, 2), "limit": 10})
+        for _ in range(n)
+    ]
+
+
+async def build_category(ctx, n):
+    return [dict(method="GET", url=f"/api/v1/articles/category/{ctx.rng.choice(CATEGORIES)}") for _ in range(n)]
+
+
+async def build_slug(ctx, n):
+    indexes = ctx.rng.choices(range(ctx.corpus.size), cum_weights=ctx.corpus.article_weights, k=n)
+    return [dict(method="GET", url=f"/api/v1/articles/slug/{ctx.corpus.slugs[index]}") for index in indexes]
+
+
+async def build_update_article(ctx, n):
+    ids = await ctx.disposable_articles(n)
+    return [
+        dict(method="PUT", url=f"/api/v1/articles/{article_id}", headers=ctx.auth,
+             json={"content": f"Updated benchmark content number {index}. " * 20})
+        for index, article_id in enumerate(ids)
+    ]
+
+
+async def build_delete_article(ctx, n):
+    ids = await ctx.disposable_articles(n)
+    return [dict(method="DELETE", url=f"/api/v1/articles/{article_id}", headers=ctx.auth) for article_id in ids]
+
+
+async def build_wikipedia_search(ctx, n):
+    return [dict(method="GET", url="/api/v1/articles/wikipedia/search", params={"query": _words(ctx.rng, 2)}) for _ in range(n)]
+
+
+async def build_wikipedia_import(ctx, n):
+    return [
+        dict(method="POST", url="/api/v1/articles/wikipedia/import", headers=ctx.auth,
+             params={"title": f"Imported {ctx.run_id} {index}"})
+        for index in range(n)
+    ]
+
+
+async def build_summarize(ctx, n):
+    return [
+        dict(method="POST", url="/api/v1/ai/summarize", json={
+            "content": " ".join(f"{_words(ctx.rng, 12).capitalize()}." for _ in range(10)),
+            "style": ctx.rng.choice(["concise", "eli5", "bullet_points", "emoji", "fast"])
+        })
+        for _ in range(n)
+    ]
+
+
+async def build_key_facts(ctx, n):
+    return [
+        dict(method="POST", url="/api/v1/ai/summarize/key-facts",
+             params={"content": " ".join(f"{_words(ctx.rng, 12).capitalize()}." for _ in range(6)), "count": 5})
+        for _ in range(n)
+    ]
+
+
+async def build_chat(ctx, n):
+    conversation_ids = [await ctx.conversation() for _ in range(8)]
+    ids = ctx.articles(n)
+    return [
+        dict(method="POST", url="/api/v1/ai/chat", headers=ctx.auth, json={
+            "message": f"Tell me about the {_words(ctx.rng, 2)} of this topic",
+            "articleId": article_id,
+            "conversationId": conversation_ids[index % len(conversation_ids)]
+        })
+        for index, article_id in enumerate(ids)
+    ]
+
+
+async def build_messages(ctx, n):
+    conversation_id = await ctx.conversation(messages=200)
+    return [
+        dict(method="GET", url=f"/api/v1/ai/conversations/{conversation_id}/messages", headers=ctx.auth,
+             params={"limit": 50})
+        for _ in range(n)
+    ]
+
+
+async def build_article_question(ctx, n):
+    return [
+        dict(method="POST", url="/api/v1/ai/chat/article-question", headers=ctx.auth,
+             params={"article_id": article_id, "question": f"What is the {_words(ctx.rng, 2)}?"})
+        for article_id in ctx.articles(n)
+    ]
+
+
+async def build_follow_up(ctx, n):
+    return [
+        dict(method="GET", url="/api/v1/ai/chat/follow-up-questions", params={"article_id": article_id})
+        for article_id in ctx.articles(n)
+    ]
+
+
+async def build_personalize(ctx, n):
+    return [
+        dict(method="POST", url="/api/v1/ai/personalize", headers=ctx.auth, json={
+            "content": " ".join(f"{_words(ctx.rng, 12).capitalize()}." for _ in range(6)),
+            "userInterests": ctx.rng.sample(CATEGORIES, 2),
+            "userLevel": ctx.rng.choice(["beginner", "intermediate", "advanced"])
+        })
+        for _ in range(n)
+    ]
+
+
+async def build_topics(ctx, n):
+    return [dict(method="GET", url="/api/v1/ai/topic-suggestions", params={"query": _words(ctx.rng, 2)}) for _ in range(n)]
+
+
+async def build_explain(ctx, n):
+    return [dict(method="GET", url=f"/api/v1/ai/explain/{_words(ctx.rng, 1)}") for _ in range(n)]
+
+
+async def build_save(ctx, n):
+    return [
+        dict(method="POST", url="/api/v1/saved/", headers=ctx.auth, json={"articleId": article_id})
+        for article_id in ctx.distinct_articles(n)
+    ]
+
+
+async def build_unsave(ctx, n):
+    saved = await ctx.saves(n)
+    return [dict(method="DELETE", url=f"/api/v1/saved/{saved_id}", headers=ctx.auth) for saved_id, _ in saved]
+
+
+async def build_unsave_article(ctx, n):
+    saved = await ctx.saves(n)
+    return [dict(method="DELETE", url=f"/api/v1/saved/article/{article_id}", headers=ctx.auth) for _, article_id in saved]
+
+
+ROUTES: List[Route] = [
+    # Auth
+    Route("POST /auth/register", build_register, max_requests=50),
+    Route("POST /auth/login", build_login, max_requests=50),
+    Route("POST /auth/refresh", build_refresh),
+    Route("POST /auth/logout", build_logout),
+    Route("POST /auth/verify", build_verify),
+    # Users
+    Route("GET /users/me", simple("GET", "/api/v1/users/me", auth=True)),
+    Route("GET /users/{id}", build_user_by_id),
+    Route("PUT /users/me", build_update_me),
+    # Articles
+    Route("POST /articles/", build_create_article),
+    Route("GET /articles/search", build_search),
+    Route("GET /articles/trending", simple("GET", "/api/v1/articles/trending")),
+    Route("GET /articles/category/{category}", build_category),
+    Route("GET /articles/{id}", per_article("GET", "/api/v1/articles/{id}")),
+    Route("GET /articles/slug/{slug}", build_slug),
+    Route("GET /articles/{id}/related", per_article("GET", "/api/v1/articles/{id}/related")),
+    Route("PUT /articles/{id}", build_update_article),
+    Route("POST /articles/{id}/like", per_article("POST", "/api/v1/articles/{id}/like", auth=True)),
+    Route("DELETE /articles/{id}", build_delete_article),
+    Route("GET /articles/wikipedia/search", build_wikipedia_search),
+    Route("POST /articles/wikipedia/import", build_wikipedia_import),
+    # AI
+    Route("POST /ai/summarize", build_summarize),
+    Route("POST /ai/summarize/key-facts", build_key_facts),
+    Route("GET /ai/articles/{id}/summary", per_article("GET", "/api/v1/ai/articles/{id}/summary")),
+    Route("GET /ai/articles/{id}/key-facts", per_article("GET", "/api/v1/ai/articles/{id}/key-facts")),
+    Route("POST /ai/chat", build_chat),
+    Route("GET /ai/conversations", simple("GET", "/api/v1/ai/conversations", auth=True)),
+    Route("GET /ai/conversations/{id}/messages", build_messages),
+    Route("POST /ai/chat/article-question", build_article_question),
+    Route("GET /ai/chat/follow-up-questions", build_follow_up),
+    Route("POST /ai/personalize", build_personalize),
+    Route("GET /ai/recommendations", simple("GET", "/api/v1/ai/recommendations", auth=True)),
+    Route("GET /ai/topic-suggestions", build_topics),
+    Route("GET /ai/explain/{concept}", build_explain),
+    # Saved topics
+    Route("POST /saved/", build_save),
+    Route("GET /saved/", simple("GET", "/api/v1/saved/", auth=True)),
+    Route("DELETE /saved/{id}", build_unsave),
+    Route("DELETE /saved/article/{id}", build_unsave_article),
+    Route("GET /saved/check/{id}", per_article("GET", "/api/v1/saved/check/{id}", auth=True)),
+    # Last: deletes users
+    Route("DELETE /users/me", build_delete_me),
+]
+
+
+# ============ Runner ============
+
+async def drive(client: httpx.AsyncClient, requests: List[RequestSpec], concurrency: int) -> dict:
+    """Send `requests` with `concurrency` in flight; latency and status statistics"""
+    queue = iter(requests)
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+
+    async def worker():
+        for spec in queue:
+            start = time.perf_counter()
+            try:
+                response = await client.request(**spec)
+                status = response.status_code
+            except Exception:
+                status = 0
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    errors = sum(count for status, count in statuses.items() if status == 0 or status >= 500)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2) if latencies else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+async def run_size(app, size: int, args) -> dict:
+    settings.DATABASE_NAME = f"{args.database_prefix}_{size}"
+    # Fresh in-process cache for every corpus
+    get_cache().backend = MemoryCacheBackend(settings.CACHE_MEMORY_MAX_ENTRIES)
+
+    async with app.router.lifespan_context(app):
+        db = database.get_database()
+
+        started = time.perf_counter()
+        if args.reuse and await db.articles.estimated_document_count() >= size:
+            corpus = Corpus(size=size)
+            async for article in db.articles.find({"slug": {"$regex": "^synthetic-article-"}}, {"slug": 1}).sort("views", -1):
+                corpus.article_ids.append(article["_id"])
+                corpus.slugs.append(article["slug"])
+            corpus.user_ids = [user["_id"] async for user in db.users.find({"email": {"$regex": "^user"}}, {"_id": 1})]
+            corpus.article_weights = zipf_cum_weights(len(corpus.article_ids))
+            corpus.size = len(corpus.article_ids)
+        else:
+            await database.db.client.drop_database(settings.DATABASE_NAME)
+            await database.create_indexes()
+            corpus = await seed_corpus(db, size, args.seed, args.content_chars)
+        seed_seconds = round(time.perf_counter() - started, 1)
+
+        user_id = corpus.user_ids[0]
+        user = await db.users.find_one({"_id": user_id}, {"email": 1})
+        ctx = Context(
+            db=db,
+            corpus=corpus,
+            rng=random.Random(args.seed),
+            user_id=str(user_id),
+            email=user["email"],
+            token=create_access_token({"sub": str(user_id), "email": user["email"]}, timedelta(hours=12)),
+            run_id=f"{size}-{int(time.time())}"
+        )
+
+        transport = httpx.ASGITransport(app=app)
+        routes = []
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            for route in ROUTES:
+                if args.routes and not any(pattern in route.name for pattern in args.routes):
+                    continue
+                count = min(args.requests, route.max_requests or args.requests)
+                requests = await route.build(ctx, count)
+                result = await drive(client, requests, args.concurrency)
+                result["route"] = route.name
+                routes.append(result)
+                print(
+                    f"  {route.name:42} p50 {result['p50_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms  "
+                    f"{result['throughput_rps']:8.1f} req/s  errors {result['errors']}",
+                    file=sys.stderr
+                )
+
+        if not args.keep:
+            await database.db.client.drop_database(settings.DATABASE_NAME)
+
+    return {"size": size, "seed_seconds": seed_seconds, "routes": routes}
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+async def run(args) -> dict:
+    if args.mongo_uri == "mock":
+        from mongomock_motor import AsyncMongoMockClient
+
+        database.AsyncIOMotorClient = AsyncMongoMockClient
+    else:
+        settings.MONGODB_URI = args.mongo_uri
+
+    wikipedia_runner, settings.WIKIPEDIA_API_URL = await start_fake_wikipedia(latency_ms=args.wikipedia_latency_ms)
+    settings.FAKE_LLM = dict(
+        settings.FAKE_LLM,
+        latency_ms=args.llm_latency_ms,
+        tokens_per_second=args.llm_tokens_per_second,
+        seed=args.seed
+    )
+
+    from main import app
+
+    # The app logs to stdout, which carries the JSON report
+    logging.getLogger().setLevel(args.log_level)
+
+    results = []
+    try:
+        for size in args.sizes:
+            print(f"Corpus of {size} articles", file=sys.stderr)
+            results.append(await run_size(app, size, args))
+    finally:
+        await wikipedia_runner.cleanup()
+
+    return {
+        "benchmark": "endpoints",
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "mongo": "mongomock" if args.mongo_uri == "mock" else "mongod",
+        "concurrency": args.concurrency,
+        "requests_per_route": args.requests,
+        "llm_latency_ms": args.llm_latency_ms,
+        "llm_tokens_per_second": args.llm_tokens_per_second,
+        "wikipedia_latency_ms": args.wikipedia_latency_ms,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017", help='MongoDB URI, or "mock" for mongomock-motor')
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")], default=[1000])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route")
+    parser.add_argument("--routes", nargs="*", help="Only routes whose name contains one of these")
+    parser.add_argument("--content-chars", type=int, default=2000)
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--llm-tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--wikipedia-latency-ms", type=float, default=80.0)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--database-prefix", default="bench")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reuse", action="store_true", help="Reuse an already seeded database")
+    parser.add_argument("--keep", action="store_true", help="Keep the database after the run")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output)
+
+
+if __name__ == "__main__":
+    main()
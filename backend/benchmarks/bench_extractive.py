@@ -0,0 +1,84 @@
+"""
+Extractive summarizer microbenchmark
+Times the local summarizer (sentence splitting, TF-IDF, TextRank / centroid
+scoring, selection) on Wikipedia-shaped text of increasing size
+
+Usage: python benchmarks/bench_extractive.py [--repeat 50]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+from app.ai_modules.extractive import TEXTRANK_MAX_SENTENCES, extractive_summarizer, split_sentences
+
+
+def make_text(chars: int, seed: int = 0) -> str:
+    """Sections of paragraphs of random sentences over a Zipf-like vocabulary"""
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 10)))
+        for _ in range(5000)
+    ]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+    def sentence() -> str:
+        words = rng.choices(vocabulary, weights, k=rng.randint(6, 30))
+        return " ".join(words).capitalize() + rng.choice(".....!?")
+
+    blocks = []
+    length = 0
+    while length < chars:
+        if blocks and rng.random() < 0.1:
+            block = f"== {sentence()[:-1].title()} =="
+        else:
+            block = " ".join(sentence() for _ in range(rng.randint(2, 7)))
+        blocks.append(block)
+        length += len(block) + 2
+
+    return "\n\n".join(blocks)[:chars]
+
+
+def timeit(fn, repeat: int) -> float:
+    """Return mean milliseconds per call"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--max-length", type=int, default=300)
+    args = parser.parse_args()
+
+    results = []
+    for chars in (2_000, 5_000, 20_000, 50_000, 100_000):
+        text = make_text(chars)
+        sentences = len(split_sentences(text))
+        results.append({
+            "chars": chars,
+            "sentences": sentences,
+            "scoring": "textrank" if sentences <= TEXTRANK_MAX_SENTENCES else "centroid",
+            "split_ms": round(timeit(lambda: split_sentences(text), args.repeat), 2),
+            "summarize_ms": round(
+                timeit(lambda: extractive_summarizer.summarize(text, args.max_length), args.repeat), 2
+            ),
+        })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Serialization microbenchmark
+Compares the default FastAPI JSON path with orjson, and bytes on the wire
+with and without gzip/brotli, for the article and feed endpoints
+
+Usage: python benchmarks/bench_serialization.py [--repeat 200]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.config import settings
+from app.core.responses import ORJSONResponse
+from app.models.schemas import ArticleResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+PARAGRAPH = (
+    "Quantum computing represents a revolutionary shift in how we process information. "
+    "Unlike classical computers that use bits, quantum computers use qubits that can exist "
+    "in multiple states simultaneously through a phenomenon called superposition. "
+)
+
+
+def make_article(index: int, content_chars: int) -> dict:
+    """Build an article dict shaped like ArticleService._format_article output"""
+    now = datetime.utcnow() - timedelta(minutes=index)
+    # Shuffled words compress closer to real prose than a repeated paragraph
+    rng = random.Random(index)
+    words = PARAGRAPH.split()
+    content = " ".join(rng.choice(words) for _ in range(content_chars // 6))[:content_chars]
+    return {
+        "id": str(ObjectId()),
+        "title": f"Benchmark Article {index}",
+        "slug": f"benchmark-article-{index}",
+        "content": content,
+        "summary": content[:300],
+        "category": "Technology",
+        "tags": ["quantum computing", "technology", "science"],
+        "imageUrl": None,
+        "views": index * 17,
+        "likes": index * 3,
+        "difficulty": "medium",
+        "readingTime": max(1, len(content.split()) // 200),
+        "publishedAt": now,
+        "updatedAt": now
+    }
+
+
+def run_sync(coro):
+    """Drive a coroutine that never actually suspends (avoids event loop overhead)"""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended")
+
+
+def timeit(fn, repeat: int) -> float:
+    """Return mean microseconds per call"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def bench_payload(name: str, payload, field, repeat: int) -> dict:
+    """Time both serialization paths and measure encoded sizes"""
+
+    def default_path():
+        content = run_sync(serialize_response(field=field, response_content=payload))
+        return JSONResponse(content).body
+
+    def orjson_path():
+        content = run_sync(serialize_response(field=field, response_content=payload))
+        return ORJSONResponse(content).body
+
+    def orjson_direct():
+        return ORJSONResponse(payload).body
+
+    body = orjson_direct()
+    result = {
+        "payload": name,
+        "default_json_us": round(timeit(default_path, repeat), 1),
+        "orjson_validated_us": round(timeit(orjson_path, repeat), 1),
+        "orjson_direct_us": round(timeit(orjson_direct, repeat), 1),
+        "bytes_identity": len(default_path()),
+        "bytes_orjson": len(body),
+        "bytes_gzip": len(gzip.compress(body, settings.COMPRESSION_GZIP_LEVEL)),
+    }
+    if brotli is not None:
+        result["bytes_brotli"] = len(brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY))
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--content-chars", type=int, default=20000)
+    parser.add_argument("--feed-size", type=int, default=50)
+    args = parser.parse_args()
+
+    article = make_article(0, args.content_chars)
+    feed = [make_article(i, args.content_chars) for i in range(args.feed_size)]
+
+    article_field = create_model_field(name="Response", type_=ArticleResponse, mode="serialization")
+    feed_field = create_model_field(name="Response", type_=List[ArticleResponse], mode="serialization")
+
+    results = [
+        bench_payload("article", article, article_field, args.repeat),
+        bench_payload(f"feed[{args.feed_size}]", feed, feed_field, max(1, args.repeat // 10)),
+    ]
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Fake Wikipedia API server
+Answers the MediaWiki `action=query` calls WikipediaService makes (search,
+full extracts with categories, intro extracts) with deterministic synthetic
+pages, after a configurable delay, so Wikipedia routes can be benchmarked
+offline
+
+Usage:
+    python benchmarks/fake_wikipedia.py --port 8081 --latency-ms 80
+    WIKIPEDIA_API_URL=http://127.0.0.1:8081/w/api.php uvicorn main:app
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+from typing import Optional
+
+from aiohttp import web
+
+API_PATH = "/w/api.php"
+
+CATEGORIES = ["Science", "Technology", "History", "Environment", "Health", "Business", "Arts", "Education"]
+
+_WORDS = (
+    "the of and in to a is was for as by on with that from at which it were an are this "
+    "history science energy system theory language culture research network structure "
+    "development century period region government species process model population "
+    "university company design evidence analysis method concept early modern public"
+).split()
+
+
+def page_id(title: str) -> int:
+    return int.from_bytes(hashlib.sha256(title.encode("utf-8")).digest()[:4], "big")
+
+
+def make_extract(title: str, sections: int = 6, intro_only: bool = False, sentences: Optional[int] = None) -> str:
+    """Deterministic Wikipedia-style plaintext extract for `title`"""
+    rng = random.Random(page_id(title))
+
+    def sentence() -> str:
+        words = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 24)))
+        return words.capitalize() + "."
+
+    intro = f"{title} is " + " ".join(sentence() for _ in range(4))
+    if sentences:
+        return " ".join(intro.split(". ")[:sentences]).rstrip(".") + "."
+    if intro_only:
+        return intro
+
+    parts = [intro]
+    for _ in range(sections):
+        heading = " ".join(rng.choice(_WORDS) for _ in range(2)).title()
+        paragraphs = ["\n" + " ".join(sentence() for _ in range(rng.randint(3, 7))) for _ in range(rng.randint(1, 3))]
+        parts.append(f"\n\n== {heading} ==" + "".join(paragraphs))
+
+    return "".join(parts)
+
+
+def make_page(title: str, query: dict) -> dict:
+    page = {"pageid": page_id(title), "ns": 0, "title": title}
+    props = query.get("prop", "").split("|")
+
+    if "extracts" in props:
+        sentences = int(query["exsentences"]) if query.get("exsentences") else None
+        page["extract"] = make_extract(title, intro_only="exintro" in query, sentences=sentences)
+    if "categories" in props:
+        rng = random.Random(page_id(title))
+        page["categories"] = [
+            {"ns": 14, "title": f"Category:{category}"}
+            for category in rng.sample(CATEGORIES, 2)
+        ]
+    if "pageimages" in props:
+        page["original"] = {"source": f"https://upload.example.org/{page['pageid']}.jpg"}
+    if "info" in props:
+        page["fullurl"] = f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"
+
+    return page
+
+
+def create_app(latency_ms: float = 0.0, missing_rate: float = 0.0, error_rate: float = 0.0, seed: int = 0) -> web.Application:
+    """aiohttp app serving the fake API at /w/api.php"""
+    rng = random.Random(seed)
+
+    async def api(request: web.Request) -> web.Response:
+        query = dict(request.query)
+
+        if latency_ms:
+            # Exponential delay around the configured mean
+            await asyncio.sleep(rng.expovariate(1000 / latency_ms))
+        if error_rate and rng.random() < error_rate:
+            return web.json_response({"error": "injected"}, status=503)
+
+        if query.get("list") == "search":
+            term = query.get("srsearch", "")
+            limit = int(query.get("srlimit", 10))
+            results = [
+                {
+                    "ns": 0,
+                    "title": f"{term.title()} {suffix}".strip(),
+                    "pageid": page_id(f"{term} {suffix}"),
+                    "snippet": f"<span class=\"searchmatch\">{term}</span> " + make_extract(f"{term} {suffix}", sentences=1)
+                }
+                for suffix in ["", "history", "theory", "in culture", "research", "overview",
+                               "timeline", "science", "society", "technology"][:limit]
+            ]
+            return web.json_response({"batchcomplete": "", "query": {"search": results}})
+
+        title = query.get("titles", "")
+        if not title or (missing_rate and rng.random() < missing_rate):
+            pages = {"-1": {"ns": 0, "title": title, "missing": ""}}
+        else:
+            page = make_page(title, query)
+            pages = {str(page["pageid"]): page}
+
+        return web.json_response({"batchcomplete": "", "query": {"pages": pages}})
+
+    app = web.Application()
+    app.router.add_get(API_PATH, api)
+    return app
+
+
+async def start_server(host: str = "127.0.0.1", port: int = 0, **options) -> tuple:
+    """Start the fake server in the running loop; returns (runner, api_url)"""
+    runner = web.AppRunner(create_app(**options), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}{API_PATH}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--missing-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    app = create_app(args.latency_ms, args.missing_rate, args.error_rate, args.seed)
+    web.run_app(app, host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
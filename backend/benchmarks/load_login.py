@@ -0,0 +1,115 @@
+"""
+Login burst load test
+Fires concurrent logins at a running server while probing another endpoint,
+and reports probe latency before and during the burst. With bcrypt on the
+password executor the probe latency should stay flat.
+
+Usage:
+    uvicorn main:app --port 8000
+    python benchmarks/load_login.py --base-url http://localhost:8000 --logins 100
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from typing import List
+
+import httpx
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile in milliseconds"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return round(ordered[index] * 1000, 2)
+
+
+def summarize(samples: List[float]) -> dict:
+    return {
+        "count": len(samples),
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "p99_ms": percentile(samples, 99),
+        "max_ms": round(max(samples) * 1000, 2) if samples else 0.0,
+        "mean_ms": round(statistics.mean(samples) * 1000, 2) if samples else 0.0,
+    }
+
+
+async def probe(client: httpx.AsyncClient, path: str, stop: asyncio.Event, interval: float) -> List[float]:
+    """Hit `path` repeatedly until stopped, recording latencies"""
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(path)
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def run(args):
+    email = args.email or f"loadtest-{uuid.uuid4().hex[:8]}@example.com"
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120) as client:
+        if not args.email:
+            response = await client.post("/api/v1/auth/register", json={
+                "email": email,
+                "password": args.password,
+                "name": "Load Test"
+            })
+            response.raise_for_status()
+
+        # Baseline probe latency
+        stop = asyncio.Event()
+        baseline_task = asyncio.create_task(probe(client, args.probe_path, stop, args.probe_interval))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        baseline = await baseline_task
+
+        # Probe while the login burst runs
+        stop = asyncio.Event()
+        burst_probe = asyncio.create_task(probe(client, args.probe_path, stop, args.probe_interval))
+
+        async def login():
+            start = time.perf_counter()
+            response = await client.post("/api/v1/auth/login", json={
+                "email": email,
+                "password": args.password
+            })
+            return response.status_code, time.perf_counter() - start
+
+        burst_start = time.perf_counter()
+        logins = await asyncio.gather(*[login() for _ in range(args.logins)])
+        burst_seconds = time.perf_counter() - burst_start
+        stop.set()
+        during = await burst_probe
+
+    print(json.dumps({
+        "logins": args.logins,
+        "login_failures": sum(1 for status_code, _ in logins if status_code != 200),
+        "burst_seconds": round(burst_seconds, 2),
+        "login_latency": summarize([elapsed for _, elapsed in logins]),
+        "probe_path": args.probe_path,
+        "probe_baseline": summarize(baseline),
+        "probe_during_burst": summarize(during),
+    }, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login burst load test")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--email", help="Existing account to log in with (default: register a new one)")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--probe-path", default="/health")
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    parser.add_argument("--baseline-seconds", type=float, default=2.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Cold-start benchmark
+Measures how long the API takes to become useful after a (re)deploy:
+
+- import time of `main` (python -X importtime), with the slowest modules
+- time from process start until uvicorn answers GET /health with 200
+  (needs MongoDB at MONGODB_URI: startup pings it)
+
+Each measurement runs in a fresh interpreter; the median of --runs is
+reported.
+
+Usage: python benchmarks/startup.py [--runs 5] [--top 15] [--skip-serve]
+       [--create-indexes | --no-create-indexes]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+def _env(args) -> dict:
+    env = dict(os.environ)
+    env.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+    env.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+    if args.create_indexes is not None:
+        env["CREATE_INDEXES_ON_STARTUP"] = str(args.create_indexes)
+    return env
+
+
+def import_times(env: dict, module: str = "main"):
+    """(total seconds, {module: (self us, cumulative us)}) for importing `module`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules[module][1] / 1e6, modules
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_200(env: dict, timeout: float = 60.0) -> float:
+    """Seconds from spawning uvicorn until GET /health returns 200"""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {process.returncode}:\n{process.stderr.read()[-2000:]}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                pass
+            time.sleep(0.01)
+        raise TimeoutError(f"No 200 from {url} within {timeout}s")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per measurement")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--skip-serve", action="store_true", help="Only measure imports (no MongoDB needed)")
+    parser.add_argument("--create-indexes", dest="create_indexes", action="store_true", default=None,
+                        help="Force CREATE_INDEXES_ON_STARTUP=True")
+    parser.add_argument("--no-create-indexes", dest="create_indexes", action="store_false",
+                        help="Force CREATE_INDEXES_ON_STARTUP=False")
+    args = parser.parse_args()
+    env = _env(args)
+
+    totals, runs = [], []
+    for _ in range(args.runs):
+        total, modules = import_times(env)
+        totals.append(total)
+        runs.append(modules)
+
+    # Slowest modules of the median run: cumulative time of application
+    # modules and of the heaviest third-party packages (top-level names)
+    modules = runs[totals.index(sorted(totals)[len(totals) // 2])]
+    slowest = sorted(
+        ((name, cumulative) for name, (_, cumulative) in modules.items()
+         if name.startswith("app.") or "." not in name),
+        key=lambda item: item[1], reverse=True
+    )
+    report = {
+        "import_main_seconds": round(statistics.median(totals), 3),
+        "slowest_imports_ms": {name: round(cumulative / 1000, 1) for name, cumulative in slowest[:args.top + 1] if name != "main"},
+    }
+
+    # What the lazy Gemini import keeps off the startup path
+    try:
+        report["deferred_google_generativeai_seconds"] = round(import_times(env, "google.generativeai")[0], 3)
+    except RuntimeError:
+        report["deferred_google_generativeai_seconds"] = None
+
+    if not args.skip_serve:
+        first_200 = [time_to_first_200(env) for _ in range(args.runs)]
+        report["time_to_first_200_seconds"] = {
+            "median": round(statistics.median(first_200), 3),
+            "min": round(min(first_200), 3),
+            "max": round(max(first_200), 3),
+        }
+        report["create_indexes_on_startup"] = env.get("CREATE_INDEXES_ON_STARTUP", "default")
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,28 @@ Main FastAPI Application Entry Point
 Gen Z Wikipedia - Backend Server
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import logging
 import sys
 
 from app.core.config import settings
-from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.database import connect_to_mongo, close_mongo_connection, schedule_index_creation
+from app.core.cache import connect_to_cache, close_cache_connection
+from app.core.tasks import cancel_background_tasks
+from app.core.resilience import breaker_states
+from app.services.wikipedia_service import wikipedia_service
+from app.core.http_cache import HTTPCacheMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.query_tracking import QueryTrackingMiddleware
+from app.core.tracing import TracingMiddleware, start_tracing, shutdown_tracing
+from app.core.profiling import ProfilingMiddleware
+from app.core.loop_monitor import start_loop_monitor, stop_loop_monitor, loop_monitor_state
+from app.core.memory import start_memory_sampler
+from app.core.warmup import start_warmup, warmup_state, is_ready
+from app.core.responses import ORJSONResponse
 from app.api.v1 import api_router
 
 # Configure logging
@@ -34,11 +47,22 @@ async def lifespan(app: FastAPI):
     logger.info("Starting up Gen Z Wikipedia API...")
     await connect_to_mongo()
     logger.info("✅ Database connected successfully")
+    schedule_index_creation()
+    await connect_to_cache()
+    start_tracing()
+    start_loop_monitor()
+    start_memory_sampler()
+    start_warmup()
     
     yield
     
     # Shutdown
     logger.info("Shutting down Gen Z Wikipedia API...")
+    await stop_loop_monitor()
+    await cancel_background_tasks()
+    await shutdown_tracing()
+    await wikipedia_service.close()
+    await close_cache_connection()
     await close_mongo_connection()
     logger.info("✅ Database connection closed")
 
@@ -51,10 +75,14 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
 
+# On-demand profiling of selected requests (innermost: profiles the handler)
+app.add_middleware(ProfilingMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -62,8 +90,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing", "X-Profile-Id"],
 )
 
+# Compress large response bodies (brotli / gzip)
+app.add_middleware(CompressionMiddleware)
+
+# Conditional GET support (ETag / 304 / Cache-Control)
+app.add_middleware(HTTPCacheMiddleware)
+
+# Per-request MongoDB query budget
+app.add_middleware(QueryTrackingMiddleware)
+
+# Trace spans and Server-Timing header
+app.add_middleware(TracingMiddleware)
+
+# Request metrics (outermost, so timings include the middleware above)
+app.add_middleware(MetricsMiddleware)
+
 
 # Health check endpoint
 @app.get("/", tags=["Health"])
@@ -79,14 +123,38 @@ async def root():
 
 @app.get("/health", tags=["Health"])
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (includes outbound dependency circuit breaker states and event-loop lag)"""
+    dependencies = breaker_states()
+    degraded = any(breaker["state"] != "closed" for breaker in dependencies.values())
+    
     return {
-        "status": "healthy",
+        "status": "degraded" if degraded else "healthy",
         "environment": settings.ENVIRONMENT,
-        "debug": settings.DEBUG
+        "debug": settings.DEBUG,
+        "dependencies": dependencies,
+        "eventLoop": loop_monitor_state()
     }
 
 
+@app.get("/health/ready", tags=["Health"])
+async def readiness_check():
+    """Readiness probe: 503 until the startup warm-up has finished"""
+    return ORJSONResponse(
+        status_code=200 if is_ready() else 503,
+        content=warmup_state()
+    )
+
+
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def metrics():
+    """Prometheus metrics (text exposition format)"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 # Include API routers
 app.include_router(api_router, prefix="/api/v1")
 
@@ -95,12 +163,13 @@ app.include_router(api_router, prefix="/api/v1")
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Handle HTTP exceptions"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
             "status_code": exc.status_code
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 
@@ -108,7 +177,7 @@ async def http_exception_handler(request, exc):
 async def general_exception_handler(request, exc):
     """Handle general exceptions"""
     logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -0,0 +1,34 @@
+"""
+Index migration
+Creates (or confirms) every application index, for deploys that set
+CREATE_INDEXES_ON_STARTUP=False and run this as a release step
+
+Usage: python scripts/create_indexes.py (exits 1 if any index failed)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import close_mongo_connection, connect_to_mongo, create_indexes, INDEXES
+
+
+async def main() -> int:
+    await connect_to_mongo()
+    try:
+        failed = await create_indexes()
+    finally:
+        await close_mongo_connection()
+    
+    if failed:
+        print(f"❌ {failed} of {len(INDEXES)} indexes failed (see the log above)")
+        return 1
+    print(f"📇 {len(INDEXES)} indexes ensured")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
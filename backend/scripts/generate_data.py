@@ -0,0 +1,409 @@
+"""
+Synthetic data generator
+Loads production-scale data (users, articles, likes, saved topics and
+conversations) with Zipfian popularity, category and tag distributions
+
+Usage:
+    python scripts/generate_data.py --articles 1000000 --users 100000 --saves 2000000 \\
+        --likes 5000000 --conversations 200000 --workers 8 --drop
+
+Documents are built and inserted with insert_many in batches by parallel
+worker processes. Every batch draws from its own generator seeded with
+(--seed, collection, batch), and document IDs are derived from their index,
+so the same arguments always produce the same data whatever --workers is
+(timestamps are relative to --reference-date). All users share one
+precomputed password hash (--password).
+"""
+
+import argparse
+import itertools
+import random
+import sys
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bson import ObjectId
+from pymongo import MongoClient
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.core.security import hash_password
+from app.models.database import ArticleModel, ConversationModel, UserModel
+
+
+CATEGORIES = [
+    "Technology", "Science", "History", "Environment", "Health",
+    "Culture", "Business", "Education", "Arts", "Sports", "Politics", "General"
+]
+LEVELS = ["beginner", "intermediate", "advanced"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+# Leading byte of generated ObjectIds, per collection
+ID_KINDS = {"users": 1, "articles": 2, "saved_topics": 3, "conversations": 4, "conversation_messages": 5}
+
+_SYLLABLES = (
+    "ba be bi bo bu ka ke ki ko ku la le li lo lu ma me mi mo mu na ne ni no nu "
+    "ra re ri ro ru sa se si so su ta te ti to tu va ve vi vo vu za ze zi zo zu"
+).split()
+_COMMON_WORDS = (
+    "the of and in to a is was for as by on with that from at which it were an are this "
+    "its has had been also first one two new most after more other such during between"
+).split()
+
+
+class Zipf:
+    """Zipf(s) sampler over ranks 0..n-1 (rank 0 most likely)"""
+
+    def __init__(self, n: int, exponent: float = 1.0):
+        self.n = n
+        self.cumulative = list(itertools.accumulate(1 / (rank ** exponent) for rank in range(1, n + 1)))
+        self.total = self.cumulative[-1]
+
+    def sample(self, rng: random.Random) -> int:
+        return min(self.n - 1, bisect_left(self.cumulative, rng.random() * self.total))
+
+    def weight(self, rank: int) -> float:
+        """Probability of `rank`"""
+        previous = self.cumulative[rank - 1] if rank else 0.0
+        return (self.cumulative[rank] - previous) / self.total
+
+
+def object_id(kind: str, index: int, timestamp: int) -> ObjectId:
+    """Deterministic ObjectId of the `index`-th generated document of `kind`"""
+    return ObjectId(timestamp.to_bytes(4, "big") + bytes([ID_KINDS[kind]]) + index.to_bytes(7, "big"))
+
+
+def make_vocabulary(rng: random.Random, size: int) -> List[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 4))))
+    # Sorted for determinism, then shuffled so frequency does not follow spelling
+    words = sorted(words)
+    rng.shuffle(words)
+    return words
+
+
+class Generator:
+    """Builds documents; shared read-only state is derived from the seed alone"""
+
+    def __init__(self, args: argparse.Namespace, password_hash: str):
+        self.args = args
+        self.password_hash = password_hash
+        self.reference = datetime.fromisoformat(args.reference_date)
+        self.timestamp = int(self.reference.timestamp())
+
+        rng = random.Random(f"{args.seed}:vocabulary")
+        self.words = make_vocabulary(rng, 5000)
+        self.tags = make_vocabulary(rng, args.tags)
+        self.word_zipf = Zipf(len(self.words), 1.1)
+        self.tag_zipf = Zipf(len(self.tags), args.tag_exponent)
+        self.category_zipf = Zipf(len(CATEGORIES), 1.0)
+        self.article_zipf = Zipf(max(1, args.articles), args.popularity_exponent)
+
+    def id(self, kind: str, index: int) -> ObjectId:
+        return object_id(kind, index, self.timestamp)
+
+    def _word(self, rng: random.Random) -> str:
+        if rng.random() < 0.35:
+            return rng.choice(_COMMON_WORDS)
+        return self.words[self.word_zipf.sample(rng)]
+
+    def _sentence(self, rng: random.Random) -> str:
+        return " ".join(self._word(rng) for _ in range(rng.randint(6, 24))).capitalize() + "."
+
+    def _content(self, rng: random.Random) -> Tuple[str, str]:
+        """Wikipedia-shaped plaintext and its lead sentences"""
+        target = int(self.args.content_chars * rng.lognormvariate(0, 0.5))
+        lead = " ".join(self._sentence(rng) for _ in range(3))
+        parts = [lead]
+        length = len(lead)
+        while length < target:
+            heading = f"\n\n== {self._word(rng).title()} {self._word(rng)} =="
+            paragraph = "\n" + " ".join(self._sentence(rng) for _ in range(rng.randint(3, 8)))
+            parts.extend([heading, paragraph])
+            length += len(heading) + len(paragraph)
+        return "".join(parts), lead
+
+    def _past(self, rng: random.Random, days: int) -> datetime:
+        return self.reference - timedelta(seconds=rng.randint(0, days * 86400))
+
+    def users(self, rng: random.Random, start: int, end: int) -> List[dict]:
+        documents = []
+        for index in range(start, end):
+            document = UserModel.create_document(
+                email=f"user{index}@example.com",
+                password_hash=self.password_hash,
+                name=f"User {index}",
+                interests=list({CATEGORIES[self.category_zipf.sample(rng)] for _ in range(3)}),
+                level=rng.choice(LEVELS)
+            )
+            joined = self._past(rng, 730)
+            document.update({
+                "_id": self.id("users", index),
+                "joinedAt": joined,
+                "createdAt": joined,
+                "updatedAt": joined,
+                "lastLogin": self._past(rng, 30),
+            })
+            documents.append(document)
+        return documents
+
+    def _liked_by(self, rng: random.Random, rank: int) -> List[ObjectId]:
+        """Users liking the article of popularity `rank` (Zipf share of --likes)"""
+        users = self.args.users
+        if not users or not self.args.likes:
+            return []
+        expected = self.args.likes * self.article_zipf.weight(rank)
+        count = min(users, int(expected) + (1 if rng.random() < expected % 1 else 0))
+        if count > users // 2:
+            return [self.id("users", index) for index in rng.sample(range(users), count)]
+        chosen = set()
+        while len(chosen) < count:
+            chosen.add(rng.randrange(users))
+        return [self.id("users", index) for index in chosen]
+
+    def articles(self, rng: random.Random, start: int, end: int) -> List[dict]:
+        documents = []
+        for index in range(start, end):
+            content, lead = self._content(rng)
+            title = f"{self._word(rng).title()} {self._word(rng).title()} {index}"
+            created = self._past(rng, 365 * 3)
+            liked_by = self._liked_by(rng, index)
+
+            document = ArticleModel.create_document(
+                title=title,
+                slug=title.lower().replace(" ", "-"),
+                content=content,
+                summary=lead[:300],
+                author_id=str(self.id("users", rng.randrange(self.args.users))) if self.args.users else str(ObjectId()),
+                category=CATEGORIES[self.category_zipf.sample(rng)],
+                tags=list(dict.fromkeys(self.tags[self.tag_zipf.sample(rng)] for _ in range(rng.randint(1, 6)))),
+                difficulty=rng.choice(DIFFICULTIES)
+            )
+            document.update({
+                "_id": self.id("articles", index),
+                # Index order is popularity order
+                "views": int(len(liked_by) * rng.uniform(10, 40) + 50 * self.args.articles * self.article_zipf.weight(index)),
+                "likes": len(liked_by),
+                "likedBy": liked_by,
+                "publishedAt": created,
+                "createdAt": created,
+                "updatedAt": created,
+            })
+            documents.append(document)
+        return documents
+
+    def saved_topics(self, rng: random.Random, start: int, end: int) -> List[dict]:
+        documents = []
+        seen = set()
+        for _ in range(start, end):
+            pair = (rng.randrange(self.args.users), self.article_zipf.sample(rng))
+            if pair in seen:
+                continue
+            seen.add(pair)
+            saved_at = self._past(rng, 365)
+            documents.append({
+                "userId": self.id("users", pair[0]),
+                "articleId": self.id("articles", pair[1]),
+                "savedAt": saved_at,
+                "createdAt": saved_at,
+            })
+        return documents
+
+    def conversations(self, rng: random.Random, start: int, end: int) -> Dict[str, List[dict]]:
+        """Conversation documents and their message buckets"""
+        bucket_size = settings.CONVERSATION_BUCKET_SIZE
+        conversations = []
+        buckets = []
+        for index in range(start, end):
+            user_id = self.id("users", rng.randrange(self.args.users))
+            article_index = self.article_zipf.sample(rng) if self.args.articles and rng.random() < 0.8 else None
+            conversation_id = self.id("conversations", index)
+            started = self._past(rng, self.args.conversation_days)
+            expires_at = self.reference + timedelta(days=settings.CONVERSATION_RETENTION_DAYS)
+
+            # Turns per conversation are geometric around the configured mean
+            turns = 1 + int(rng.expovariate(1 / max(1, self.args.turns - 1)))
+            messages = []
+            timestamp = started
+            for seq in range(turns * 2):
+                role = "user" if seq % 2 == 0 else "assistant"
+                text = self._sentence(rng) if role == "user" else " ".join(self._sentence(rng) for _ in range(rng.randint(2, 6)))
+                message = ConversationModel.add_message(role, text, seq)
+                timestamp += timedelta(seconds=rng.randint(5, 300))
+                message["timestamp"] = timestamp
+                messages.append(message)
+
+            document = ConversationModel.create_document(
+                user_id=str(user_id),
+                article_id=str(self.id("articles", article_index)) if article_index is not None else None,
+                expires_at=expires_at
+            )
+            document.update({
+                "_id": conversation_id,
+                "title": messages[0]["content"][:100],
+                "messageCount": len(messages),
+                "lastMessage": dict(messages[-1], content=messages[-1]["content"][:200]),
+                "createdAt": started,
+                "updatedAt": timestamp,
+            })
+            conversations.append(document)
+
+            for first in range(0, len(messages), bucket_size):
+                chunk = messages[first:first + bucket_size]
+                buckets.append({
+                    "conversationId": conversation_id,
+                    "userId": user_id,
+                    "firstSeq": first,
+                    "lastSeq": first + len(chunk) - 1,
+                    "count": len(chunk),
+                    "messages": chunk,
+                    "createdAt": chunk[0]["timestamp"],
+                    "updatedAt": chunk[-1]["timestamp"],
+                    "expiresAt": expires_at,
+                })
+
+        return {"conversations": conversations, "conversation_messages": buckets}
+
+
+# ============ Workers ============
+
+_worker: Optional[Tuple[Generator, object]] = None
+
+
+def _init_worker(args: argparse.Namespace, password_hash: str) -> None:
+    global _worker
+    client = MongoClient(args.mongo_uri, maxPoolSize=2)
+    _worker = (Generator(args, password_hash), client[args.database])
+
+
+def _insert(collection, documents: List[dict]) -> int:
+    """insert_many, tolerating duplicates of unique keys (returns inserted count)"""
+    if not documents:
+        return 0
+    try:
+        return len(collection.insert_many(documents, ordered=False).inserted_ids)
+    except BulkWriteError as e:
+        if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+            raise
+        return e.details.get("nInserted", 0)
+
+
+def _run_batch(kind: str, batch: int, start: int, end: int) -> Dict[str, int]:
+    generator, db = _worker
+    rng = random.Random(f"{generator.args.seed}:{kind}:{batch}")
+
+    produced = getattr(generator, kind)(rng, start, end)
+    if isinstance(produced, dict):
+        return {name: _insert(db[name], documents) for name, documents in produced.items()}
+    return {kind: _insert(db[kind], produced)}
+
+
+def _batches(total: int, size: int):
+    for batch, start in enumerate(range(0, total, size)):
+        yield batch, start, min(total, start + size)
+
+
+# ============ Main ============
+
+def create_indexes(args: argparse.Namespace) -> None:
+    """Create the application's indexes (app.core.database.create_indexes)"""
+    import asyncio
+    from app.core import database
+
+    async def run():
+        settings.MONGODB_URI = args.mongo_uri
+        settings.DATABASE_NAME = args.database
+        await database.connect_to_mongo()
+        await database.create_indexes()
+        await database.close_mongo_connection()
+
+    asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mongo-uri", default=settings.MONGODB_URI)
+    parser.add_argument("--database", default=settings.DATABASE_NAME)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--articles", type=int, default=100_000)
+    parser.add_argument("--likes", type=int, default=500_000, help="Total likes, spread over articles by popularity")
+    parser.add_argument("--saves", type=int, default=200_000)
+    parser.add_argument("--conversations", type=int, default=20_000)
+    parser.add_argument("--turns", type=int, default=6, help="Mean user/assistant turns per conversation")
+    parser.add_argument("--conversation-days", type=int, default=60)
+    parser.add_argument("--content-chars", type=int, default=3000, help="Median article length")
+    parser.add_argument("--tags", type=int, default=2000, help="Tag vocabulary size")
+    parser.add_argument("--tag-exponent", type=float, default=1.1)
+    parser.add_argument("--popularity-exponent", type=float, default=1.0)
+    parser.add_argument("--password", default="password123", help="Password of every generated user")
+    parser.add_argument("--reference-date", default=datetime.utcnow().strftime("%Y-%m-%d"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--drop", action="store_true", help="Drop the generated collections first")
+    parser.add_argument("--defer-indexes", action="store_true",
+                        help="Build indexes after loading (faster for very large loads)")
+    args = parser.parse_args()
+
+    if args.users <= 0 and (args.saves or args.conversations):
+        parser.error("--saves and --conversations need --users > 0")
+
+    client = MongoClient(args.mongo_uri)
+    db = client[args.database]
+    print(f"🌱 Generating data into {args.database}")
+
+    if args.drop:
+        for name in ID_KINDS:
+            db.drop_collection(name)
+        print("🗑️  Dropped generated collections")
+
+    if not args.defer_indexes:
+        create_indexes(args)
+        print("📇 Indexes created")
+
+    # Hashed once: bcrypt is deliberately slow
+    password_hash = hash_password(args.password)
+
+    work = [
+        ("users", args.users),
+        ("articles", args.articles),
+        ("saved_topics", args.saves if args.users and args.articles else 0),
+        ("conversations", args.conversations),
+    ]
+    tasks = [(kind, *batch) for kind, total in work for batch in _batches(total, args.batch_size)]
+
+    totals: Dict[str, int] = {}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(args, password_hash)) as pool:
+        futures = [pool.submit(_run_batch, *task) for task in tasks]
+        for done, future in enumerate(as_completed(futures), 1):
+            for name, count in future.result().items():
+                totals[name] = totals.get(name, 0) + count
+            if done % max(1, len(futures) // 20) == 0 or done == len(futures):
+                elapsed = time.perf_counter() - started
+                inserted = sum(totals.values())
+                print(f"  {done}/{len(futures)} batches, {inserted:,} documents, {inserted / elapsed:,.0f} docs/s")
+
+    if args.defer_indexes:
+        index_started = time.perf_counter()
+        create_indexes(args)
+        print(f"📇 Indexes created in {time.perf_counter() - index_started:.1f}s")
+
+    print("\n" + "=" * 50)
+    print(f"✅ Generated data in {time.perf_counter() - started:.1f}s")
+    for name, count in totals.items():
+        print(f"  {name}: {count:,}")
+    print(f"Login: user0@example.com | Password: {args.password}")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """
 Database seeder script
 Populates MongoDB with sample data for testing and development
+(creates the indexes first; see generate_data.py for large datasets)
 """
 
 import asyncio
@@ -10,9 +11,10 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.core.database import connect_to_mongo, get_database
+from app.core.database import connect_to_mongo, create_indexes, get_database
 from app.core.security import hash_password
 from app.models.database import UserModel, ArticleModel
+from app.ai_modules.extractive import extractive_summarizer
 from datetime import datetime, timedelta
 import random
 
@@ -263,6 +265,7 @@ async def seed_database():
     
     # Connect to database
     await connect_to_mongo()
+    await create_indexes()
     db = get_database()
     
     # Clear existing data (be careful in production!)
@@ -270,29 +273,33 @@ async def seed_database():
     await db.users.delete_many({})
     await db.articles.delete_many({})
     await db.conversations.delete_many({})
+    await db.conversation_messages.delete_many({})
     await db.saved_topics.delete_many({})
     
-    # Create users
+    # Create users (one hash: bcrypt is deliberately slow)
     print("👥 Creating users...")
-    user_ids = []
+    password_hash = hash_password("password123")  # Default password
+    user_docs = []
     
     for user_data in SAMPLE_USERS:
         user_doc = UserModel.create_document(
             email=user_data["email"],
-            password_hash=hash_password("password123"),  # Default password
+            password_hash=password_hash,
             name=user_data["name"],
             interests=user_data["interests"],
             level=user_data["level"]
         )
         user_doc["bio"] = user_data["bio"]
-        
-        result = await db.users.insert_one(user_doc)
-        user_ids.append(result.inserted_id)
+        user_docs.append(user_doc)
+    
+    result = await db.users.insert_many(user_docs)
+    user_ids = result.inserted_ids
+    for user_data in SAMPLE_USERS:
         print(f"  ✅ Created user: {user_data['name']} ({user_data['email']})")
     
     # Create articles
     print("📝 Creating articles...")
-    article_ids = []
+    article_docs = []
     
     for i, article_data in enumerate(SAMPLE_ARTICLES):
         # Assign random author
@@ -301,8 +308,8 @@ async def seed_database():
         # Generate slug
         slug = article_data["title"].lower().replace(" ", "-").replace(":", "")
         
-        # Create simple summary (first 200 chars)
-        summary = article_data["content"][:200] + "..."
+        # Extractive summary (key sentences of the article itself)
+        summary = extractive_summarizer.summarize(article_data["content"], max_length=300)
         
         article_doc = ArticleModel.create_document(
             title=article_data["title"],
@@ -318,23 +325,28 @@ async def seed_database():
         # Add some random stats
         article_doc["views"] = random.randint(100, 5000)
         article_doc["likes"] = random.randint(10, 500)
-        
-        result = await db.articles.insert_one(article_doc)
-        article_ids.append(result.inserted_id)
+        article_docs.append(article_doc)
+    
+    result = await db.articles.insert_many(article_docs)
+    article_ids = result.inserted_ids
+    for article_data in SAMPLE_ARTICLES:
         print(f"  ✅ Created article: {article_data['title']}")
     
     # Create some saved topics
     print("💾 Creating saved topics...")
+    saved_docs = []
     for user_id in user_ids[:2]:  # First 2 users save some articles
         saved_articles = random.sample(article_ids, min(3, len(article_ids)))
         for article_id in saved_articles:
-            saved_doc = {
+            saved_docs.append({
                 "userId": user_id,
                 "articleId": article_id,
                 "savedAt": datetime.utcnow() - timedelta(days=random.randint(1, 30)),
                 "createdAt": datetime.utcnow()
-            }
-            await db.saved_topics.insert_one(saved_doc)
+            })
+    
+    if saved_docs:
+        await db.saved_topics.insert_many(saved_docs)
     
     print("  ✅ Created saved topics")
     
@@ -347,6 +359,7 @@ async def seed_database():
     print("\nDefault login credentials:")
     for user in SAMPLE_USERS:
         print(f"  Email: {user['email']} | Password: password123")
+    print("\nFor production-scale data use scripts/generate_data.py")
     print("="*50)
 
 
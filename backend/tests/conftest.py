@@ -0,0 +1,114 @@
+"""
+Shared test fixtures
+
+Tests run without external services: MongoDB is mongomock (through
+mongomock-motor), Redis is fakeredis and the LLM is the fake provider.
+"""
+
+import os
+
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("FAKE_LLM", '{"latency": "constant", "latency_ms": 0, "tokens_per_second": 0}')
+
+import fakeredis
+from bson import ObjectId
+import pytest
+from mongomock_motor import AsyncMongoMockClient, AsyncMongoMockCollection
+
+from app.core import cache as cache_module, database
+from app.core.cache import Cache, MemoryCacheBackend, RedisCacheBackend
+from app.core.query_tracking import current_query_stats
+
+# Motor collection method -> the MongoDB command it sends
+COLLECTION_COMMANDS = {
+    "find": "find",
+    "find_one": "find",
+    "aggregate": "aggregate",
+    "count_documents": "aggregate",
+    "distinct": "distinct",
+    "insert_one": "insert",
+    "insert_many": "insert",
+    "update_one": "update",
+    "update_many": "update",
+    "replace_one": "update",
+    "delete_one": "delete",
+    "delete_many": "delete",
+    "find_one_and_update": "findAndModify",
+    "find_one_and_replace": "findAndModify",
+    "find_one_and_delete": "findAndModify",
+    "bulk_write": "bulkWrite",
+}
+
+
+def make_backend(kind: str):
+    if kind == "memory":
+        return MemoryCacheBackend()
+    backend = RedisCacheBackend("redis://localhost:6379/0")
+    backend.client = fakeredis.FakeAsyncRedis()
+    return backend
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache_backend(request):
+    """Every cache test runs against both backends"""
+    return make_backend(request.param)
+
+
+@pytest.fixture
+def cache(cache_backend):
+    return Cache(cache_backend, prefix="test")
+
+
+@pytest.fixture
+def db():
+    """A fresh mongomock database behind get_database(), with an empty app cache"""
+    client = AsyncMongoMockClient()
+    previous = (database.db.client, database.db.db, cache_module.cache.backend)
+    database.db.client = client
+    database.db.db = client["test"]
+    cache_module.cache.backend = MemoryCacheBackend()
+    yield database.db.db
+    database.db.client, database.db.db, cache_module.cache.backend = previous
+
+
+@pytest.fixture
+def tracked_db(db, monkeypatch):
+    """
+    `db` whose commands are counted by track_queries/assert_max_queries
+
+    mongomock emits no driver events, so each collection method records the
+    command it stands for (cursors count once, when created).
+    """
+    def counted(method_name, command_name):
+        method = getattr(AsyncMongoMockCollection, method_name)
+
+        def wrapper(self, *args, **kwargs):
+            stats = current_query_stats()
+            if stats is not None:
+                stats.record(f"{self.name}.{command_name}", 0.0)
+            return method(self, *args, **kwargs)
+
+        return wrapper
+
+    for method_name, command_name in COLLECTION_COMMANDS.items():
+        monkeypatch.setattr(AsyncMongoMockCollection, method_name, counted(method_name, command_name))
+    return db
+
+
+@pytest.fixture
+async def article(db):
+    """One stored article; returns its id"""
+    from app.models.database import ArticleModel
+
+    document = ArticleModel.create_document(
+        title="Black Holes",
+        slug="black-holes",
+        content="A black hole is a region of spacetime. Nothing escapes it. " * 20,
+        summary="Regions of spacetime nothing escapes.",
+        author_id=str(ObjectId()),
+        category="Science"
+    )
+    result = await db.articles.insert_one(document)
+    return str(result.inserted_id)
@@ -0,0 +1,101 @@
+"""Admission control: rate limit, concurrency slots and load shedding, on both backends"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+
+from app.core import admission as admission_module, cache as cache_module
+from app.core.admission import AdmissionController, admission
+from app.core.config import settings
+from tests.conftest import make_backend
+
+
+@pytest.fixture(params=["memory", "redis"])
+def controller(request, monkeypatch):
+    """A fresh controller whose shared state lives in memory or (fake) Redis"""
+    monkeypatch.setattr(cache_module.cache, "backend", make_backend(request.param))
+    controller = AdmissionController()
+    monkeypatch.setattr(admission_module, "admission_controller", controller)
+    return controller
+
+
+def limits(monkeypatch, **policy):
+    monkeypatch.setattr(settings, "AI_ADMISSION_LIMITS", {"default": {}, "test": policy})
+
+
+def retry_after(error: HTTPException) -> int:
+    assert error.status_code == 429
+    return int(error.headers["Retry-After"])
+
+
+async def test_rate_limit_rejects_once_bucket_is_empty(controller, monkeypatch):
+    limits(monkeypatch, rate=0.5, burst=2, concurrency=10)
+
+    for _ in range(2):
+        lease = await controller.admit("test", "user:1")
+        await controller.release("test", lease, 0.0)
+
+    with pytest.raises(HTTPException) as rejected:
+        await controller.admit("test", "user:1")
+    assert retry_after(rejected.value) == 2
+
+    # Buckets are per caller
+    assert await controller.admit("test", "user:2")
+
+
+async def test_slot_limit_waits_at_most_max_wait(controller, monkeypatch):
+    limits(monkeypatch, rate=100, burst=100, concurrency=1, max_wait=0.2)
+    lease = await controller.admit("test", "user:1")
+
+    started = asyncio.get_running_loop().time()
+    with pytest.raises(HTTPException) as rejected:
+        await controller.admit("test", "user:2")
+    assert retry_after(rejected.value) >= 1
+    assert 0.15 <= asyncio.get_running_loop().time() - started < 1
+
+    await controller.release("test", lease, 0.0)
+    assert await controller.admit("test", "user:2")
+
+
+async def test_queued_request_gets_slot_when_released(controller, monkeypatch):
+    limits(monkeypatch, rate=100, burst=100, concurrency=1, max_wait=2)
+    lease = await controller.admit("test", "user:1")
+
+    waiting = asyncio.ensure_future(controller.admit("test", "user:2"))
+    await asyncio.sleep(0.05)
+    assert not waiting.done()
+
+    await controller.release("test", lease, 0.0)
+    assert await asyncio.wait_for(waiting, 1)
+
+
+async def test_slot_released_when_handler_fails(controller, monkeypatch):
+    limits(monkeypatch, rate=100, burst=100, concurrency=1, max_wait=0.1)
+    app = FastAPI()
+
+    @app.get("/fail", dependencies=[Depends(admission("test"))])
+    async def fail():
+        raise HTTPException(status_code=500, detail="boom")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(3):
+            assert (await client.get("/fail")).status_code == 500
+
+
+async def test_sheds_load_when_expected_wait_exceeds_latency_target(controller, monkeypatch):
+    limits(monkeypatch, rate=100, burst=100, concurrency=1, latency_target=1.0)
+
+    # One slow request teaches the controller the route's service time
+    lease = await controller.admit("test", "user:1")
+    await controller.release("test", lease, 3.0)
+
+    with pytest.raises(HTTPException) as rejected:
+        await controller.admit("test", "user:1")
+    assert retry_after(rejected.value) == 3
+
+    # Fast requests bring the estimate back under the target
+    controller.stats["test"].service_time = 0.1
+    assert await controller.admit("test", "user:1")
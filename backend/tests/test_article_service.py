@@ -0,0 +1,59 @@
+"""Article service: cached reads and their invalidation on writes"""
+
+from app.core.cache import get_cache
+from app.models.schemas import ArticleUpdate
+from app.services.article_service import article_service
+
+
+async def prime(article_id: str) -> None:
+    """Fill every cache an article can be served from"""
+    await article_service.get_article_by_slug("black-holes", increment_views=False)
+    await article_service.get_trending_articles()
+    await article_service.get_articles_by_category("Science")
+
+
+async def test_update_drops_old_slug_and_refreshes_lists(db, article):
+    await prime(article)
+
+    await article_service.update_article(article, ArticleUpdate(title="Wormholes"))
+
+    assert await article_service.get_article_by_slug("black-holes", increment_views=False) is None
+    renamed = await article_service.get_article_by_slug("wormholes", increment_views=False)
+    assert renamed["id"] == article and renamed["title"] == "Wormholes"
+    assert [a["title"] for a in await article_service.get_trending_articles()] == ["Wormholes"]
+    assert [a["title"] for a in await article_service.get_articles_by_category("Science")] == ["Wormholes"]
+
+
+async def test_category_change_moves_article_between_lists(db, article):
+    await prime(article)
+
+    await article_service.update_article(article, ArticleUpdate(category="History"))
+
+    assert await article_service.get_articles_by_category("Science") == []
+    assert [a["id"] for a in await article_service.get_articles_by_category("History")] == [article]
+
+
+async def test_delete_drops_slug_and_lists(db, article):
+    await prime(article)
+
+    assert await article_service.delete_article(article)
+
+    assert await get_cache().get("article-slugs", "black-holes") is None
+    assert await article_service.get_article_by_slug("black-holes", increment_views=False) is None
+    assert await article_service.get_article_by_id(article, increment_views=False) is None
+    assert await article_service.get_trending_articles() == []
+    assert await article_service.get_articles_by_category("Science") == []
+
+
+async def test_like_returns_fresh_counters_without_writing_back(db, article):
+    user_id = "64b000000000000000000001"
+    await prime(article)
+
+    liked = await article_service.like_article(article, user_id)
+    assert liked["liked"] and liked["article"]["likes"] == 1
+    # The cached view is dropped, not overwritten with the copy read before the like
+    assert await get_cache().get("articles", article) is None
+    assert (await article_service.get_article_by_id(article, increment_views=False))["likes"] == 1
+
+    unliked = await article_service.like_article(article, user_id)
+    assert not unliked["liked"] and unliked["article"]["likes"] == 0
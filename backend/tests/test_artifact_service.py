@@ -0,0 +1,27 @@
+"""Background AI artifact generation"""
+
+import asyncio
+
+from app.services.artifact_service import ARTIFACT_FIELDS, artifact_service
+
+
+async def test_generation_bounds_llm_calls_across_articles(db, article, monkeypatch):
+    in_flight, peak = 0, 0
+
+    async def generate():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "artifact"
+
+    monkeypatch.setattr(artifact_service, "_generation_slots", asyncio.Semaphore(2))
+    monkeypatch.setattr(
+        artifact_service, "_generators", lambda article: {field: generate for field in ARTIFACT_FIELDS}
+    )
+
+    results = await asyncio.gather(*(artifact_service.generate_artifacts(article) for _ in range(3)))
+
+    assert peak == 2
+    assert all(len(values) == len(ARTIFACT_FIELDS) for values in results)
@@ -0,0 +1,211 @@
+"""Cache tier: both backends, namespaces, pipelining and stampede protection"""
+
+import asyncio
+
+from app.core.cache import Cache, CacheBackend, MemoryCacheBackend
+from tests.conftest import make_backend
+
+
+class FailingBackend(CacheBackend):
+    """Backend whose every operation fails (Redis down)"""
+
+    async def _fail(self, *args, **kwargs):
+        raise ConnectionError("backend down")
+
+    get_many = set_many = delete_many = delete_prefix = acquire_lock = release_lock = _fail
+
+
+def counting_loader(value, delay: float = 0.05):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    return loader, calls
+
+
+async def test_set_get_roundtrip_keeps_python_objects(cache):
+    value = {"title": "Python", "tags": ["a", "b"], "views": 3}
+    await cache.set("articles", "1", value)
+
+    assert await cache.get("articles", "1") == value
+    assert await cache.get("articles", "missing") is None
+
+
+async def test_ttl_expiry(cache):
+    await cache.set("trending", "10", ["a"], ttl=1)
+    assert await cache.get("trending", "10") == ["a"]
+
+    await asyncio.sleep(1.1)
+    assert await cache.get("trending", "10") is None
+
+
+async def test_namespaces_are_isolated(cache):
+    await cache.set("articles", "1", "article")
+    await cache.set("article-slugs", "1", "slug")
+
+    await cache.delete("articles", "1")
+    assert await cache.get("articles", "1") is None
+    assert await cache.get("article-slugs", "1") == "slug"
+
+
+async def test_invalidate_namespace_only_drops_that_namespace(cache):
+    await cache.set_many("category", {"science:10": [1], "history:10": [2]})
+    await cache.set("trending", "10", [3])
+
+    await cache.invalidate_namespace("category")
+
+    assert await cache.get_many("category", ["science:10", "history:10"]) == [None, None]
+    assert await cache.get("trending", "10") == [3]
+
+
+async def test_get_many_set_many_preserve_order(cache):
+    await cache.set_many("articles", {"a": 1, "b": 2, "c": 3})
+
+    assert await cache.get_many("articles", ["c", "missing", "a"]) == [3, None, 1]
+    assert await cache.get_many("articles", []) == []
+
+
+async def test_redis_get_many_set_many_use_one_pipeline(monkeypatch):
+    backend = make_backend("redis")
+    cache = Cache(backend, prefix="test")
+    pipelines = []
+    original = backend.client.pipeline
+
+    def counting_pipeline(*args, **kwargs):
+        pipelines.append(kwargs)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(backend.client, "pipeline", counting_pipeline)
+
+    await cache.set_many("articles", {str(i): i for i in range(20)})
+    assert await cache.get_many("articles", [str(i) for i in range(20)]) == list(range(20))
+    assert pipelines == [{"transaction": False}, {"transaction": False}]
+
+
+async def test_get_or_set_collapses_concurrent_misses(cache):
+    loader, calls = counting_loader({"id": "1"})
+
+    results = await asyncio.gather(*(cache.get_or_set("articles", "1", loader) for _ in range(20)))
+
+    assert len(calls) == 1
+    assert results == [{"id": "1"}] * 20
+    assert await cache.get("articles", "1") == {"id": "1"}
+
+
+async def test_get_or_set_collapses_misses_across_workers(cache_backend):
+    # Two Cache instances on one backend behave like two worker processes:
+    # only the backend lock keeps the second from loading too
+    first, second = Cache(cache_backend, prefix="test"), Cache(cache_backend, prefix="test")
+    loader, calls = counting_loader("value", delay=0.2)
+
+    results = await asyncio.gather(
+        first.get_or_set("articles", "1", loader),
+        second.get_or_set("articles", "1", loader)
+    )
+
+    assert len(calls) == 1
+    assert results == ["value", "value"]
+
+
+async def test_get_or_set_waits_for_lock_holder(cache):
+    # Another worker holds the lock and publishes the value shortly after
+    assert await cache.backend.acquire_lock(cache._key("lock", "articles:1"), "other-worker", 5)
+    loader, calls = counting_loader("mine")
+
+    async def other_worker():
+        await asyncio.sleep(0.1)
+        await cache.set("articles", "1", "theirs")
+
+    _, value = await asyncio.gather(other_worker(), cache.get_or_set("articles", "1", loader))
+
+    assert value == "theirs"
+    assert calls == []
+
+
+async def test_get_or_set_loads_after_lock_wait_times_out(cache, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "CACHE_LOCK_TIMEOUT_SECONDS", 0.2)
+    assert await cache.backend.acquire_lock(cache._key("lock", "articles:1"), "stuck-worker", 5)
+    loader, calls = counting_loader("mine", delay=0)
+
+    assert await cache.get_or_set("articles", "1", loader) == "mine"
+    assert len(calls) == 1
+
+
+async def test_cancelled_loader_hands_the_load_to_a_waiter(cache):
+    slow_loader, slow_calls = counting_loader("first", delay=1)
+    loader, calls = counting_loader("second")
+
+    first = asyncio.ensure_future(cache.get_or_set("articles", "1", slow_loader))
+    await asyncio.sleep(0.05)
+    second = asyncio.ensure_future(cache.get_or_set("articles", "1", loader))
+    await asyncio.sleep(0.05)
+    first.cancel()
+
+    assert await second == "second"
+    assert first.cancelled()
+    assert len(slow_calls) == 1 and len(calls) == 1
+
+
+async def test_cancelled_waiter_does_not_cancel_the_load(cache):
+    loader, calls = counting_loader("value", delay=0.1)
+
+    first = asyncio.ensure_future(cache.get_or_set("articles", "1", loader))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.ensure_future(cache.get_or_set("articles", "1", loader))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+
+    assert await first == "value"
+    assert waiter.cancelled()
+    assert len(calls) == 1
+
+
+async def test_get_or_set_does_not_cache_none(cache):
+    loader, calls = counting_loader(None, delay=0)
+
+    assert await cache.get_or_set("articles", "1", loader) is None
+    assert await cache.get_or_set("articles", "1", loader) is None
+    assert len(calls) == 2
+
+
+async def test_loader_error_reaches_every_waiter_and_is_not_cached(cache):
+    async def failing():
+        await asyncio.sleep(0.05)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        *(cache.get_or_set("articles", "1", failing) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert await cache.get("articles", "1") is None
+
+
+async def test_backend_failure_is_a_miss():
+    cache = Cache(FailingBackend(), prefix="test")
+    loader, calls = counting_loader("loaded", delay=0)
+
+    await cache.set("articles", "1", "value")
+    await cache.delete("articles", "1")
+    await cache.invalidate_namespace("articles")
+
+    assert await cache.get("articles", "1") is None
+    assert await cache.get_many("articles", ["1", "2"]) == [None, None]
+    assert await cache.get_or_set("articles", "1", loader) == "loaded"
+    assert len(calls) == 1
+
+
+async def test_memory_backend_evicts_least_recently_used():
+    cache = Cache(MemoryCacheBackend(max_entries=2), prefix="test")
+
+    await cache.set("articles", "a", 1)
+    await cache.set("articles", "b", 2)
+    await cache.get("articles", "a")
+    await cache.set("articles", "c", 3)
+
+    assert await cache.get_many("articles", ["a", "b", "c"]) == [1, None, 3]
@@ -0,0 +1,136 @@
+"""Conversation message buckets: appends, ordering and paging"""
+
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from app.core.config import settings
+from app.models.database import ConversationModel
+from app.services.conversation_service import conversation_service
+
+USER_ID = str(ObjectId())
+
+
+@pytest.fixture
+async def conversation(db, monkeypatch):
+    monkeypatch.setattr(settings, "CONVERSATION_BUCKET_SIZE", 4)
+    await db.conversation_messages.create_index([("conversationId", 1), ("firstSeq", 1)], unique=True)
+    return await conversation_service.create_conversation(USER_ID)
+
+
+async def buckets(db, conversation_id):
+    cursor = db.conversation_messages.find({"conversationId": ObjectId(conversation_id)}).sort("firstSeq", 1)
+    return [
+        (bucket["firstSeq"], bucket["lastSeq"], [message["seq"] for message in bucket["messages"]])
+        async for bucket in cursor
+    ]
+
+
+async def test_appends_fill_buckets_in_order(db, conversation):
+    for turn in range(5):
+        await conversation_service.append_messages(
+            conversation, USER_ID, [("user", f"question {turn}"), ("assistant", f"answer {turn}")]
+        )
+
+    assert await buckets(db, conversation) == [
+        (0, 3, [0, 1, 2, 3]),
+        (4, 7, [4, 5, 6, 7]),
+        (8, 9, [8, 9]),
+    ]
+
+
+async def test_late_write_of_earlier_seqs_stays_in_order(db, conversation):
+    def turn(first_seq):
+        return [
+            ConversationModel.add_message("user", "hi", first_seq),
+            ConversationModel.add_message("assistant", "hello", first_seq + 1)
+        ]
+
+    conversation_id, user_id = ObjectId(conversation), ObjectId(USER_ID)
+    expires_at = conversation_service._expires_at()
+
+    # Seqs 4-5 and 8-9 were reserved after 2-3 and 6-7 but are written first
+    for first_seq in (0, 4, 2, 8, 6):
+        await conversation_service._store_messages(conversation_id, user_id, turn(first_seq), expires_at)
+
+    assert await buckets(db, conversation) == [
+        (0, 5, [0, 1, 2, 3, 4, 5]),
+        (6, 7, [6, 7]),
+        (8, 9, [8, 9]),
+    ]
+
+
+async def test_concurrent_appends_page_back_in_order(db, conversation):
+    await asyncio.gather(*(
+        conversation_service.append_messages(conversation, USER_ID, [("user", f"q{turn}"), ("assistant", f"a{turn}")])
+        for turn in range(10)
+    ))
+
+    newest = await conversation_service.get_messages(conversation, limit=6)
+    older = await conversation_service.get_messages(conversation, before=int(newest["nextCursor"]), limit=20)
+
+    seqs = [message["seq"] for message in older["messages"] + newest["messages"]]
+    assert seqs == list(range(20))
+    for first_seq, last_seq, bucket_seqs in await buckets(db, conversation):
+        assert bucket_seqs == sorted(bucket_seqs) and bucket_seqs[0] == first_seq and bucket_seqs[-1] == last_seq
+
+
+@pytest.fixture
+def folds(monkeypatch):
+    """Capture the messages each summary fold receives"""
+    from app.ai_modules.chat import chat_service
+
+    calls = []
+
+    async def summarize_history(summary, messages):
+        calls.append([message["seq"] for message in messages])
+        return f"summary through {messages[-1]['seq']}"
+
+    monkeypatch.setattr(chat_service, "summarize_history", summarize_history)
+    return calls
+
+
+async def store_turns(conversation, seqs):
+    conversation_id, user_id = ObjectId(conversation), ObjectId(USER_ID)
+    expires_at = conversation_service._expires_at()
+    for seq in seqs:
+        message = ConversationModel.add_message("user", f"message number {seq}", seq)
+        await conversation_service._store_messages(conversation_id, user_id, [message], expires_at)
+
+
+async def test_compaction_ignores_message_count_within_token_budget(db, conversation, folds, monkeypatch):
+    from app.core import tasks
+
+    monkeypatch.setattr(settings, "CHAT_HISTORY_TOKEN_BUDGET", 1000)
+    messages = [ConversationModel.add_message("user", "hi", seq) for seq in range(15)]
+
+    conversation_service.compact_history(conversation, -1, messages)
+
+    assert not tasks._background_tasks
+
+
+async def test_fold_covers_turns_outside_the_loaded_window(db, conversation, folds, monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_HISTORY_TOKEN_BUDGET", 40)
+    await store_turns(conversation, range(20))
+
+    await conversation_service._fold_into_summary(conversation)
+
+    stored = await db.conversations.find_one({"_id": ObjectId(conversation)})
+    assert folds[0][0] == 0 and folds[0] == list(range(len(folds[0])))
+    assert stored["summarizedThroughSeq"] == folds[0][-1]
+
+
+async def test_fold_stops_at_a_missing_turn(db, conversation, folds, monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_HISTORY_TOKEN_BUDGET", 40)
+    # Seq 5 is reserved but its write has not landed yet
+    await store_turns(conversation, [seq for seq in range(20) if seq != 5])
+
+    await conversation_service._fold_into_summary(conversation)
+
+    assert folds == []
+
+    await store_turns(conversation, [5])
+    await conversation_service._fold_into_summary(conversation)
+
+    assert folds[0][0] == 0 and folds[0] == list(range(len(folds[0])))
@@ -0,0 +1,116 @@
+"""Conditional requests through the compression and HTTP cache middlewares"""
+
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.compression import CompressionMiddleware
+from app.core.http_cache import HTTPCacheMiddleware, article_validators, encoded_etag, etag_matches
+from app.core.responses import ORJSONResponse
+
+ETAG = '"abc123"'
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/article")
+    async def article():
+        return ORJSONResponse({"content": "x" * 5000}, headers={"ETag": ETAG})
+
+    # Same order as main.py: HTTPCacheMiddleware wraps CompressionMiddleware
+    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(HTTPCacheMiddleware)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_encoded_etag():
+    assert encoded_etag('"abc"', "gzip") == '"abc-gzip"'
+    assert encoded_etag('"abc"', "br") == '"abc-br"'
+    assert encoded_etag('W/"abc"', "gzip") == 'W/"abc"'
+
+
+def test_etag_matches_ignores_encoding_suffix():
+    assert etag_matches('"abc-gzip"', '"abc"')
+    assert etag_matches('"abc"', '"other", W/"abc-br"')
+    assert not etag_matches('"abc-gzip"', '"abd-gzip"')
+    assert etag_matches('"abc"', "*")
+
+
+async def test_each_encoding_has_its_own_strong_etag(client):
+    async with client:
+        identity = await client.get("/article", headers={"Accept-Encoding": "identity"})
+        gzip = await client.get("/article", headers={"Accept-Encoding": "gzip"})
+
+    assert identity.headers["etag"] == ETAG
+    assert "content-encoding" not in identity.headers
+    assert gzip.headers["content-encoding"] == "gzip"
+    assert gzip.headers["etag"] == '"abc123-gzip"'
+
+
+@pytest.mark.parametrize("accept_encoding, if_none_match", [
+    ("gzip", '"abc123-gzip"'),
+    ("gzip", ETAG),
+    ("identity", '"abc123-gzip"'),
+])
+async def test_revalidation_across_encodings(client, accept_encoding, if_none_match):
+    async with client:
+        response = await client.get(
+            "/article", headers={"Accept-Encoding": accept_encoding, "If-None-Match": if_none_match}
+        )
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+async def test_changed_etag_is_not_revalidated(client):
+    async with client:
+        response = await client.get("/article", headers={"Accept-Encoding": "gzip", "If-None-Match": '"old-gzip"'})
+
+    assert response.status_code == 200
+
+
+@pytest.fixture
+def article_client():
+    app = FastAPI()
+    article = {"id": "1", "content": "text", "updatedAt": datetime(2026, 1, 2, 3, 4, 5, 678000)}
+
+    @app.get("/article")
+    async def get_article():
+        return ORJSONResponse(article, headers=article_validators(article))
+
+    app.add_middleware(HTTPCacheMiddleware)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def test_last_modified_from_updated_at(article_client):
+    async with article_client:
+        response = await article_client.get("/article")
+
+    assert response.headers["last-modified"] == "Fri, 02 Jan 2026 03:04:05 GMT"
+
+
+@pytest.mark.parametrize("if_modified_since, status", [
+    ("Fri, 02 Jan 2026 03:04:05 GMT", 304),
+    ("Sat, 03 Jan 2026 00:00:00 GMT", 304),
+    ("Fri, 02 Jan 2026 03:04:04 GMT", 200),
+    ("not a date", 200),
+])
+async def test_if_modified_since(article_client, if_modified_since, status):
+    async with article_client:
+        response = await article_client.get("/article", headers={"If-Modified-Since": if_modified_since})
+
+    assert response.status_code == status
+
+
+async def test_if_none_match_takes_precedence_over_if_modified_since(article_client):
+    async with article_client:
+        response = await article_client.get("/article", headers={
+            "If-None-Match": '"stale"',
+            "If-Modified-Since": "Sat, 03 Jan 2026 00:00:00 GMT"
+        })
+
+    assert response.status_code == 200
@@ -0,0 +1,37 @@
+"""Index creation at startup and from the migration script"""
+
+import importlib.util
+from pathlib import Path
+
+from app.core import database
+
+
+def load_script():
+    path = Path(__file__).parent.parent / "scripts" / "create_indexes.py"
+    spec = importlib.util.spec_from_file_location("create_indexes_script", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def test_create_indexes_reports_failures(db):
+    # Duplicate emails make the unique index build fail
+    await db.users.insert_many([{"email": "a@example.com"}, {"email": "a@example.com"}])
+
+    assert await database.create_indexes() == 1
+
+
+async def test_migration_script_exit_status(db, monkeypatch):
+    script = load_script()
+
+    async def noop():
+        pass
+
+    monkeypatch.setattr(script, "connect_to_mongo", noop)
+    monkeypatch.setattr(script, "close_mongo_connection", noop)
+
+    assert await script.main() == 0
+
+    await db.users.drop_indexes()
+    await db.users.insert_many([{"email": "a@example.com"}, {"email": "a@example.com"}])
+    assert await script.main() == 1
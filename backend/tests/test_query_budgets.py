@@ -0,0 +1,69 @@
+"""MongoDB command budgets of hot paths (assert_max_queries)"""
+
+from bson import ObjectId
+
+from app.api.v1.endpoints.saved_topics import get_saved_topics
+from app.core.query_tracking import assert_max_queries, track_queries
+from app.models.database import ArticleModel, SavedTopicModel
+from app.services.article_service import article_service
+
+USER_ID = str(ObjectId())
+
+
+async def test_like_is_one_round_trip_with_warm_cache(tracked_db, article):
+    await article_service.get_article_by_id(article, increment_views=False)
+
+    async with assert_max_queries(1, "like"):
+        result = await article_service.like_article(article, USER_ID)
+
+    assert result["liked"] and result["article"]["likes"] == 1
+
+
+async def test_like_reads_article_once_with_cold_cache(tracked_db, article):
+    async with assert_max_queries(2, "like"):
+        result = await article_service.like_article(article, USER_ID)
+
+    assert result["article"]["title"] == "Black Holes"
+
+
+async def test_unlike_is_two_round_trips(tracked_db, article):
+    await article_service.like_article(article, USER_ID)
+    await article_service.get_article_by_id(article, increment_views=False)
+
+    async with assert_max_queries(2, "unlike"):
+        result = await article_service.like_article(article, USER_ID)
+
+    assert not result["liked"] and result["article"]["likes"] == 0
+
+
+async def test_article_by_slug_with_warm_cache(tracked_db, article):
+    await article_service.get_article_by_slug("black-holes")
+
+    # Only the view counter goes to the database
+    async with track_queries("slug") as stats:
+        viewed = await article_service.get_article_by_slug("black-holes")
+    assert stats.by_command == {"articles.findAndModify": 1}
+    assert viewed["views"] == 2
+
+    async with assert_max_queries(0, "slug without view"):
+        assert await article_service.get_article_by_slug("black-holes", increment_views=False)
+
+
+async def test_saved_topics_fetch_articles_in_one_query(tracked_db):
+    for index in range(5):
+        document = ArticleModel.create_document(
+            title=f"Topic {index}",
+            slug=f"topic-{index}",
+            content="Content " * 20,
+            summary="Summary",
+            author_id=USER_ID,
+            category="Science"
+        )
+        result = await tracked_db.articles.insert_one(document)
+        await tracked_db.saved_topics.insert_one(SavedTopicModel.create_document(USER_ID, str(result.inserted_id)))
+
+    async with track_queries("saved topics") as stats:
+        response = await get_saved_topics(limit=20, skip=0, current_user={"user_id": USER_ID})
+
+    assert stats.by_command == {"saved_topics.find": 1, "articles.aggregate": 1}
+    assert response.body.count(b'"savedTopicId"') == 5
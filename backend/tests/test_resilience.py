@@ -0,0 +1,67 @@
+"""Outbound call resilience: hedging, deadlines and the circuit breaker"""
+
+import asyncio
+
+import pytest
+
+from app.core import resilience
+from app.core.config import settings
+
+
+@pytest.fixture
+def hedged_policy(monkeypatch):
+    monkeypatch.setattr(settings, "RESILIENCE_POLICIES", {
+        "test": {"timeout": 0.3, "attempts": 1, "hedge_after": 0.1}
+    })
+    monkeypatch.setattr(resilience, "_breakers", {})
+
+
+def slow_operation():
+    """Operation that never finishes on its own; returns (factory, started tasks)"""
+    tasks = []
+
+    async def operation():
+        tasks.append(asyncio.current_task())
+        await asyncio.sleep(10)
+
+    return operation, tasks
+
+
+async def settle(tasks):
+    await asyncio.sleep(0)
+    assert tasks and all(task.done() for task in tasks)
+
+
+async def test_cancelled_during_hedge_window_cancels_first_attempt(hedged_policy):
+    operation, tasks = slow_operation()
+
+    call = asyncio.ensure_future(resilience.call("test", operation))
+    await asyncio.sleep(0.05)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+
+    assert len(tasks) == 1
+    await settle(tasks)
+
+
+async def test_deadline_cancels_every_hedged_attempt(hedged_policy):
+    operation, tasks = slow_operation()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await resilience.call("test", operation)
+
+    assert len(tasks) == 2
+    await settle(tasks)
+
+
+async def test_hedge_returns_first_success(hedged_policy):
+    calls = []
+
+    async def operation():
+        calls.append(1)
+        await asyncio.sleep(0.2 if len(calls) == 1 else 0)
+        return len(calls)
+
+    assert await resilience.call("test", operation) == 2
+    assert resilience.get_breaker("test").state == resilience.CircuitBreaker.CLOSED
@@ -0,0 +1,68 @@
+"""Access tokens: verified-token cache and revocation across workers"""
+
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.cache import get_cache
+from app.core.security import TokenCache, authenticate_token, create_access_token, revoke_token, verify_token
+
+
+@pytest.fixture
+def token(db):
+    security.token_cache.clear()
+    security.token_cache._revoked.clear()
+    return create_access_token({"sub": "64b000000000000000000001", "email": "a@example.com"})
+
+
+async def revoke_on_other_worker(token: str) -> None:
+    """What revoke_token publishes, without touching this worker's TokenCache"""
+    await get_cache().set("auth:revoked", TokenCache.digest(token).hex(), True, 60)
+
+
+async def test_verify_token_accepts_valid_token(token):
+    payload = await verify_token(token)
+
+    assert payload["sub"] == "64b000000000000000000001"
+
+
+async def test_verify_token_rejects_token_revoked_by_another_worker(token):
+    await revoke_on_other_worker(token)
+
+    assert await verify_token(token) is None
+    with pytest.raises(HTTPException):
+        await authenticate_token(token)
+
+
+async def test_revoke_token_rejects_locally(token):
+    await authenticate_token(token)
+    await revoke_token(token)
+
+    assert await verify_token(token) is None
+
+
+def test_expired_revocations_are_pruned_on_lookup(monkeypatch):
+    cache = TokenCache(max_size=10, ttl=60)
+    now = time.time()
+    cache.revoke(b"old", now + 5)
+    cache.revoke(b"new", now + 3600)
+
+    # No further revocations; lookups alone must sweep the expired entry
+    monkeypatch.setattr(security.time, "time", lambda: now + 120)
+
+    assert not cache.is_revoked(b"other")
+    assert cache.is_revoked(b"new")
+    assert list(cache._revoked) == [b"new"]
+
+
+def test_revocation_expires_with_token(monkeypatch):
+    cache = TokenCache(max_size=10, ttl=60)
+    now = time.time()
+    cache.revoke(b"digest", now + 5)
+
+    monkeypatch.setattr(security.time, "time", lambda: now + 6)
+
+    assert not cache.is_revoked(b"digest")
+    assert cache._revoked == {}
@@ -0,0 +1,77 @@
+"""Refresh-token sessions: rotation, concurrent refreshes, reuse and logout"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from app.core.config import settings
+from app.services.session_service import session_service
+
+USER_ID = str(ObjectId())
+
+
+@pytest.fixture
+async def refresh_token(db):
+    await db.users.insert_one({"_id": ObjectId(USER_ID), "email": "a@example.com"})
+    return await session_service.create_session(USER_ID, "a@example.com")
+
+
+async def test_refresh_rotates_token(refresh_token):
+    tokens = await session_service.refresh(refresh_token)
+
+    assert tokens["refresh_token"] != refresh_token
+    assert await session_service.refresh(tokens["refresh_token"])
+
+
+async def test_concurrent_refreshes_get_the_same_successor(db, refresh_token):
+    first, second = await asyncio.gather(
+        session_service.refresh(refresh_token), session_service.refresh(refresh_token)
+    )
+
+    assert first["refresh_token"] == second["refresh_token"]
+    assert await db.sessions.count_documents({}) == 2
+    assert await session_service.refresh(first["refresh_token"])
+
+
+async def test_stale_duplicate_after_successor_rotated_keeps_family(db, refresh_token):
+    second = await session_service.refresh(refresh_token)
+    third = await session_service.refresh(second["refresh_token"])
+
+    # A slow duplicate of the first refresh arrives within the grace window
+    with pytest.raises(ValueError):
+        await session_service.refresh(refresh_token)
+
+    assert await db.sessions.count_documents({}) == 3
+    assert await session_service.refresh(third["refresh_token"])
+
+
+async def test_refresh_rejected_for_deleted_user(db, refresh_token):
+    await db.users.delete_one({"_id": ObjectId(USER_ID)})
+
+    with pytest.raises(ValueError):
+        await session_service.refresh(refresh_token)
+    assert await db.sessions.count_documents({}) == 0
+
+
+async def test_reuse_after_grace_window_revokes_family(db, refresh_token):
+    tokens = await session_service.refresh(refresh_token)
+    await db.sessions.update_one(
+        {"rotatedAt": {"$ne": None}},
+        {"$set": {"rotatedAt": datetime.utcnow() - timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS + 1)}}
+    )
+
+    with pytest.raises(ValueError):
+        await session_service.refresh(refresh_token)
+    with pytest.raises(ValueError):
+        await session_service.refresh(tokens["refresh_token"])
+    assert await db.sessions.count_documents({}) == 0
+
+
+async def test_revoke_only_ends_own_sessions(db, refresh_token):
+    assert not await session_service.revoke(refresh_token, str(ObjectId()))
+    assert await db.sessions.count_documents({}) == 1
+
+    assert await session_service.revoke(refresh_token, USER_ID)
+    assert await db.sessions.count_documents({}) == 0
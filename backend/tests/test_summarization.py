@@ -0,0 +1,75 @@
+"""Summaries: latency budget and the background LLM call"""
+
+import asyncio
+
+from app.ai_modules.summarization import SummarizationService
+from app.core import tasks
+from app.core.config import settings
+
+CONTENT = "A black hole is a region of spacetime. Nothing escapes it, not even light. " * 10
+
+
+async def test_missed_budget_returns_extractive_and_keeps_generating(monkeypatch):
+    service = SummarizationService()
+    finished = asyncio.Event()
+
+    async def slow_generation(prompt, namespace):
+        await asyncio.sleep(0.2)
+        finished.set()
+        return "LLM summary"
+
+    monkeypatch.setattr(service, "_generate_cached", slow_generation)
+    monkeypatch.setattr(settings, "SUMMARY_LATENCY_BUDGET_SECONDS", 0.05)
+
+    summary = await service.summarize(CONTENT, max_length=120)
+
+    assert summary == service.extractive_summary(CONTENT, 120)
+    assert [task.get_name() for task in tasks._background_tasks] == ["summary-llm"]
+    await asyncio.wait_for(finished.wait(), 1)
+
+
+async def test_background_generation_is_cancelled_on_shutdown(monkeypatch):
+    service = SummarizationService()
+    cancelled = asyncio.Event()
+
+    async def hanging_generation(prompt, namespace):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(service, "_generate_cached", hanging_generation)
+    monkeypatch.setattr(settings, "SUMMARY_LATENCY_BUDGET_SECONDS", 0.05)
+
+    await service.summarize(CONTENT, max_length=120)
+    await tasks.cancel_background_tasks()
+
+    assert cancelled.is_set()
+    assert not tasks._background_tasks
+
+
+async def test_failed_generation_falls_back_without_error_log(monkeypatch, caplog):
+    service = SummarizationService()
+
+    async def failing_generation(prompt, namespace):
+        raise ConnectionError("LLM down")
+
+    monkeypatch.setattr(service, "_generate_cached", failing_generation)
+
+    summary = await service.summarize(CONTENT, max_length=120)
+    await asyncio.sleep(0)
+
+    assert summary == service.extractive_summary(CONTENT, 120)
+    assert [record.levelname for record in caplog.records] == ["WARNING"]
+
+
+async def test_fast_generation_within_budget(monkeypatch):
+    service = SummarizationService()
+
+    async def generation(prompt, namespace):
+        return "LLM summary"
+
+    monkeypatch.setattr(service, "_generate_cached", generation)
+
+    assert await service.summarize(CONTENT) == "LLM summary"